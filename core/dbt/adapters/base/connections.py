@@ -1,4 +1,6 @@
 import abc
+import hashlib
+import json
 import os
 # multiprocessing.RLock is a function returning this type
 from multiprocessing.synchronize import RLock
@@ -42,6 +44,11 @@ class BaseConnectionManager(metaclass=abc.ABCMeta):
         self.thread_connections: Dict[Hashable, Connection] = {}
         self.lock: RLock = flags.MP_CONTEXT.RLock()
         self.query_header: Optional[MacroQueryStringSetter] = None
+        # open connections released by finished nodes, keyed by credentials,
+        # waiting to be reused. Only used if use_connection_pool() is True.
+        self.connection_pool: Dict[str, List[Connection]] = {}
+        self.pool_hits: int = 0
+        self.pool_misses: int = 0
 
     def set_query_header(self, manifest: Manifest) -> None:
         self.query_header = MacroQueryStringSetter(self.profile, manifest)
@@ -144,6 +151,8 @@ class BaseConnectionManager(metaclass=abc.ABCMeta):
                 'Re-using an available connection from the pool (formerly {}).'
                 .format(conn.name)
             )
+        elif self.use_connection_pool():
+            conn.handle = LazyHandle(self.open_from_pool)
         else:
             conn.handle = LazyHandle(self.open)
 
@@ -171,6 +180,115 @@ class BaseConnectionManager(metaclass=abc.ABCMeta):
             '`open` is not implemented for this adapter!'
         )
 
+    def use_connection_pool(self) -> bool:
+        """Return True if released connections should be kept open for reuse
+        by later nodes, instead of being closed. Adapters that support pooling
+        should override this.
+        """
+        return False
+
+    @staticmethod
+    def _pool_key(credentials) -> str:
+        # hashed, so the pool doesn't hold on to passwords and other secrets
+        dumped = json.dumps(
+            credentials.to_dict(omit_none=False), sort_keys=True, default=str
+        )
+        return hashlib.sha256(dumped.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def check_handle_alive(cls, connection: Connection) -> None:
+        """Raise an exception if the connection's handle can no longer be
+        used. (passable)
+        """
+        pass
+
+    def _validate_pooled(self, connection: Connection) -> bool:
+        """Roll back anything left on a pooled connection and make sure it is
+        still alive before handing it out again.
+        """
+        try:
+            connection.handle.rollback()
+            self.check_handle_alive(connection)
+        except Exception:
+            logger.debug(
+                'Pooled {} connection failed validation'.format(self.TYPE),
+                exc_info=True
+            )
+            return False
+        return True
+
+    def open_from_pool(self, connection: Connection) -> Connection:
+        """Give the connection a valid handle from the pool if one exists for
+        its credentials, and open a new one otherwise.
+        """
+        key = self._pool_key(connection.credentials)
+        while True:
+            with self.lock:
+                pooled_connections = self.connection_pool.get(key)
+                if not pooled_connections:
+                    self.pool_misses += 1
+                    break
+                pooled = pooled_connections.pop()
+
+            if self._validate_pooled(pooled):
+                with self.lock:
+                    self.pool_hits += 1
+                    hits, misses = self.pool_hits, self.pool_misses
+                logger.debug(
+                    'Re-using a pooled {} connection for "{}" (pool hits: {}, '
+                    'misses: {})'.format(self.TYPE, connection.name, hits, misses)
+                )
+                connection.handle = pooled.handle
+                connection.state = ConnectionState.OPEN
+                connection.transaction_open = False
+                return connection
+
+            try:
+                self._close_handle(pooled)
+            except Exception:
+                pass
+
+        logger.debug(
+            'No pooled {} connection available for "{}" (pool hits: {}, '
+            'misses: {})'.format(
+                self.TYPE, connection.name, self.pool_hits, self.pool_misses
+            )
+        )
+        return self.open(connection)
+
+    def _release_to_pool(self, connection: Connection) -> None:
+        """Roll back the connection and move its handle to the pool. If the
+        pool is full, close it instead.
+        """
+        if connection.state != ConnectionState.OPEN:
+            self.close(connection)
+            return
+
+        if connection.transaction_open:
+            self._rollback(connection)
+
+        key = self._pool_key(connection.credentials)
+        with self.lock:
+            pooled_connections = self.connection_pool.setdefault(key, [])
+            if len(pooled_connections) >= max(self.profile.threads, 1):
+                pooled = None
+            else:
+                pooled = Connection(
+                    type=connection.type,
+                    name=None,
+                    state=ConnectionState.OPEN,
+                    transaction_open=False,
+                    handle=connection.handle,
+                    credentials=connection.credentials,
+                )
+                pooled_connections.append(pooled)
+
+        if pooled is None:
+            self.close(connection)
+        else:
+            connection.handle = None
+            connection.state = ConnectionState.CLOSED
+
     def release(self) -> None:
         with self.lock:
             conn = self.get_if_exists()
@@ -178,9 +296,12 @@ class BaseConnectionManager(metaclass=abc.ABCMeta):
                 return
 
         try:
-            # always close the connection. close() calls _rollback() if there
-            # is an open transaction
-            self.close(conn)
+            if self.use_connection_pool():
+                self._release_to_pool(conn)
+            else:
+                # always close the connection. close() calls _rollback() if
+                # there is an open transaction
+                self.close(conn)
         except Exception:
             # if rollback or close failed, remove our busted connection
             self.clear_thread_connection()
@@ -200,6 +321,16 @@ class BaseConnectionManager(metaclass=abc.ABCMeta):
             # garbage collect these connections
             self.thread_connections.clear()
 
+            for pooled_connections in self.connection_pool.values():
+                for connection in pooled_connections:
+                    self.close(connection)
+            self.connection_pool.clear()
+            if self.pool_hits or self.pool_misses:
+                logger.debug(
+                    'Connection pool: {} hits, {} misses'
+                    .format(self.pool_hits, self.pool_misses)
+                )
+
     @abc.abstractmethod
     def begin(self) -> None:
         """Begin a transaction. (passable)"""
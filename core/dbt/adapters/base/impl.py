@@ -3,6 +3,10 @@ from concurrent.futures import as_completed, Future
 from contextlib import contextmanager
 from datetime import datetime
 from itertools import chain
+import hashlib
+import json
+import os
+import time
 from typing import (
     Optional, Tuple, Callable, Iterable, Type, Dict, Any, List, Mapping,
     Iterator, Union, Set
@@ -17,6 +21,7 @@ from dbt.exceptions import (
     InternalException, NotImplementedException, RuntimeException,
 )
 
+from dbt import flags
 from dbt.adapters.protocol import (
     AdapterConfig,
     ConnectionManagerProtocol,
@@ -30,7 +35,7 @@ from dbt.contracts.graph.manifest import Manifest, MacroManifest
 from dbt.contracts.graph.parsed import ParsedSeedNode
 from dbt.exceptions import warn_or_error
 from dbt.logger import GLOBAL_LOGGER as logger
-from dbt.utils import filter_null_values, executor
+from dbt.utils import filter_null_values, executor, lowercase
 
 from dbt.adapters.base.connections import Connection, AdapterResponse
 from dbt.adapters.base.meta import AdapterMeta, available
@@ -38,7 +43,7 @@ from dbt.adapters.base.relation import (
     ComponentName, BaseRelation, InformationSchema, SchemaSearchMap
 )
 from dbt.adapters.base import Column as BaseColumn
-from dbt.adapters.cache import RelationsCache
+from dbt.adapters.cache import RelationsCache, RelationsCacheStore
 
 
 SeedModel = Union[ParsedSeedNode, CompiledSeedNode]
@@ -46,6 +51,13 @@ SeedModel = Union[ParsedSeedNode, CompiledSeedNode]
 
 GET_CATALOG_MACRO_NAME = 'get_catalog'
 FRESHNESS_MACRO_NAME = 'collect_freshness'
+FRESHNESS_BATCH_MACRO_NAME = 'collect_freshness_batch'
+# The directory in the target path that holds the relations caches saved
+# with --relations-cache-ttl
+RELATIONS_CACHE_DIR_NAME = 'relations_cache'
+# The most relations a schema can have for dbt to list the columns of all of
+# them in one query
+COLUMNS_CACHE_MAX_SCHEMA_RELATIONS = 500
 
 
 def _expect_row_value(key: str, row: agate.Row):
@@ -75,6 +87,28 @@ def _catalog_filter_schemas(manifest: Manifest) -> Callable[[agate.Row], bool]:
     return test
 
 
+def _freshness_from_values(
+    max_loaded_at: Optional[datetime],
+    snapshotted_at: datetime,
+    source: BaseRelation,
+    loaded_at_field: str,
+) -> Dict[str, Any]:
+    if max_loaded_at is None:
+        # no records in the table, so really the max_loaded_at was
+        # infinitely long ago. Just call it 0:00 January 1 year UTC
+        max_loaded_at = datetime(1, 1, 1, 0, 0, 0, tzinfo=pytz.UTC)
+    else:
+        max_loaded_at = _utc(max_loaded_at, source, loaded_at_field)
+
+    snapshotted_at = _utc(snapshotted_at, source, loaded_at_field)
+    age = (snapshotted_at - max_loaded_at).total_seconds()
+    return {
+        'max_loaded_at': max_loaded_at,
+        'snapshotted_at': snapshotted_at,
+        'age': age,
+    }
+
+
 def _utc(
     dt: Optional[datetime], source: BaseRelation, field_name: str
 ) -> datetime:
@@ -156,6 +190,18 @@ class BaseAdapter(metaclass=AdapterMeta):
     def __init__(self, config):
         self.config = config
         self.cache = RelationsCache()
+        # the schemas cached with --relations-cache-ttl, and when each was
+        # listed
+        self._cached_schemas_listed_at: Dict[
+            Tuple[Optional[str], Optional[str]], float
+        ] = {}
+        # the number of relations whose columns weren't cached, by schema,
+        # and the schemas whose columns were listed at once
+        self._column_misses: Dict[Tuple[Optional[str], Optional[str]], int]
+        self._column_misses = {}
+        self._schemas_with_columns_listed: Set[
+            Tuple[Optional[str], Optional[str]]
+        ] = set()
         self.connections = self.ConnectionManager(config)
         self._macro_manifest_lazy: Optional[MacroManifest] = None
 
@@ -334,11 +380,16 @@ class BaseAdapter(metaclass=AdapterMeta):
         # databases
         return info_schema_name_map
 
-    def _relations_cache_for_schemas(self, manifest: Manifest) -> None:
-        """Populate the relations cache for the given schemas. Returns an
-        iterable of the schemas populated, as strings.
+    def _relations_cache_for_schemas(
+        self,
+        manifest: Manifest,
+        cache_schemas: Optional[Set[BaseRelation]] = None,
+    ) -> None:
+        """Populate the relations cache for the given schemas, or for all of
+        the manifest's schemas if there are none.
         """
-        cache_schemas = self._get_cache_schemas(manifest)
+        if cache_schemas is None:
+            cache_schemas = self._get_cache_schemas(manifest)
         with executor(self.config) as tpe:
             futures: List[Future[List[BaseRelation]]] = []
             for cache_schema in cache_schemas:
@@ -364,16 +415,137 @@ class BaseAdapter(metaclass=AdapterMeta):
             cache_update.add((relation.database, relation.schema))
         self.cache.update_schemas(cache_update)
 
+    def _link_cached_relations(self, manifest: Manifest) -> None:
+        """Add the links between the cached relations, for databases that
+        drop a relation's dependents along with it. By default, there are
+        none.
+        """
+        pass
+
+    def _relations_cache_store(self) -> Optional[RelationsCacheStore]:
+        """Get the store that saves the relations cache between invocations,
+        or None if --relations-cache-ttl isn't set. Each target has its own
+        file.
+        """
+        if not flags.RELATIONS_CACHE_TTL:
+            return None
+        target = json.dumps(
+            [self.type(), dict(self.config.credentials.connection_info())],
+            sort_keys=True, default=str,
+        )
+        name = hashlib.sha1(target.encode('utf-8')).hexdigest()
+        path = os.path.join(
+            self.config.target_path, RELATIONS_CACHE_DIR_NAME, f'{name}.json'
+        )
+        return RelationsCacheStore(path, flags.RELATIONS_CACHE_TTL)
+
+    def _load_relations_cache(
+        self,
+        manifest: Manifest,
+        store: RelationsCacheStore,
+        required_schemas: Optional[Iterable[BaseRelation]],
+    ) -> None:
+        """Populate the relations cache from the store, and list the schemas
+        that aren't saved or are stale. Only the required schemas are listed,
+        the others are left out of the cache and listed when dbt needs them.
+        """
+        saved = store.load()
+        required = None
+        if required_schemas is not None:
+            required = {
+                (lowercase(r.database), lowercase(r.schema))
+                for r in required_schemas
+            }
+        to_list: Set[BaseRelation] = set()
+        for cache_schema in self._get_cache_schemas(manifest):
+            key = (lowercase(cache_schema.database),
+                   lowercase(cache_schema.schema))
+            if key in self._cached_schemas_listed_at:
+                continue
+            if key in saved:
+                listed_at, relations = saved[key]
+                for relation in relations:
+                    self.cache.add(self.Relation.from_dict(relation))
+                self.cache.add_schema(*key)
+                self._cached_schemas_listed_at[key] = listed_at
+            elif required is None or key in required:
+                to_list.add(cache_schema)
+
+        logger.debug(
+            f'Loaded {len(self._cached_schemas_listed_at)} schemas from the '
+            f'relations cache, listing {len(to_list)} schemas'
+        )
+        if to_list:
+            listed_at = time.time()
+            self._relations_cache_for_schemas(manifest, to_list)
+            for cache_schema in to_list:
+                key = (lowercase(cache_schema.database),
+                       lowercase(cache_schema.schema))
+                self._cached_schemas_listed_at[key] = listed_at
+
     def set_relations_cache(
-        self, manifest: Manifest, clear: bool = False
+        self,
+        manifest: Manifest,
+        clear: bool = False,
+        required_schemas: Optional[Iterable[BaseRelation]] = None,
     ) -> None:
         """Run a query that gets a populated cache of the relations in the
         database and set the cache on this adapter.
+
+        With --relations-cache-ttl, schemas saved by an earlier invocation are
+        loaded instead, and of the others only required_schemas are listed
+        (all of them if it's None).
         """
         with self.cache.lock:
             if clear:
                 self.cache.clear()
-            self._relations_cache_for_schemas(manifest)
+                self._cached_schemas_listed_at.clear()
+                self._column_misses.clear()
+                self._schemas_with_columns_listed.clear()
+            store = self._relations_cache_store()
+            if store is None:
+                self._relations_cache_for_schemas(manifest)
+            else:
+                self._load_relations_cache(manifest, store, required_schemas)
+            self._link_cached_relations(manifest)
+
+    def persist_relations_cache(
+        self, invalidate: Optional[Iterable[BaseRelation]] = None
+    ) -> None:
+        """Save the cached schemas for later invocations, with
+        --relations-cache-ttl.
+
+        Every schema that was loaded or listed is saved, with its relations
+        as this invocation left them. Saved schemas that changed without
+        being fully cached, and the schemas in invalidate, are removed. If
+        invalidate is None the invocation did not finish and dbt can't know
+        what it changed, so nothing is saved and every schema it cached or
+        changed is removed.
+        """
+        store = self._relations_cache_store()
+        if store is None:
+            return
+        with self.cache.lock:
+            cached = set(self._cached_schemas_listed_at)
+            if invalidate is None:
+                store.save({}, invalidate=cached | self.cache.changed_schemas)
+                return
+            invalid = {
+                (lowercase(r.database), lowercase(r.schema))
+                for r in invalidate
+            }
+            schemas = {}
+            for key in cached - invalid:
+                # the schema was dropped
+                if key not in self.cache:
+                    continue
+                schemas[key] = (
+                    self._cached_schemas_listed_at[key],
+                    [r.to_dict(omit_none=True)
+                     for r in self.cache.get_relations(*key)],
+                )
+            invalid.update(self.cache.changed_schemas.difference(schemas))
+            store.save(schemas, invalidate=invalid)
 
     @available
     def cache_added(self, relation: Optional[BaseRelation]) -> str:
@@ -384,6 +556,7 @@ class BaseAdapter(metaclass=AdapterMeta):
                 'Attempted to cache a null relation for {}'.format(name)
             )
         self.cache.add(relation)
+        self.cache.columns_changed(relation)
         # so jinja doesn't render things
         return ''
 
@@ -398,6 +571,7 @@ class BaseAdapter(metaclass=AdapterMeta):
                 'Attempted to drop a null relation for {}'.format(name)
             )
         self.cache.drop(relation)
+        self.cache.columns_changed(relation)
         return ''
 
     @available
@@ -419,8 +593,48 @@ class BaseAdapter(metaclass=AdapterMeta):
             )
 
         self.cache.rename(from_relation, to_relation)
+        self.cache.columns_changed(from_relation)
+        self.cache.columns_changed(to_relation)
         return ''
 
+    @available
+    def cache_columns_altered(self, relation: Optional[BaseRelation]) -> str:
+        """Forget the cached columns of a relation whose columns dbt is about
+        to add, drop or alter, so `get_columns_in_relation` queries them again.
+        """
+        if relation is None:
+            name = self.nice_connection_name()
+            raise_compiler_error(
+                'Attempted to alter the columns of a null relation for {}'
+                .format(name)
+            )
+        self.cache.columns_changed(relation)
+        return ''
+
+    def _should_list_schema_columns(self, relation: BaseRelation) -> bool:
+        """Decide whether to list the columns of every relation in the schema
+        of relation, on a miss in the columns cache. That happens on the
+        second miss in a cached schema, once, when the schema has at most
+        COLUMNS_CACHE_MAX_SCHEMA_RELATIONS relations. Listing a bigger schema
+        costs more than querying its relations one at a time.
+        """
+        if relation.schema is None:
+            return False
+        key = (lowercase(relation.database), lowercase(relation.schema))
+        with self.cache.lock:
+            if (
+                key in self._schemas_with_columns_listed or
+                (relation.database, relation.schema) not in self.cache
+            ):
+                return False
+            misses = self._column_misses.get(key, 0) + 1
+            self._column_misses[key] = misses
+            if misses < 2:
+                return False
+            self._schemas_with_columns_listed.add(key)
+            relations = self.cache.get_relations(*key)
+            return len(relations) <= COLUMNS_CACHE_MAX_SCHEMA_RELATIONS
+
     ###
     # Abstract methods for database-specific values, attributes, and types
     ###
@@ -1079,20 +1293,52 @@ class BaseAdapter(metaclass=AdapterMeta):
                     FRESHNESS_MACRO_NAME, [tuple(r) for r in table]
                 )
             )
-        if table[0][0] is None:
-            # no records in the table, so really the max_loaded_at was
-            # infinitely long ago. Just call it 0:00 January 1 year UTC
-            max_loaded_at = datetime(1, 1, 1, 0, 0, 0, tzinfo=pytz.UTC)
-        else:
-            max_loaded_at = _utc(table[0][0], source, loaded_at_field)
+        return _freshness_from_values(
+            table[0][0], table[0][1], source, loaded_at_field
+        )
 
-        snapshotted_at = _utc(table[0][1], source, loaded_at_field)
-        age = (snapshotted_at - max_loaded_at).total_seconds()
-        return {
-            'max_loaded_at': max_loaded_at,
-            'snapshotted_at': snapshotted_at,
-            'age': age,
+    def calculate_freshness_batch(
+        self,
+        sources: List[Tuple[BaseRelation, str, Optional[str]]],
+        manifest: Optional[Manifest] = None
+    ) -> List[Dict[str, Any]]:
+        """Calculate the freshness of many sources with one query, and return
+        it in the same order. Each source is a relation, its loaded_at_field
+        and its filter.
+        """
+        kwargs: Dict[str, Any] = {
+            'sources': [
+                {
+                    'source': source,
+                    'loaded_at_field': loaded_at_field,
+                    'filter': filter,
+                }
+                for source, loaded_at_field, filter in sources
+            ],
         }
+        table = self.execute_macro(
+            FRESHNESS_BATCH_MACRO_NAME,
+            kwargs=kwargs,
+            manifest=manifest
+        )
+        # a 1-row table of the maximum `loaded_at_field` value of each
+        # source, in order, and then the current time according to the db.
+        if len(table) != 1 or len(table[0]) != len(sources) + 1:
+            raise_compiler_error(
+                'Got an invalid result from "{}" macro: {}'.format(
+                    FRESHNESS_BATCH_MACRO_NAME, [tuple(r) for r in table]
+                )
+            )
+        row = table[0]
+        snapshotted_at = row[len(sources)]
+        return [
+            _freshness_from_values(
+                max_loaded_at, snapshotted_at, source, loaded_at_field
+            )
+            for max_loaded_at, (source, loaded_at_field, _) in zip(
+                row, sources
+            )
+        ]
 
     def pre_model_hook(self, config: Mapping[str, Any]) -> Any:
         """A hook for running some operation before the model materialization
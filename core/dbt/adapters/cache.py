@@ -1,14 +1,25 @@
 from collections import namedtuple
 from copy import deepcopy
 from typing import List, Iterable, Optional, Dict, Set, Tuple, Any
+import itertools
+import json
+import os
+import tempfile
 import threading
+import time
 
 from dbt.logger import CACHE_LOGGER as logger
 from dbt.utils import lowercase
+from dbt.version import __version__ as dbt_version
 import dbt.exceptions
 
 _ReferenceKey = namedtuple('_ReferenceKey', 'database schema identifier')
 
+# With --log-cache-events, every change to the cache is logged as this
+# prefix followed by a JSON object describing only what changed. See
+# replay_cache_events.
+CACHE_EVENT_PREFIX = 'cache event: '
+
 
 def _make_key(relation) -> _ReferenceKey:
     """Make _ReferenceKeys with lowercase values for the cache so we don't have
@@ -157,12 +168,6 @@ class _CachedRelation:
         return [dot_separated(r) for r in self.referenced_by]
 
 
-def lazy_log(msg, func):
-    if logger.disabled:
-        return
-    logger.debug(msg.format(func()))
-
-
 class RelationsCache:
     """A cache of the relations known to dbt. Keeps track of relationships
     declared between tables and handles renames/drops as a real database would.
@@ -171,11 +176,64 @@ class RelationsCache:
     :attr threading.RLock lock: The lock around relations, held during updates.
         The adapters also hold this lock while filling the cache.
     :attr Set[str] schemas: The set of known/cached schemas, all lowercased.
+    :attr Set[Tuple[str, str]] changed_schemas: The lowercased (database,
+        schema) of every schema whose relations were added, dropped or
+        renamed since the cache was last cleared.
+    :attr Dict[_ReferenceKey, List[Column]] columns: The known columns of
+        cached relations. They are forgotten when a relation is dropped or
+        renamed, and by columns_changed.
+
+    The relations are also indexed by their lowercased (database, schema), so
+    listing the relations in a schema doesn't scan the whole cache. Every
+    change to relations must go through _index_relation and
+    _unindex_relation to keep the two consistent.
     """
     def __init__(self) -> None:
         self.relations: Dict[_ReferenceKey, _CachedRelation] = {}
         self.lock = threading.RLock()
         self.schemas: Set[Tuple[Optional[str], Optional[str]]] = set()
+        self._relations_by_schema: Dict[
+            Tuple[Optional[str], Optional[str]],
+            Dict[_ReferenceKey, _CachedRelation]
+        ] = {}
+        self.changed_schemas: Set[Tuple[Optional[str], Optional[str]]] = set()
+        self.columns: Dict[_ReferenceKey, List[Any]] = {}
+        # relations whose columns dbt changed since the cache was cleared
+        self._columns_changed: Set[_ReferenceKey] = set()
+        self._event_seq = itertools.count()
+
+    def _log_event(self, event: str, **data: Any) -> None:
+        """Log a change to the cache as a cache event. Callers should hold the
+        lock, so events are logged in the order the changes were made.
+        """
+        if logger.disabled:
+            return
+        data = dict(event=event, seq=next(self._event_seq), **data)
+        logger.debug(CACHE_EVENT_PREFIX + json.dumps(data))
+
+    def _index_relation(
+        self, key: _ReferenceKey, relation: _CachedRelation
+    ) -> None:
+        """Store the relation under key. Callers should hold the lock."""
+        self.relations[key] = relation
+        self.columns.pop(key, None)
+        schema_key = (key.database, key.schema)
+        self.changed_schemas.add(schema_key)
+        self._relations_by_schema.setdefault(schema_key, {})[key] = relation
+
+    def _unindex_relation(self, key: _ReferenceKey) -> _CachedRelation:
+        """Remove and return the relation stored under key. Callers should
+        hold the lock.
+        """
+        relation = self.relations.pop(key)
+        self.columns.pop(key, None)
+        schema_key = (key.database, key.schema)
+        self.changed_schemas.add(schema_key)
+        in_schema = self._relations_by_schema[schema_key]
+        del in_schema[key]
+        if not in_schema:
+            del self._relations_by_schema[schema_key]
+        return relation
 
     def add_schema(
         self, database: Optional[str], schema: Optional[str],
@@ -195,6 +253,8 @@ class RelationsCache:
         Then remove all its contents (and their dependents, etc) as well.
         """
         key = (lowercase(database), lowercase(schema))
+        with self.lock:
+            self.changed_schemas.add(key)
         if key not in self.schemas:
             return
 
@@ -202,6 +262,7 @@ class RelationsCache:
         # collecting the list first.
 
         with self.lock:
+            self._log_event('drop_schema', database=key[0], schema=key[1])
             to_remove = self._list_relations_in_schema(database, schema)
             self._remove_all(to_remove)
             # handle a drop_schema race by using discard() over remove()
@@ -246,7 +307,9 @@ class RelationsCache:
         """
         self.add_schema(relation.database, relation.schema)
         key = relation.key()
-        return self.relations.setdefault(key, relation)
+        if key not in self.relations:
+            self._index_relation(key, relation)
+        return self.relations[key]
 
     def _add_link(self, referenced_key, dependent_key):
         """Add a link between two relations to the database. Both the old and
@@ -277,6 +340,9 @@ class RelationsCache:
         assert dependent is not None  # we just raised!
 
         referenced.add_reference(dependent)
+        self._log_event(
+            'link', referenced=referenced_key, dependent=dependent_key
+        )
 
     def add_link(self, referenced, dependent):
         """Add a link between two relations to the database. If either relation
@@ -332,12 +398,9 @@ class RelationsCache:
         cached = _CachedRelation(relation)
         logger.debug('Adding relation: {!s}'.format(cached))
 
-        lazy_log('before adding: {!s}', self.dump_graph)
-
         with self.lock:
             self._setdefault(cached)
-
-        lazy_log('after adding: {!s}', self.dump_graph)
+            self._log_event('add', key=cached.key())
 
     def _remove_refs(self, keys):
         """Removes all references to all entries in keys. This does not
@@ -347,7 +410,7 @@ class RelationsCache:
         """
         # remove direct refs
         for key in keys:
-            del self.relations[key]
+            self._unindex_relation(key)
         # then remove all entries from each child
         for cached in self.relations.values():
             cached.release_references(keys)
@@ -367,6 +430,10 @@ class RelationsCache:
             'drop {} is cascading to {}'.format(dropped, consequences)
         )
         self._remove_refs(consequences)
+        self._log_event(
+            'drop', key=dropped,
+            cascade=sorted(consequences, key=dot_separated),
+        )
 
     def drop(self, relation):
         """Drop the named relation and cascade it appropriately to all
@@ -382,6 +449,8 @@ class RelationsCache:
         dropped = _make_key(relation)
         logger.debug('Dropping relation: {!s}'.format(dropped))
         with self.lock:
+            # even a noop drop means the relation is gone from the database
+            self.changed_schemas.add((dropped.database, dropped.schema))
             self._drop_cascade_relation(dropped)
 
     def _rename_relation(self, old_key, new_relation):
@@ -395,12 +464,13 @@ class RelationsCache:
         # previously referenced by old_name to be referenced by new_name.
         # basically, the name changes but some underlying ID moves. Kind of
         # like an object reference!
-        relation = self.relations.pop(old_key)
+        relation = self._unindex_relation(old_key)
         new_key = new_relation.key()
 
         # relaton has to rename its innards, so it needs the _CachedRelation.
         relation.rename(new_relation)
         # update all the relations that refer to it
+        referrers = []
         for cached in self.relations.values():
             if cached.is_referenced_by(old_key):
                 logger.debug(
@@ -408,10 +478,14 @@ class RelationsCache:
                     .format(old_key, new_key, cached.key())
                 )
                 cached.rename_key(old_key, new_key)
+                referrers.append(cached.key())
 
-        self.relations[new_key] = relation
+        self._index_relation(new_key, relation)
         # also fixup the schemas!
         self.add_schema(new_key.database, new_key.schema)
+        self._log_event(
+            'rename', old=old_key, new=new_key, referrers=referrers
+        )
 
         return True
 
@@ -460,15 +534,13 @@ class RelationsCache:
             old_key, new_key
         ))
 
-        lazy_log('before rename: {!s}', self.dump_graph)
-
         with self.lock:
+            self.changed_schemas.add((old_key.database, old_key.schema))
             if self._check_rename_constraints(old_key, new_key):
                 self._rename_relation(old_key, _CachedRelation(new))
             else:
                 self._setdefault(_CachedRelation(new))
-
-        lazy_log('after rename: {!s}', self.dump_graph)
+                self._log_event('add', key=new_key)
 
     def get_relations(
         self, database: Optional[str], schema: Optional[str]
@@ -479,13 +551,11 @@ class RelationsCache:
         :return List[BaseRelation]: The list of relations with the given
             schema
         """
-        database = lowercase(database)
-        schema = lowercase(schema)
+        key = (lowercase(database), lowercase(schema))
         with self.lock:
             results = [
-                r.inner for r in self.relations.values()
-                if (lowercase(r.schema) == schema and
-                    lowercase(r.database) == database)
+                r.inner
+                for r in self._relations_by_schema.get(key, {}).values()
             ]
 
         if None in results:
@@ -498,19 +568,68 @@ class RelationsCache:
         """Clear the cache"""
         with self.lock:
             self.relations.clear()
+            self._relations_by_schema.clear()
             self.schemas.clear()
+            self.changed_schemas.clear()
+            self.columns.clear()
+            self._columns_changed.clear()
+            self._log_event('clear')
+
+    def get_columns(self, relation) -> Optional[List[Any]]:
+        """Get the cached columns of the relation, or None if they aren't
+        known.
+        """
+        key = _make_key(relation)
+        with self.lock:
+            columns = self.columns.get(key)
+        if columns is None:
+            return None
+        return list(columns)
+
+    def set_columns(self, relation, columns: List[Any]) -> None:
+        """Cache the columns of the relation, if the relation is cached."""
+        key = _make_key(relation)
+        with self.lock:
+            if key in self.relations:
+                self.columns[key] = list(columns)
+
+    def update_schema_columns(
+        self,
+        database: Optional[str],
+        schema: Optional[str],
+        columns: Dict[str, List[Any]],
+    ) -> None:
+        """Cache the columns listed for a whole schema, by identifier.
+
+        The listing may have seen a relation that another thread was changing
+        at the same time, so relations whose columns dbt changed since the
+        cache was cleared are skipped. Their columns are cached when they are
+        looked up on their own.
+        """
+        with self.lock:
+            for identifier, relation_columns in columns.items():
+                key = _ReferenceKey(
+                    lowercase(database), lowercase(schema),
+                    lowercase(identifier),
+                )
+                if key in self.relations and key not in self._columns_changed:
+                    self.columns[key] = list(relation_columns)
+
+    def columns_changed(self, relation) -> None:
+        """Forget the columns of the relation, because dbt is about to change
+        or replace it.
+        """
+        key = _make_key(relation)
+        with self.lock:
+            self.columns.pop(key, None)
+            self._columns_changed.add(key)
 
     def _list_relations_in_schema(
         self, database: Optional[str], schema: Optional[str]
     ) -> List[_CachedRelation]:
         """Get the relations in a schema. Callers should hold the lock."""
         key = (lowercase(database), lowercase(schema))
-
-        to_remove: List[_CachedRelation] = []
-        for cachekey, relation in self.relations.items():
-            if (cachekey.database, cachekey.schema) == key:
-                to_remove.append(relation)
-        return to_remove
+        return list(self._relations_by_schema.get(key, {}).values())
 
     def _remove_all(self, to_remove: List[_CachedRelation]):
         """Remove all the listed relations. Ignore relations that have been
@@ -521,3 +640,166 @@ class RelationsCache:
             drop_key = _make_key(relation)
             if drop_key in self.relations:
                 self.drop(drop_key)
+
+
+_SchemaKey = Tuple[Optional[str], Optional[str]]
+
+
+class RelationsCacheStore:
+    """The relations of fully listed schemas, saved to a JSON file so later
+    invocations can use them instead of listing those schemas again.
+
+    Each schema is saved with the time it was listed, and is only loaded
+    while it is younger than ttl seconds. The relations are the serialized
+    BaseRelations, the store leaves (de)serializing them to the adapter. A
+    file written by another version of dbt is ignored.
+    """
+    def __init__(self, path: str, ttl: float) -> None:
+        self.path = path
+        self.ttl = ttl
+
+    def _read(self) -> Dict[_SchemaKey, Dict[str, Any]]:
+        try:
+            with open(self.path) as fp:
+                data = json.load(fp)
+        except (OSError, ValueError):
+            return {}
+        try:
+            if data['metadata']['dbt_version'] != dbt_version:
+                return {}
+            return {
+                (entry['database'], entry['schema']): entry
+                for entry in data['schemas']
+            }
+        except (KeyError, TypeError):
+            logger.debug(f'Ignoring the invalid relations cache {self.path}')
+            return {}
+
+    def _write(self, entries: Dict[_SchemaKey, Dict[str, Any]]) -> None:
+        data = {
+            'metadata': {'dbt_version': dbt_version},
+            'schemas': list(entries.values()),
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # write to a temporary file and move it into place, so a dbt
+            # invocation reading the file never sees a partial one
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path))
+            with os.fdopen(fd, 'w') as fp:
+                json.dump(data, fp)
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            logger.debug(f'Could not write the relations cache: {exc}')
+
+    def _is_fresh(self, entry: Dict[str, Any], now: float) -> bool:
+        return now - entry['listed_at'] < self.ttl
+
+    def load(
+        self, now: Optional[float] = None
+    ) -> Dict[_SchemaKey, Tuple[float, List[Dict[str, Any]]]]:
+        """Return the time each fresh schema was listed and its relations,
+        by lowercased (database, schema).
+        """
+        if now is None:
+            now = time.time()
+        return {
+            key: (entry['listed_at'], entry['relations'])
+            for key, entry in self._read().items()
+            if self._is_fresh(entry, now)
+        }
+
+    def save(
+        self,
+        schemas: Dict[_SchemaKey, Tuple[float, List[Dict[str, Any]]]],
+        invalidate: Iterable[_SchemaKey] = (),
+        now: Optional[float] = None,
+    ) -> None:
+        """Save the given schemas, as returned by load, and remove the saved
+        schemas in invalidate. Other fresh schemas already in the file are
+        kept.
+        """
+        invalidate = set(invalidate)
+        if not schemas and not invalidate:
+            return
+        if now is None:
+            now = time.time()
+        entries = self._read()
+        for key in invalidate:
+            entries.pop(key, None)
+        for key, (listed_at, relations) in schemas.items():
+            database, schema = key
+            entries[key] = {
+                'database': database,
+                'schema': schema,
+                'listed_at': listed_at,
+                'relations': relations,
+            }
+        self._write({
+            key: entry for key, entry in entries.items()
+            if self._is_fresh(entry, now)
+        })
+
+
+def parse_cache_event(line: str) -> Optional[Dict[str, Any]]:
+    """Return the cache event logged on the given line of a dbt log file, in
+    either the text or the json log format, or None if there isn't one.
+    """
+    if line.startswith('{'):
+        try:
+            line = json.loads(line).get('message', '')
+        except ValueError:
+            return None
+    _, prefix, event = line.partition(CACHE_EVENT_PREFIX)
+    if not prefix:
+        return None
+    try:
+        return json.loads(event)
+    except ValueError:
+        return None
+
+
+def replay_cache_events(
+    events: Iterable[Dict[str, Any]], until: Optional[int] = None
+) -> Dict[str, List[str]]:
+    """Rebuild the cache graph from the events logged by one cache, as
+    dump_graph would have returned it after the event numbered `until` (or
+    after the last event).
+
+    The events only hold what changed, so this applies them in order
+    without needing any of the relations themselves.
+    """
+    # each key maps to the keys of the relations that reference it
+    graph: Dict[_ReferenceKey, Dict[_ReferenceKey, None]] = {}
+    for event in events:
+        if until is not None and event['seq'] > until:
+            break
+        kind = event['event']
+        if kind == 'add':
+            graph.setdefault(_ReferenceKey(*event['key']), {})
+        elif kind == 'link':
+            referenced = _ReferenceKey(*event['referenced'])
+            graph[referenced][_ReferenceKey(*event['dependent'])] = None
+        elif kind == 'drop':
+            dropped = [_ReferenceKey(*key) for key in event['cascade']]
+            for key in dropped:
+                del graph[key]
+            for referenced_by in graph.values():
+                for key in dropped:
+                    referenced_by.pop(key, None)
+        elif kind == 'rename':
+            old_key = _ReferenceKey(*event['old'])
+            new_key = _ReferenceKey(*event['new'])
+            referenced_by = graph.pop(old_key)
+            for referrer in event['referrers']:
+                referrer_key = _ReferenceKey(*referrer)
+                del graph[referrer_key][old_key]
+                graph[referrer_key][new_key] = None
+            graph[new_key] = referenced_by
+        elif kind == 'clear':
+            graph.clear()
+        # drop_schema is followed by a drop for each relation in the schema
+
+    return {
+        dot_separated(key): [dot_separated(k) for k in referenced_by]
+        for key, referenced_by in graph.items()
+    }
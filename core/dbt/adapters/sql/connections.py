@@ -48,6 +48,13 @@ class SQLConnectionManager(BaseConnectionManager):
                     names.append(connection.name)
         return names
 
+    @classmethod
+    def check_handle_alive(cls, connection: Connection) -> None:
+        cursor = connection.handle.cursor()
+        cursor.execute('select 1')
+        cursor.fetchall()
+        connection.handle.rollback()
+
     def add_query(
         self,
         sql: str,
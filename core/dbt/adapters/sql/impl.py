@@ -1,10 +1,10 @@
 import agate
-from typing import Any, Optional, Tuple, Type, List
+from typing import Any, Optional, Tuple, Type, List, Dict
 
 import dbt.clients.agate_helper
 from dbt.contracts.connection import Connection
 import dbt.exceptions
-from dbt.adapters.base import BaseAdapter, available
+from dbt.adapters.base import BaseAdapter, Column as BaseColumn, available
 from dbt.adapters.sql import SQLConnectionManager
 from dbt.logger import GLOBAL_LOGGER as logger
 
@@ -12,6 +12,7 @@ from dbt.adapters.base.relation import BaseRelation
 
 LIST_RELATIONS_MACRO_NAME = 'list_relations_without_caching'
 GET_COLUMNS_IN_RELATION_MACRO_NAME = 'get_columns_in_relation'
+GET_COLUMNS_IN_SCHEMA_MACRO_NAME = 'get_columns_in_schema'
 LIST_SCHEMAS_MACRO_NAME = 'list_schemas'
 CHECK_SCHEMA_EXISTS_MACRO_NAME = 'check_schema_exists'
 CREATE_SCHEMA_MACRO_NAME = 'create_schema'
@@ -168,10 +169,47 @@ class SQLAdapter(BaseAdapter):
         )
 
     def get_columns_in_relation(self, relation):
-        return self.execute_macro(
-            GET_COLUMNS_IN_RELATION_MACRO_NAME,
-            kwargs={'relation': relation}
+        """Get the columns of the relation from the relations cache, or query
+        them and cache them. Sometimes the columns of the relation's whole
+        schema are listed and cached at once, see _should_list_schema_columns.
+        """
+        columns = self.cache.get_columns(relation)
+        if columns is None and self._should_list_schema_columns(relation):
+            schema_relation = relation.without_identifier()
+            schema_columns = self.list_columns_in_schema_without_caching(
+                schema_relation
+            )
+            if schema_columns is not None:
+                self.cache.update_schema_columns(
+                    relation.database, relation.schema, schema_columns
+                )
+                columns = self.cache.get_columns(relation)
+        if columns is None:
+            columns = self.execute_macro(
+                GET_COLUMNS_IN_RELATION_MACRO_NAME,
+                kwargs={'relation': relation}
+            )
+            self.cache.set_columns(relation, columns)
+        return columns
+
+    def list_columns_in_schema_without_caching(
+        self, schema_relation: BaseRelation
+    ) -> Optional[Dict[str, List[BaseColumn]]]:
+        """List the columns of every relation in the schema with one query,
+        by identifier. Returns None if the adapter doesn't implement the
+        get_columns_in_schema macro.
+        """
+        table = self.execute_macro(
+            GET_COLUMNS_IN_SCHEMA_MACRO_NAME,
+            kwargs={'schema_relation': schema_relation}
         )
+        if table is None:
+            return None
+        columns: Dict[str, List[BaseColumn]] = {}
+        for row in table:
+            identifier, *column = row
+            columns.setdefault(identifier, []).append(self.Column(*column))
+        return columns
 
     def create_schema(self, relation: BaseRelation) -> None:
         relation = relation.without_identifier()
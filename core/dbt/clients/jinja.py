@@ -1,15 +1,20 @@
 import codecs
+import hashlib
 import linecache
+import marshal
 import os
 import re
+import shutil
+import sys
 import tempfile
 import threading
 from ast import literal_eval
 from contextlib import contextmanager
 from itertools import chain, islice
+from types import CodeType
 from typing import (
     List, Union, Set, Optional, Dict, Any, Iterator, Type, NoReturn, Tuple,
-    Callable
+    Callable, MutableMapping
 )
 
 import jinja2
@@ -17,6 +22,7 @@ import jinja2.ext
 import jinja2.nativetypes  # type: ignore
 import jinja2.nodes
 import jinja2.parser
+import jinja2.runtime
 import jinja2.sandbox
 
 from dbt.utils import (
@@ -34,6 +40,7 @@ from dbt.exceptions import (
 )
 from dbt import flags
 from dbt.logger import GLOBAL_LOGGER as logger  # noqa
+from dbt.version import __version__ as dbt_version
 
 
 def _linecache_inject(source, write):
@@ -83,10 +90,237 @@ class MacroFuzzParser(jinja2.parser.Parser):
         return node
 
 
+# The key a ManifestContext stores its MacroNamespace under in the context
+# dictionary, instead of copying every macro into the dictionary.
+MACRO_NAMESPACE_KEY = '_dbt_macro_namespace'
+
+
+class MacroNamespaceContext(jinja2.runtime.Context):
+    """A jinja context that resolves names from the macro namespace stored
+    under MACRO_NAMESPACE_KEY, if there is one. Macros take precedence over
+    the rest of the context, but not over variables set in the template.
+    """
+    def resolve_or_missing(self, key):
+        if key in self.vars:
+            return self.vars[key]
+        namespace = self.parent.get(MACRO_NAMESPACE_KEY)
+        if namespace is not None and key in namespace:
+            return namespace[key]
+        if key in self.parent:
+            return self.parent[key]
+        return jinja2.runtime.missing
+
+
+class MacroContextView(MutableMapping):
+    """The `context` member of a context dictionary that stores its macros
+    under MACRO_NAMESPACE_KEY. It looks like the dictionary with the macros
+    copied into it, so templates can look macros up with `context[name]`
+    and `name in context`. Macros take precedence over the rest of the
+    dictionary, and writes go to the dictionary.
+    """
+    def __init__(self, ctx: Dict[str, Any]) -> None:
+        self._ctx = ctx
+
+    @property
+    def _namespace(self):
+        return self._ctx[MACRO_NAMESPACE_KEY]
+
+    def __getitem__(self, key):
+        if key in self._namespace:
+            return self._namespace[key]
+        if key == MACRO_NAMESPACE_KEY:
+            raise KeyError(key)
+        return self._ctx[key]
+
+    def __contains__(self, key) -> bool:
+        if key in self._namespace:
+            return True
+        return key != MACRO_NAMESPACE_KEY and key in self._ctx
+
+    def __iter__(self) -> Iterator[str]:
+        namespace = self._namespace
+        yield from namespace
+        for key in self._ctx:
+            if key != MACRO_NAMESPACE_KEY and key not in namespace:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __setitem__(self, key, value) -> None:
+        self._ctx[key] = value
+
+    def __delitem__(self, key) -> None:
+        del self._ctx[key]
+
+
+class CodeCache:
+    """A cache of the python code objects that jinja compiles templates to,
+    keyed by a hash of the template source. Code objects are kept in memory
+    and marshalled to one file per template in `directory`, so later
+    invocations can skip lexing, parsing and generating code for templates
+    that haven't changed.
+
+    Marshalled code is specific to the python version, and the generated
+    code to the dbt and jinja versions, so each combination gets its own
+    directory. Directories for other versions are removed. Files are
+    touched when they're loaded, and when the cache grows over `max_size`
+    bytes, the least recently used files are removed.
+    """
+    max_size = 64 * 1024 * 1024
+
+    def __init__(self, directory: str, prune: bool = True) -> None:
+        self.directory = directory
+        self.path = os.path.join(directory, self.version_tag())
+        self.memory: Dict[str, CodeType] = {}
+        if prune:
+            self._prune()
+
+    @staticmethod
+    def version_tag() -> str:
+        return '-'.join((
+            f'dbt{dbt_version}',
+            sys.implementation.cache_tag or 'python',
+            f'jinja{jinja2.__version__}',  # type: ignore
+        ))
+
+    @staticmethod
+    def key(env: jinja2.Environment, source: str, defer_init: bool) -> str:
+        # the code generator (text or native) changes the generated code
+        data = f'{type(env).__qualname__}\0{defer_init}\0{source}'
+        return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+    def _prune(self) -> None:
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if path != self.path and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+        self._prune_files()
+
+    def _prune_files(self) -> None:
+        files: List[Tuple[float, int, str]] = []
+        total = 0
+        for dirpath, _, filenames in os.walk(self.path):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        if total <= self.max_size:
+            return
+        # oldest first
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def _file_path(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key[2:])
+
+    def load(self, key: str) -> Optional[CodeType]:
+        code = self.memory.get(key)
+        if code is not None:
+            return code
+        path = self._file_path(key)
+        try:
+            with open(path, 'rb') as fp:
+                code = marshal.load(fp)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if not isinstance(code, CodeType):
+            return None
+        try:
+            # mark it as used, so it's kept when the cache is pruned
+            os.utime(path)
+        except OSError:
+            pass
+        self.memory[key] = code
+        return code
+
+    def dump(self, key: str, code: CodeType) -> None:
+        self.memory[key] = code
+        path = self._file_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # write to a temporary file and move it into place, so threads
+            # and processes compiling the same template never see a partial
+            # file
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, 'wb') as fp:
+                marshal.dump(code, fp)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.debug(f'Could not write the jinja code cache: {exc}')
+
+    def clear(self) -> None:
+        self.memory.clear()
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+# The directory in the target path that holds the code cache
+CODE_CACHE_DIR_NAME = 'jinja_cache'
+
+_code_cache: Optional[CodeCache] = None
+
+
+def set_code_cache(
+    directory: Optional[str], prune: bool = True
+) -> Optional[CodeCache]:
+    """Cache compiled templates in the given directory, or stop caching them
+    if it's None. With `prune`, remove the files the cache doesn't need.
+    """
+    global _code_cache
+    if directory is None:
+        _code_cache = None
+    elif _code_cache is None or _code_cache.directory != directory:
+        _code_cache = CodeCache(directory, prune=prune)
+    return _code_cache
+
+
+def get_code_cache() -> Optional[CodeCache]:
+    return _code_cache
+
+
 class MacroFuzzEnvironment(jinja2.sandbox.SandboxedEnvironment):
+    context_class = MacroNamespaceContext
+
     def _parse(self, source, name, filename):
         return MacroFuzzParser(self, source, name, filename).parse()
 
+    def compile(
+        self, source, name=None, filename=None, raw=False, defer_init=False
+    ):
+        """Look up templates compiled from strings in the code cache, if
+        there is one, before compiling them.
+        """
+        code_cache = _code_cache
+        if (
+            code_cache is None or
+            raw or
+            name is not None or
+            filename is not None or
+            not isinstance(source, str) or
+            flags.MACRO_DEBUGGING
+        ):
+            return super().compile(source, name, filename, raw, defer_init)
+
+        key = code_cache.key(self, source, defer_init)
+        code = code_cache.load(key)
+        if code is None:
+            code = super().compile(source, name, filename, raw, defer_init)
+            code_cache.dump(key, code)
+        return code
+
     def _compile(self, source, filename):
         """Override jinja's compilation to stash the rendered source inside
         the python linecache for debugging when the appropriate environment
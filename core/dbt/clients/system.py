@@ -1,6 +1,8 @@
 import errno
 import functools
 import fnmatch
+import gzip
+import io
 import json
 import os
 import os.path
@@ -9,10 +11,13 @@ import shutil
 import subprocess
 import sys
 import tarfile
+import tempfile
 import requests
 import stat
+from contextlib import contextmanager
 from typing import (
-    Type, NoReturn, List, Optional, Dict, Any, Tuple, Callable, Union
+    Type, NoReturn, List, Optional, Dict, Any, Tuple, Callable, Union, IO,
+    Iterable, Iterator
 )
 
 import dbt.exceptions
@@ -40,10 +45,16 @@ def find_matching(
 
       [ { 'absolute_path': '/root/path/models/model_one.sql',
           'relative_path': 'model_one.sql',
-          'searched_path': 'models' },
+          'searched_path': 'models',
+          'modification_time': 1633000000.0,
+          'file_size': 24,
+          'inode': 1234 },
         { 'absolute_path': '/root/path/models/subdirectory/model_two.sql',
           'relative_path': 'subdirectory/model_two.sql',
-          'searched_path': 'models' } ]
+          'searched_path': 'models',
+          'modification_time': 1633000000.0,
+          'file_size': 48,
+          'inode': 1235 } ]
     """
     matching = []
     root_path = os.path.normpath(root_path)
@@ -61,20 +72,30 @@ def find_matching(
                 relative_path = os.path.relpath(
                     absolute_path, absolute_path_to_search
                 )
+                if not reobj.match(local_file):
+                    continue
+                # the modification time, size and inode are used to tell
+                # whether a file might have changed since the last parse
                 modification_time = 0.0
+                file_size = 0
+                inode = 0
                 try:
-                    modification_time = os.path.getmtime(absolute_path)
+                    stat = os.stat(absolute_path)
+                    modification_time = stat.st_mtime
+                    file_size = stat.st_size
+                    inode = stat.st_ino
                 except OSError:
                     logger.exception(
                         f"Error retrieving modification time for file {absolute_path}"
                     )
-                if reobj.match(local_file):
-                    matching.append({
-                        'searched_path': relative_path_to_search,
-                        'absolute_path': absolute_path,
-                        'relative_path': relative_path,
-                        'modification_time': modification_time,
-                    })
+                matching.append({
+                    'searched_path': relative_path_to_search,
+                    'absolute_path': absolute_path,
+                    'relative_path': relative_path,
+                    'modification_time': modification_time,
+                    'file_size': file_size,
+                    'inode': inode,
+                })
 
     return matching
 
@@ -178,6 +199,120 @@ def write_json(path: str, data: Dict[str, Any]) -> bool:
     return write_file(path, json.dumps(data, cls=dbt.utils.JSONEncoder))
 
 
+# The file suffix for each supported compression
+COMPRESSION_SUFFIXES: Dict[str, str] = {
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+
+
+def _import_zstandard():
+    try:
+        import zstandard  # type: ignore
+    except ImportError:
+        raise dbt.exceptions.RuntimeException(
+            'zstd compression requires the zstandard package. Install it '
+            'with `pip install zstandard`.'
+        )
+    return zstandard
+
+
+@contextmanager
+def open_compressed(
+    path: str, mode: str = 'r', compression: Optional[str] = None
+) -> Iterator[IO[str]]:
+    """Open the file at `path` as text for reading ('r') or writing ('w'),
+    decompressing or compressing it with `compression` if it's set.
+    """
+    path = convert_path(path)
+    if compression is None:
+        with open(path, mode, encoding='utf-8') as fp:
+            yield fp
+    elif compression == 'gzip':
+        # the default level of 9 is much slower for very little gain
+        with gzip.open(
+            path, mode + 't', compresslevel=6, encoding='utf-8'
+        ) as fp:
+            yield fp
+    elif compression == 'zstd':
+        zstandard = _import_zstandard()
+        with open(path, mode + 'b') as raw:
+            if mode == 'r':
+                stream = zstandard.ZstdDecompressor().stream_reader(raw)
+            else:
+                stream = zstandard.ZstdCompressor().stream_writer(raw)
+            with io.TextIOWrapper(stream, encoding='utf-8') as fp:
+                yield fp
+    else:
+        raise dbt.exceptions.InternalException(
+            f'Unknown compression "{compression}"'
+        )
+
+
+def find_compressed(path: str) -> Optional[Tuple[str, Optional[str]]]:
+    """Find the file at `path`, or a compressed copy of it at `path` with
+    the compression's suffix. Return the path that exists and its
+    compression, or None if there isn't one.
+    """
+    candidates: List[Tuple[str, Optional[str]]] = [(path, None)]
+    candidates.extend(
+        (path + suffix, compression)
+        for compression, suffix in COMPRESSION_SUFFIXES.items()
+    )
+    for candidate, compression in candidates:
+        if os.path.isfile(candidate):
+            return candidate, compression
+    return None
+
+
+def read_compressed_json(path: str) -> Dict[str, Any]:
+    """Read the json file at `path`, or a compressed copy of it."""
+    found = find_compressed(path)
+    if found is None:
+        raise FileNotFoundError(
+            errno.ENOENT, os.strerror(errno.ENOENT), path
+        )
+    found_path, compression = found
+    with open_compressed(found_path, 'r', compression) as fp:
+        return json.load(fp)
+
+
+def write_compressed(
+    path: str, chunks: Iterable[str], compression: Optional[str] = None
+) -> str:
+    """Write the chunks of text to `path`, or to `path` with the
+    compression's suffix if `compression` is set, and remove any copies
+    written with another compression. Return the path written to.
+
+    The chunks are written to a temporary file that's then moved into
+    place, so if writing fails partway through, the previous file is left
+    as it was.
+    """
+    if compression is None:
+        target = path
+    elif compression in COMPRESSION_SUFFIXES:
+        target = path + COMPRESSION_SUFFIXES[compression]
+    else:
+        raise dbt.exceptions.InternalException(
+            f'Unknown compression "{compression}"'
+        )
+    make_directory(os.path.dirname(path))
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target))
+    os.close(fd)
+    try:
+        with open_compressed(tmp_path, 'w', compression) as fp:
+            for chunk in chunks:
+                fp.write(chunk)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    for other in [path] + [path + s for s in COMPRESSION_SUFFIXES.values()]:
+        if other != target and os.path.isfile(other):
+            os.remove(other)
+    return target
+
+
 def _windows_rmdir_readonly(
     func: Callable[[str], Any], path: str, exc: Tuple[Any, OSError, Any]
 ):
@@ -1,6 +1,8 @@
 import os
 from collections import defaultdict
-from typing import List, Dict, Any, Tuple, cast, Optional
+from typing import (
+    List, Dict, Any, Tuple, cast, Optional, FrozenSet, Set
+)
 
 import networkx as nx  # type: ignore
 import sqlparse
@@ -25,7 +27,7 @@ from dbt.exceptions import (
     InternalException,
     RuntimeException,
 )
-from dbt.graph import Graph
+from dbt.graph import CompactGraph, Graph
 from dbt.logger import GLOBAL_LOGGER as logger
 from dbt.node_types import NodeType
 from dbt.utils import pluralize
@@ -120,6 +122,26 @@ def _get_tests_for_node(manifest: Manifest, unique_id: UniqueID) -> List[UniqueI
     return tests
 
 
+def _has_upstream_outside(
+    graph: nx.DiGraph, unique_id: UniqueID, nodes: FrozenSet[UniqueID]
+) -> bool:
+    """Return True if anything upstream of the given node is not in `nodes`.
+
+    This stops at the first such upstream node, so it visits at most
+    len(nodes) ancestors.
+    """
+    seen: Set[UniqueID] = set()
+    to_visit = list(graph.predecessors(unique_id))
+    while to_visit:
+        upstream = to_visit.pop()
+        if upstream not in nodes:
+            return True
+        if upstream not in seen:
+            seen.add(upstream)
+            to_visit.extend(graph.predecessors(upstream))
+    return False
+
+
 class Linker:
     def __init__(self, data=None):
         if data is None:
@@ -455,51 +477,90 @@ class Compiler:
         #  \/      test2 -------   |
         # test1 -------------------
 
-        for node_id in linker.graph:
-            # If node is executable (in manifest.nodes) and does _not_
-            # represent a test, continue.
-            if (
-                node_id in manifest.nodes and
-                manifest.nodes[node_id].resource_type != NodeType.Test
+        # Rather than walking everything upstream of every node, this does
+        # one sweep over the graph to find what's downstream of each node,
+        # as a bitset over the nodes that can get an edge, indexed in the
+        # order the nodes are visited below. A node can get an edge from a
+        # test exactly when it's downstream of every node the test depends
+        # on, so tests are grouped by the set of nodes they depend on, and
+        # each group's candidates are the intersection of those bitsets.
+        targets: List[UniqueID] = [
+            node_id for node_id in linker.graph
+            if node_id in manifest.nodes and
+            manifest.nodes[node_id].resource_type != NodeType.Test
+        ]
+        target_bits = {
+            node_id: 1 << idx for idx, node_id in enumerate(targets)
+        }
+        downstream: Dict[UniqueID, int] = {}
+        for node_id in reversed(list(nx.topological_sort(linker.graph))):
+            bits = 0
+            for child in linker.graph.successors(node_id):
+                bits |= downstream[child] | target_bits.get(child, 0)
+            downstream[node_id] = bits
+
+        tests_by_depends_on: Dict[FrozenSet[UniqueID], List[UniqueID]] = \
+            defaultdict(list)
+        all_tests = {
+            test_id
+            for node_id in linker.graph
+            for test_id in _get_tests_for_node(manifest, node_id)
+        }
+        for test_id in sorted(all_tests):
+            # Get the set of all nodes that the test depends on. This is
+            # necessary because tests can depend on multiple nodes (ex:
+            # relationship tests). Test nodes do not distinguish between what
+            # node the test is "testing" and what node(s) it depends on.
+            test_depends_on = frozenset(
+                manifest.nodes[test_id].depends_on_nodes
+            )
+            tests_by_depends_on[test_depends_on].append(test_id)
+
+        # For each candidate, the tests whose nodes are a proper (or strict)
+        # subset of everything upstream of it, and the tests whose nodes are
+        # exactly everything upstream of it.
+        strict_tests: Dict[UniqueID, List[UniqueID]] = defaultdict(list)
+        equal_tests: Dict[UniqueID, List[UniqueID]] = defaultdict(list)
+        for test_depends_on, tests in tests_by_depends_on.items():
+            if not test_depends_on or any(
+                n not in linker.graph for n in test_depends_on
             ):
-                # Get *everything* upstream of the node
-                all_upstream_nodes = nx.traversal.bfs_tree(
-                    linker.graph, node_id, reverse=True
-                )
-                # Get the set of upstream nodes not including the current node.
-                upstream_nodes = set([
-                    n for n in all_upstream_nodes if n != node_id
-                ])
-
-                # Get all tests that depend on any upstream nodes.
-                upstream_tests = []
-                for upstream_node in upstream_nodes:
-                    upstream_tests += _get_tests_for_node(
-                        manifest,
-                        upstream_node
-                    )
-
-                for upstream_test in upstream_tests:
-                    # Get the set of all nodes that the test depends on
-                    # including the upstream_node itself. This is necessary
-                    # because tests can depend on multiple nodes (ex:
-                    # relationship tests). Test nodes do not distinguish
-                    # between what node the test is "testing" and what
-                    # node(s) it depends on.
-                    test_depends_on = set(
-                        manifest.nodes[upstream_test].depends_on_nodes
-                    )
-
-                    # If the set of nodes that an upstream test depends on
-                    # is a proper (or strict) subset of all upstream nodes of
-                    # the current node, add an edge from the upstream test
-                    # to the current node. Must be a proper/strict subset to
-                    # avoid adding a circular dependency to the graph.
-                    if (test_depends_on < upstream_nodes):
-                        linker.graph.add_edge(
-                            upstream_test,
-                            node_id
-                        )
+                continue
+            candidates = -1
+            for depends_on in test_depends_on:
+                candidates &= downstream[depends_on]
+            if candidates <= 0:
+                continue
+            # the positions of the set bits, lowest first
+            positions = bin(candidates)[:1:-1]
+            idx = positions.find('1')
+            while idx >= 0:
+                node_id = targets[idx]
+                if _has_upstream_outside(linker.graph, node_id, test_depends_on):
+                    strict_tests[node_id].extend(tests)
+                else:
+                    equal_tests[node_id].extend(tests)
+                idx = positions.find('1', idx + 1)
+
+        # If the set of nodes that an upstream test depends on is a proper
+        # (or strict) subset of all upstream nodes of the current node, add
+        # an edge from the upstream test to the current node. Must be a
+        # proper/strict subset to avoid adding a circular dependency to the
+        # graph. Visiting the nodes in order, a test with an edge to a node
+        # is upstream of everything downstream of that node, which makes
+        # those nodes' upstream a strict superset of a test's nodes that was
+        # equal to it.
+        new_edges: List[Tuple[UniqueID, UniqueID]] = []
+        has_upstream_test = 0
+        for node_id in targets:
+            tests = strict_tests.get(node_id, [])
+            if has_upstream_test & target_bits[node_id]:
+                tests = tests + equal_tests.get(node_id, [])
+            if tests:
+                new_edges.extend((test_id, node_id) for test_id in tests)
+                has_upstream_test |= downstream[node_id]
+
+        linker.graph.add_edges_from(new_edges)
 
     def compile(self, manifest: Manifest, write=True) -> Graph:
         self.initialize()
@@ -513,6 +574,8 @@ class Compiler:
             self.write_graph_file(linker, manifest)
         print_compile_stats(stats)
 
+        if flags.GRAPH_BACKEND == 'compact':
+            return CompactGraph.from_networkx(linker.graph)
         return Graph(linker.graph)
 
     # writes the "compiled_sql" into the target/compiled directory
@@ -90,7 +90,7 @@ class MacroResolver:
 
         if macro.name in namespace:
             raise_duplicate_macro_name(
-                macro, macro, macro.package_name
+                namespace[macro.name], macro, macro.package_name
             )
         package_namespaces[macro.package_name][macro.name] = macro
 
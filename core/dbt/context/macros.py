@@ -1,8 +1,10 @@
 from typing import (
-    Any, Dict, Iterable, Union, Optional, List, Iterator, Mapping, Set
+    Any, Callable, Dict, Iterable, Union, Optional, List, Iterator, Mapping,
+    Set
 )
 
 from dbt.clients.jinja import MacroGenerator, MacroStack
+from dbt.context.macro_resolver import MacroResolver
 from dbt.contracts.graph.parsed import ParsedMacro
 from dbt.include.global_project import PROJECT_NAME as GLOBAL_PROJECT_NAME
 from dbt.exceptions import (
@@ -10,9 +12,35 @@ from dbt.exceptions import (
 )
 
 
-FlatNamespace = Dict[str, MacroGenerator]
+FlatNamespace = Mapping[str, MacroGenerator]
 NamespaceMember = Union[FlatNamespace, MacroGenerator]
-FullNamespace = Dict[str, NamespaceMember]
+FullNamespace = Mapping[str, NamespaceMember]
+
+
+# A read-only view of a flat namespace of ParsedMacros (a package, or the
+# merged internal packages) that creates the MacroGenerator for a macro the
+# first time it's looked up. The namespaces it wraps come from a
+# MacroResolver and are shared by every context built from the manifest.
+class LazyFlatNamespace(Mapping):
+    def __init__(
+        self,
+        macros: Mapping[str, ParsedMacro],
+        bind: Callable[[ParsedMacro], MacroGenerator],
+    ):
+        self._macros = macros
+        self._bind = bind
+
+    def __getitem__(self, key: str) -> MacroGenerator:
+        return self._bind(self._macros[key])
+
+    def __contains__(self, key) -> bool:
+        return key in self._macros
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._macros)
+
+    def __len__(self):
+        return len(self._macros)
 
 
 # The point of this class is to collect the various macros
@@ -29,11 +57,11 @@ class MacroNamespace(Mapping):
         global_namespace: FlatNamespace,  # root package macros
         local_namespace: FlatNamespace,   # packages for *this* node
         global_project_namespace: FlatNamespace,  # internal packages
-        packages: Dict[str, FlatNamespace],  # non-internal packages
+        packages: Mapping[str, FlatNamespace],  # non-internal packages
     ):
         self.global_namespace: FlatNamespace = global_namespace
         self.local_namespace: FlatNamespace = local_namespace
-        self.packages: Dict[str, FlatNamespace] = packages
+        self.packages: Mapping[str, FlatNamespace] = packages
         self.global_project_namespace: FlatNamespace = global_project_namespace
 
     def _search_order(self) -> Iterable[Union[FullNamespace, FlatNamespace]]:
@@ -86,7 +114,8 @@ class MacroNamespace(Mapping):
 
 # This class builds the MacroNamespace by adding macros to
 # internal_packages or packages, and locals/globals.
-# Call 'build_namespace' to return a MacroNamespace.
+# Call 'build_namespace' to return a MacroNamespace, or
+# 'build_lazy_namespace' to return one that is backed by a MacroResolver.
 # This is used by ManifestContext (and subclasses)
 class MacroNamespaceBuilder:
     def __init__(
@@ -105,19 +134,19 @@ class MacroNamespaceBuilder:
         # macro_func is added here if in root package, since
         # the root package acts as a "global" namespace, overriding
         # everything else except local external package macro calls
-        self.globals: FlatNamespace = {}
+        self.globals: Dict[str, MacroGenerator] = {}
         # macro_func is added here if it's the package for this node
-        self.locals: FlatNamespace = {}
+        self.locals: Dict[str, MacroGenerator] = {}
         # Create a dictionary of [package name][macro name] =
         #     MacroGenerator object which acts like a function
-        self.internal_packages: Dict[str, FlatNamespace] = {}
-        self.packages: Dict[str, FlatNamespace] = {}
+        self.internal_packages: Dict[str, Dict[str, MacroGenerator]] = {}
+        self.packages: Dict[str, Dict[str, MacroGenerator]] = {}
         self.thread_ctx = thread_ctx
         self.node = node
 
     def _add_macro_to(
         self,
-        hierarchy: Dict[str, FlatNamespace],
+        hierarchy: Dict[str, Dict[str, MacroGenerator]],
         macro: ParsedMacro,
         macro_func: MacroGenerator,
     ):
@@ -168,7 +197,7 @@ class MacroNamespaceBuilder:
 
         # Iterate in reverse-order and overwrite: the packages that are first
         # in the list are the ones we want to "win".
-        global_project_namespace: FlatNamespace = {}
+        global_project_namespace: Dict[str, MacroGenerator] = {}
         for pkg in reversed(self.internal_package_names_order):
             if pkg in self.internal_packages:
                 # add the macros pointed to by this package name
@@ -180,3 +209,39 @@ class MacroNamespaceBuilder:
             global_project_namespace=global_project_namespace,  # internal packages
             packages=self.packages,  # non internal_packages
         )
+
+    def build_lazy_namespace(
+        self, macro_resolver: MacroResolver, ctx: Dict[str, Any]
+    ) -> MacroNamespace:
+        """Build a MacroNamespace over the package/name index of an existing
+        MacroResolver. Unlike build_namespace, this doesn't visit every macro:
+        a MacroGenerator is only created for a macro when it is looked up, and
+        then reused for later lookups (by name or by package).
+        """
+        generators: Dict[str, MacroGenerator] = {}
+
+        def bind(macro: ParsedMacro) -> MacroGenerator:
+            if macro.unique_id not in generators:
+                generators[macro.unique_id] = MacroGenerator(
+                    macro, ctx, self.node, self.thread_ctx
+                )
+            return generators[macro.unique_id]
+
+        packages = {
+            package_name: LazyFlatNamespace(macros, bind)
+            for package_name, macros in macro_resolver.packages.items()
+        }
+        local_namespace: FlatNamespace = {}
+        if self.search_package not in self.internal_package_names:
+            local_namespace = packages.get(self.search_package, {})
+
+        return MacroNamespace(
+            global_namespace=LazyFlatNamespace(
+                macro_resolver.root_package_macros, bind
+            ),
+            local_namespace=local_namespace,
+            global_project_namespace=LazyFlatNamespace(
+                macro_resolver.internal_packages_namespace, bind
+            ),
+            packages=packages,
+        )
@@ -1,6 +1,8 @@
 from typing import List
 
-from dbt.clients.jinja import MacroStack
+from dbt.clients.jinja import (
+    MacroContextView, MacroStack, MACRO_NAMESPACE_KEY
+)
 from dbt.contracts.connection import AdapterRequiredConfig
 from dbt.contracts.graph.manifest import Manifest
 from dbt.context.macro_resolver import TestMacroNamespace
@@ -34,12 +36,15 @@ class ManifestContext(ConfiguredContext):
         self.namespace = self._build_namespace()
 
     def _build_namespace(self):
-        # this takes all the macros in the manifest and adds them
-        # to the MacroNamespaceBuilder stored in self.namespace
+        # the package/name index of the manifest's macros is shared by all
+        # of the contexts built from the manifest, so building a namespace
+        # doesn't depend on the number of macros. MacroGenerators are only
+        # created for the macros that are actually looked up.
         builder = self._get_namespace_builder()
-        return builder.build_namespace(
-            self.manifest.macros.values(), self._ctx
+        macro_resolver = self.manifest.get_macro_resolver(
+            builder.root_package, builder.internal_package_names_order
         )
+        return builder.build_lazy_namespace(macro_resolver, self._ctx)
 
     def _get_namespace_builder(self) -> MacroNamespaceBuilder:
         # avoid an import loop
@@ -64,7 +69,11 @@ class ManifestContext(ConfiguredContext):
             dct.update(self.namespace.local_namespace)
             dct.update(self.namespace.project_namespace)
         else:
-            dct.update(self.namespace)
+            # The full namespace isn't copied: jinja's MacroNamespaceContext
+            # resolves names from it when templates are rendered, and the
+            # `context` member is a view that includes its macros.
+            dct[MACRO_NAMESPACE_KEY] = self.namespace
+            dct['context'] = MacroContextView(dct)
         return dct
 
 
@@ -44,6 +44,9 @@ class FilePath(dbtClassMixin):
     relative_path: str
     modification_time: float
     project_root: str
+    # these are 0 when they aren't known
+    file_size: int = 0
+    inode: int = 0
 
     @property
     def search_key(self) -> str:
@@ -147,7 +150,7 @@ class BaseSourceFile(dbtClassMixin, SerializableType):
     project_name: Optional[str] = None
     # Parse file type: i.e. which parser will process this file
     parse_file_type: Optional[ParseFileType] = None
-    # we don't want to serialize this
+    # this is only serialized for non-schema files
     contents: Optional[str] = None
     # the unique IDs contained in this file
 
@@ -176,10 +179,6 @@ class BaseSourceFile(dbtClassMixin, SerializableType):
         for key in dct_keys:
             if isinstance(dct[key], list) and not dct[key]:
                 del dct[key]
-        # remove contents. Schema files will still have 'dict_from_yaml'
-        # from the contents
-        if 'contents' in dct:
-            del dct['contents']
         return dct
 
 
@@ -249,8 +248,11 @@ class SchemaSourceFile(BaseSourceFile):
 
     def __post_serialize__(self, dct):
         dct = super().__post_serialize__(dct)
-        # Remove partial parsing specific data
-        for key in ('pp_files', 'pp_test_index', 'pp_dict'):
+        # Remove partial parsing specific data, and the contents. Schema
+        # files still have 'dict_from_yaml' from the contents. Other files
+        # keep their contents, so that unchanged files don't need to be
+        # read again.
+        for key in ('pp_files', 'pp_test_index', 'pp_dict', 'contents'):
             if key in dct:
                 del dct[key]
         return dct
@@ -0,0 +1,237 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+from dbt.contracts.files import FileHash
+from dbt.contracts.graph.compiled import ManifestNode
+from dbt.contracts.graph.parsed import (
+    HasTestMetadata,
+    ParsedExposure,
+    ParsedSourceDefinition,
+    same_seed_checksum,
+)
+from dbt.contracts.util import (
+    ArtifactMixin, BaseArtifactMetadata, schema_version
+)
+from dbt.dataclass_schema import dbtClassMixin
+from dbt.node_types import NodeType
+from dbt.utils import JSONEncoder, md5
+
+
+DigestTarget = Union[ManifestNode, ParsedSourceDefinition, ParsedExposure]
+
+
+def fingerprint(value: Any) -> str:
+    """Hash a json-serializable value, so two values have the same
+    fingerprint when they're equal.
+    """
+    return md5(json.dumps(
+        value, sort_keys=True, separators=(',', ':'), cls=JSONEncoder
+    ))
+
+
+def _to_dict(value: Optional[dbtClassMixin]) -> Optional[Dict[str, Any]]:
+    if value is None:
+        return None
+    return value.to_dict(omit_none=False)
+
+
+def _column_descriptions(node: ManifestNode) -> str:
+    return fingerprint({
+        name: column.description for name, column in node.columns.items()
+    })
+
+
+def _source_relation(source: ParsedSourceDefinition) -> str:
+    return fingerprint([source.database, source.schema, source.identifier])
+
+
+def _source_contents(source: ParsedSourceDefinition) -> str:
+    return fingerprint([
+        _to_dict(source.quoting),
+        _to_dict(source.freshness),
+        source.loaded_at_field,
+        _to_dict(source.external),
+    ])
+
+
+def _exposure_contents(exposure: ParsedExposure) -> str:
+    return fingerprint([
+        exposure.type,
+        _to_dict(exposure.owner),
+        exposure.maturity,
+        exposure.url,
+        sorted(exposure.depends_on.nodes),
+    ])
+
+
+@dataclass
+class NodeDigest(dbtClassMixin):
+    """The parts of a node that `state:` selection compares, with the large
+    ones hashed. The same_* methods mirror the ones on the nodes, but are
+    called on the digest of the previous version with the current node.
+    """
+    fqn: List[str]
+    body: Optional[str] = None
+    checksum: Optional[FileHash] = None
+    unrendered_config: Dict[str, Any] = field(default_factory=dict)
+    description: Optional[str] = None
+    column_descriptions: Optional[str] = None
+    relation: Optional[str] = None
+    contents: Optional[str] = None
+
+    @classmethod
+    def from_node(cls, node: DigestTarget) -> 'NodeDigest':
+        if isinstance(node, ParsedSourceDefinition):
+            return cls(
+                fqn=node.fqn,
+                unrendered_config=node.unrendered_config,
+                relation=_source_relation(node),
+                contents=_source_contents(node),
+            )
+        elif isinstance(node, ParsedExposure):
+            return cls(
+                fqn=node.fqn,
+                description=fingerprint(node.description),
+                contents=_exposure_contents(node),
+            )
+        checksum = None
+        if node.resource_type == NodeType.Seed:
+            checksum = node.checksum
+        return cls(
+            fqn=node.fqn,
+            body=fingerprint(node.raw_sql),
+            checksum=checksum,
+            unrendered_config=node.unrendered_config,
+            description=fingerprint(node.description),
+            column_descriptions=_column_descriptions(node),
+        )
+
+    def same_fqn(self, new: DigestTarget) -> bool:
+        return self.fqn == new.fqn
+
+    def same_body(self, new: ManifestNode) -> bool:
+        if new.resource_type == NodeType.Seed:
+            if self.checksum is None:
+                return False
+            return same_seed_checksum(new, self.checksum)
+        return self.body == fingerprint(new.raw_sql)
+
+    def same_config(
+        self, new: Union[ManifestNode, ParsedSourceDefinition]
+    ) -> bool:
+        return new.config.same_contents(
+            new.unrendered_config,
+            self.unrendered_config,
+        )
+
+    def same_persisted_description(self, new: ManifestNode) -> bool:
+        if new._persist_relation_docs():
+            if self.description != fingerprint(new.description):
+                return False
+
+        if new._persist_column_docs():
+            if self.column_descriptions != _column_descriptions(new):
+                return False
+
+        return True
+
+    def same_database_representation(
+        self, new: Union[ManifestNode, ParsedSourceDefinition]
+    ) -> bool:
+        if isinstance(new, ParsedSourceDefinition):
+            return self.relation == _source_relation(new)
+        keys = ('database', 'schema', 'alias')
+        for key in keys:
+            mine = new.unrendered_config.get(key)
+            others = self.unrendered_config.get(key)
+            if mine != others:
+                return False
+        return True
+
+    def same_contents(self, new: DigestTarget) -> bool:
+        if isinstance(new, ParsedSourceDefinition):
+            return (
+                self.same_database_representation(new) and
+                self.same_fqn(new) and
+                self.same_config(new) and
+                self.contents == _source_contents(new) and
+                True
+            )
+        elif isinstance(new, ParsedExposure):
+            return (
+                self.same_fqn(new) and
+                self.contents == _exposure_contents(new) and
+                self.description == fingerprint(new.description) and
+                True
+            )
+        elif isinstance(new, HasTestMetadata):
+            return (
+                self.same_config(new) and
+                self.same_fqn(new) and
+                True
+            )
+        return (
+            self.same_body(new) and
+            self.same_config(new) and
+            self.same_persisted_description(new) and
+            self.same_fqn(new) and
+            self.same_database_representation(new) and
+            True
+        )
+
+
+@dataclass
+class StateDigestMetadata(BaseArtifactMetadata):
+    dbt_schema_version: str = field(
+        default_factory=lambda: str(StateDigest.dbt_schema_version)
+    )
+    # the metadata of the manifest this digest was written with, so --state
+    # can tell whether it describes the manifest next to it
+    manifest_invocation_id: Optional[str] = None
+    manifest_generated_at: Optional[str] = None
+
+
+@dataclass
+@schema_version('state-digest', 1)
+class StateDigest(ArtifactMixin):
+    """What `state:` selection needs from a manifest, written next to it
+    so --state can read this instead of the whole manifest.
+    """
+    streamed_fields = ('nodes', 'macros')
+    compressible = True
+
+    metadata: StateDigestMetadata = field(
+        metadata=dict(description='Metadata about the state digest'),
+    )
+    nodes: Mapping[str, NodeDigest] = field(
+        metadata=dict(description=(
+            'The digest of each node, source and exposure by unique ID'
+        ))
+    )
+    macros: Mapping[str, str] = field(
+        metadata=dict(description=(
+            'The fingerprint of the SQL of each macro by unique ID'
+        ))
+    )
+
+    @classmethod
+    def from_manifest(cls, manifest) -> 'StateDigest':
+        nodes: Dict[str, NodeDigest] = {}
+        for collection in (
+            manifest.nodes, manifest.sources, manifest.exposures
+        ):
+            for unique_id, node in collection.items():
+                nodes[unique_id] = NodeDigest.from_node(node)
+        manifest_metadata = manifest.metadata.to_dict(omit_none=False)
+        return cls(
+            metadata=StateDigestMetadata(
+                manifest_invocation_id=manifest_metadata['invocation_id'],
+                manifest_generated_at=manifest_metadata['generated_at'],
+            ),
+            nodes=nodes,
+            macros={
+                unique_id: fingerprint(macro.macro_sql)
+                for unique_id, macro in manifest.macros.items()
+            },
+        )
@@ -1,15 +1,17 @@
 import enum
+import threading
 from dataclasses import dataclass, field
 from itertools import chain, islice
 from mashumaro import DataClassMessagePackMixin
 from multiprocessing.synchronize import Lock
 from typing import (
     Dict, List, Optional, Union, Mapping, MutableMapping, Any, Set, Tuple,
-    TypeVar, Callable, Generic, cast, AbstractSet, ClassVar
+    TypeVar, Callable, Generic, cast, AbstractSet, ClassVar, Iterator
 )
 from typing_extensions import Protocol
 from uuid import UUID
 
+from dbt.context.macro_resolver import MacroResolver
 from dbt.contracts.graph.compiled import (
     CompileResultNode, ManifestNode, NonSourceCompiledNode, GraphMemberNode
 )
@@ -464,6 +466,46 @@ class MacroMethods:
     def __init__(self):
         self.macros = []
         self.metadata = {}
+        self._macro_resolver = None
+        self._macros_by_name = None
+
+    def get_macro_resolver(
+        self, root_project_name: str, internal_package_names: List[str]
+    ) -> MacroResolver:
+        """Get the MacroResolver for this manifest's macros. It is built once
+        and shared by every context created from the manifest, until the
+        macros change.
+        """
+        resolver = self._macro_resolver
+        if (
+            resolver is None or
+            resolver.root_project_name != root_project_name or
+            resolver.internal_package_names != internal_package_names
+        ):
+            resolver = self.rebuild_macro_resolver(
+                root_project_name, internal_package_names
+            )
+        return resolver
+
+    def rebuild_macro_resolver(
+        self, root_project_name: str, internal_package_names: List[str]
+    ) -> MacroResolver:
+        self._macro_resolver = MacroResolver(
+            self.macros, root_project_name, internal_package_names
+        )
+        return self._macro_resolver
+
+    @property
+    def macros_by_name(self) -> Dict[str, List[str]]:
+        """The unique IDs of the macros with each name. This is built on first
+        use and then kept up to date by add_macro and remove_macro.
+        """
+        if self._macros_by_name is None:
+            macros_by_name: Dict[str, List[str]] = {}
+            for unique_id, macro in self.macros.items():
+                macros_by_name.setdefault(macro.name, []).append(unique_id)
+            self._macros_by_name = macros_by_name
+        return self._macros_by_name
 
     def find_macro_by_name(
         self, name: str, root_project_name: str, package: Optional[str]
@@ -520,10 +562,12 @@ class MacroMethods:
         # avoid an import cycle
         from dbt.adapters.factory import get_adapter_package_names
         candidates: CandidateList = CandidateList()
+        unique_ids = self.macros_by_name.get(name)
+        if not unique_ids:
+            return candidates
         packages = set(get_adapter_package_names(self.metadata.adapter_type))
-        for unique_id, macro in self.macros.items():
-            if macro.name != name:
-                continue
+        for unique_id in unique_ids:
+            macro = self.macros[unique_id]
             candidate = MacroCandidate(
                 locality=_get_locality(macro, root_project_name, packages),
                 macro=macro,
@@ -534,6 +578,46 @@ class MacroMethods:
         return candidates
 
 
+class LazyNodeDicts(Mapping[str, Dict[str, Any]]):
+    """A read-only mapping of unique IDs to the dictionaries of nodes,
+    sources or exposures, for the `graph` context variable. Each dictionary is
+    only built the first time it's looked up, and then reused.
+    """
+    def __init__(self, nodes: Mapping[str, Any]) -> None:
+        # copy the mapping, so nodes that are replaced in the manifest later
+        # (when they're compiled, or deferred) don't change the graph
+        self._nodes: Dict[str, Any] = dict(nodes)
+        self._dicts: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        if key in self._dicts:
+            return self._dicts[key]
+        node = self._nodes[key]
+        with self._lock:
+            # another thread may have built it while we waited
+            if key not in self._dicts:
+                self._dicts[key] = node.to_dict(omit_none=False)
+            return self._dicts[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._nodes
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __reduce__(self):
+        # the lock can't be pickled or copied
+        return self.__class__, (self._nodes,)
+
+
+def _serialize_flat_graph(flat_graph: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: dict(value) for key, value in flat_graph.items()}
+
+
 @dataclass
 class ParsingInfo:
     static_analysis_parsed_path_count: int = 0
@@ -562,7 +646,9 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
     selectors: MutableMapping[str, Any] = field(default_factory=dict)
     files: MutableMapping[str, AnySourceFile] = field(default_factory=dict)
     metadata: ManifestMetadata = field(default_factory=ManifestMetadata)
-    flat_graph: Dict[str, Any] = field(default_factory=dict)
+    flat_graph: Dict[str, Any] = field(
+        default_factory=dict, metadata={'serialize': _serialize_flat_graph}
+    )
     state_check: ManifestStateCheck = field(default_factory=ManifestStateCheck)
     source_patches: MutableMapping[SourceKey, SourcePatch] = field(default_factory=dict)
     disabled: MutableMapping[str, List[CompileResultNode]] = field(default_factory=dict)
@@ -579,6 +665,12 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
     _analysis_lookup: Optional[AnalysisLookup] = field(
         default=None, metadata={'serialize': lambda x: None, 'deserialize': lambda x: None}
     )
+    _macros_by_name: Optional[Dict[str, List[str]]] = field(
+        default=None, metadata={'serialize': lambda x: None, 'deserialize': lambda x: None}
+    )
+    _macro_resolver: Optional[MacroResolver] = field(
+        default=None, metadata={'serialize': lambda x: None, 'deserialize': lambda x: None}
+    )
     _parsing_info: ParsingInfo = field(
         default_factory=ParsingInfo,
         metadata={'serialize': lambda x: None, 'deserialize': lambda x: None}
@@ -633,20 +725,14 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
         only build it once and avoid any concurrency issues around it.
         Make sure you don't call this until you're done with building your
         manifest!
+
+        The dictionary of each node, source and exposure is only built when
+        it's first looked up, as most runs never use the `graph` variable.
         """
         self.flat_graph = {
-            'exposures': {
-                k: v.to_dict(omit_none=False)
-                for k, v in self.exposures.items()
-            },
-            'nodes': {
-                k: v.to_dict(omit_none=False)
-                for k, v in self.nodes.items()
-            },
-            'sources': {
-                k: v.to_dict(omit_none=False)
-                for k, v in self.sources.items()
-            }
+            'exposures': LazyNodeDicts(self.exposures),
+            'nodes': LazyNodeDicts(self.nodes),
+            'sources': LazyNodeDicts(self.sources),
         }
 
     def find_disabled_by_name(
@@ -967,8 +1053,27 @@ class Manifest(MacroMethods, DataClassMessagePackMixin, dbtClassMixin):
             raise_compiler_error(msg)
 
         self.macros[macro.unique_id] = macro
+        if self._macros_by_name is not None:
+            self._macros_by_name.setdefault(macro.name, []).append(
+                macro.unique_id
+            )
+        self._macro_resolver = None
         source_file.macros.append(macro.unique_id)
 
+    def remove_macro(self, unique_id: str) -> ParsedMacro:
+        """Remove a macro from the manifest (used by partial parsing) and
+        return it.
+        """
+        macro = self.macros.pop(unique_id)
+        if self._macros_by_name is not None:
+            unique_ids = self._macros_by_name.get(macro.name, [])
+            if unique_id in unique_ids:
+                unique_ids.remove(unique_id)
+            if not unique_ids:
+                self._macros_by_name.pop(macro.name, None)
+        self._macro_resolver = None
+        return macro
+
     def has_file(self, source_file: SourceFile) -> bool:
         key = source_file.file_id
         if key is None:
@@ -1058,6 +1163,8 @@ class MacroManifest(MacroMethods):
     def __init__(self, macros):
         self.macros = macros
         self.metadata = ManifestMetadata()
+        self._macro_resolver: Optional[MacroResolver] = None
+        self._macros_by_name: Optional[Dict[str, List[str]]] = None
         # This is returned by the 'graph' context property
         # in the ProviderContext class.
         self.flat_graph = {}
@@ -1069,6 +1176,11 @@ AnyManifest = Union[Manifest, MacroManifest]
 @dataclass
 @schema_version('manifest', 3)
 class WritableManifest(ArtifactMixin):
+    streamed_fields = (
+        'nodes', 'sources', 'macros', 'docs', 'exposures', 'disabled',
+    )
+    compressible = True
+
     nodes: Mapping[UniqueID, ManifestNode] = field(
         metadata=dict(description=(
             'The nodes defined in the dbt project and its dependencies'
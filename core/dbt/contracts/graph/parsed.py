@@ -347,15 +347,19 @@ class ParsedRPCNode(ParsedNode):
 
 
 def same_seeds(first: ParsedNode, second: ParsedNode) -> bool:
+    return same_seed_checksum(first, second.checksum)
+
+
+def same_seed_checksum(first: ParsedNode, checksum: FileHash) -> bool:
     # for seeds, we check the hashes. If the hashes are different types,
     # no match. If the hashes are both the same 'path', log a warning and
     # assume they are the same
     # if the current checksum is a path, we want to log a warning.
-    result = first.checksum == second.checksum
+    result = first.checksum == checksum
 
     if first.checksum.name == 'path':
         msg: str
-        if second.checksum.name != 'path':
+        if checksum.name != 'path':
             msg = (
                 f'Found a seed ({first.package_name}.{first.name}) '
                 f'>{MAXIMUM_SEED_SIZE_NAME} in size. The previous file was '
@@ -377,7 +381,7 @@ def same_seeds(first: ParsedNode, second: ParsedNode) -> bool:
             msg = (
                 f'Found a seed ({first.package_name}.{first.name}) '
                 f'>{MAXIMUM_SEED_SIZE_NAME} in size. The previous file had a '
-                f'checksum type of {second.checksum.name}, so it has changed'
+                f'checksum type of {checksum.name}, so it has changed'
             )
         warn_or_error(msg, node=first)
 
@@ -238,6 +238,12 @@ class UserConfig(ExtensibleDbtClassMixin, Replaceable, UserConfigContract):
     fail_fast: Optional[bool] = None
     use_experimental_parser: Optional[bool] = None
     static_parser: Optional[bool] = None
+    paranoid_hashing: Optional[bool] = None
+    parallel_parse: Optional[bool] = None
+    jinja_cache: Optional[bool] = None
+    artifact_compression: Optional[str] = None
+    relations_cache_ttl: Optional[int] = None
+    graph_backend: Optional[str] = None
 
 
 @dataclass
@@ -27,8 +27,6 @@ from typing import (
     Union, Dict, List, Optional, Any, NamedTuple, Sequence,
 )
 
-from dbt.clients.system import write_json
-
 
 @dataclass
 class TimingInfo(dbtClassMixin):
@@ -189,6 +187,8 @@ class RunExecutionResult(
 class RunResultsArtifact(ExecutionResult, ArtifactMixin):
     results: Sequence[RunResultOutput]
     args: Dict[str, Any] = field(default_factory=dict)
+    streamed_fields = ('results',)
+    compressible = True
 
     @classmethod
     def from_execution_results(
@@ -210,9 +210,6 @@ class RunResultsArtifact(ExecutionResult, ArtifactMixin):
             args=args
         )
 
-    def write(self, path: str):
-        write_json(path, self.to_dict(omit_none=False))
-
 
 @dataclass
 class RunOperationResult(ExecutionResult):
@@ -1,18 +1,129 @@
+import json
 from pathlib import Path
+from .graph.digest import StateDigest
 from .graph.manifest import WritableManifest
-from typing import Optional
+from .results import RunResultsArtifact
+from typing import Any, Dict, Optional
+from dbt.clients.system import find_compressed, open_compressed
 from dbt.exceptions import IncompatibleSchemaException
+from dbt.version import __version__ as dbt_version
+
+
+STATE_DIGEST_FILE_NAME = 'state_digest.json'
+
+# The manifest's metadata is its first field, so it's written first and is
+# within this many characters of the start of the file
+METADATA_HEAD_SIZE = 65536
+METADATA_KEY = '"metadata": '
+
+
+def _read_manifest_metadata(
+    path: str, compression: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    """Read the metadata of the manifest at `path` from the start of the
+    file, without loading or decompressing the whole manifest. Return None
+    if it can't be found.
+    """
+    try:
+        with open_compressed(path, 'r', compression) as fp:
+            head = fp.read(METADATA_HEAD_SIZE)
+    except Exception:
+        # e.g. a corrupt compressed file
+        return None
+    start = head.find(METADATA_KEY)
+    if start < 0:
+        return None
+    try:
+        metadata, _ = json.JSONDecoder().raw_decode(
+            head, start + len(METADATA_KEY)
+        )
+    except ValueError:
+        return None
+    if not isinstance(metadata, dict):
+        return None
+    return metadata
 
 
 class PreviousState:
     def __init__(self, path: Path):
         self.path: Path = path
-        self.manifest: Optional[WritableManifest] = None
+        self._manifest: Optional[WritableManifest] = None
+        self.digest: Optional[StateDigest] = None
+        self._results: Optional[RunResultsArtifact] = None
 
+        # the artifacts may have been written with --artifact-compression.
+        # The manifest is only read when something needs more than the
+        # digest has, like --defer.
+        self._manifest_path: Optional[str] = None
         manifest_path = self.path / 'manifest.json'
-        if manifest_path.exists() and manifest_path.is_file():
+        found_manifest = find_compressed(str(manifest_path))
+        if found_manifest is not None:
+            self._manifest_path = str(manifest_path)
+            self.digest = self._read_digest(*found_manifest)
+
+        # the run results are only used by --critical-path, so they're only
+        # read (and validated) when that asks for them
+        self._results_path: Optional[str] = None
+        results_path = self.path / 'run_results.json'
+        if find_compressed(str(results_path)) is not None:
+            self._results_path = str(results_path)
+
+    def _read_digest(
+        self, found_manifest_path: str, compression: Optional[str]
+    ) -> Optional[StateDigest]:
+        """Read the state digest written with the manifest. It's ignored if
+        it was written with another manifest, because then it doesn't
+        describe that manifest, or if another version of dbt wrote it.
+        """
+        digest_path = self.path / STATE_DIGEST_FILE_NAME
+        if find_compressed(str(digest_path)) is None:
+            return None
+        try:
+            digest = StateDigest.read(str(digest_path))
+        except Exception:
+            # it's only an optimization, the manifest has everything
+            return None
+        if digest.metadata.dbt_version != dbt_version:
+            return None
+        manifest_metadata = _read_manifest_metadata(
+            found_manifest_path, compression
+        )
+        if (
+            manifest_metadata is None or
+            manifest_metadata.get('generated_at') !=
+            digest.metadata.manifest_generated_at or
+            manifest_metadata.get('invocation_id') !=
+            digest.metadata.manifest_invocation_id
+        ):
+            return None
+        return digest
+
+    @property
+    def has_manifest(self) -> bool:
+        return self._manifest is not None or self._manifest_path is not None
+
+    @property
+    def manifest(self) -> Optional[WritableManifest]:
+        if self._manifest is None and self._manifest_path is not None:
+            try:
+                self._manifest = WritableManifest.read(self._manifest_path)
+            except IncompatibleSchemaException as exc:
+                exc.add_filename(self._manifest_path)
+                raise
+        return self._manifest
+
+    @manifest.setter
+    def manifest(self, value: Optional[WritableManifest]):
+        self._manifest = value
+        self._manifest_path = None
+        self.digest = None
+
+    @property
+    def results(self) -> Optional[RunResultsArtifact]:
+        if self._results is None and self._results_path is not None:
             try:
-                self.manifest = WritableManifest.read(str(manifest_path))
+                self._results = RunResultsArtifact.read(self._results_path)
             except IncompatibleSchemaException as exc:
-                exc.add_filename(str(manifest_path))
+                exc.add_filename(self._results_path)
                 raise
+        return self._results
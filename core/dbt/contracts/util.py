@@ -1,11 +1,16 @@
 import dataclasses
+import json
 import os
 from datetime import datetime
 from typing import (
-    List, Tuple, ClassVar, Type, TypeVar, Dict, Any, Optional
+    List, Tuple, ClassVar, Type, TypeVar, Dict, Any, Optional, Iterator,
+    Mapping
 )
 
-from dbt.clients.system import write_json, read_json
+from dbt import flags
+from dbt.clients.system import (
+    write_json, read_compressed_json, write_compressed
+)
 from dbt.exceptions import (
     InternalException,
     RuntimeException,
@@ -13,6 +18,7 @@ from dbt.exceptions import (
 from dbt.version import __version__
 from dbt.tracking import get_invocation_id
 from dbt.dataclass_schema import dbtClassMixin
+from dbt.utils import JSONEncoder
 
 SourceKey = Tuple[str, str]
 
@@ -116,7 +122,7 @@ class Readable:
     @classmethod
     def read(cls, path: str):
         try:
-            data = read_json(path)
+            data = read_compressed_json(path)
         except (EnvironmentError, ValueError) as exc:
             raise RuntimeException(
                 f'Could not read {cls.__name__} at "{path}" as JSON: {exc}'
@@ -208,6 +214,12 @@ T = TypeVar('T', bound='ArtifactMixin')
 @dataclasses.dataclass(init=False)
 class ArtifactMixin(VersionedSchema, Writable, Readable):
     metadata: BaseArtifactMetadata
+    # Fields that hold one entry per node or result. They're serialized one
+    # entry at a time when the artifact is written, instead of building the
+    # whole artifact as one dictionary first.
+    streamed_fields: ClassVar[Tuple[str, ...]] = ()
+    # Whether --artifact-compression applies to this artifact
+    compressible: ClassVar[bool] = False
 
     @classmethod
     def validate(cls, data):
@@ -216,3 +228,68 @@ class ArtifactMixin(VersionedSchema, Writable, Readable):
             raise InternalException(
                 'Cannot call from_dict with no schema version!'
             )
+
+    def write(self, path: str):
+        if not self.streamed_fields and not self.compressible:
+            return super().write(path)
+        compression = None
+        if self.compressible and flags.ARTIFACT_COMPRESSION != 'none':
+            compression = flags.ARTIFACT_COMPRESSION
+        write_compressed(path, self.iter_json(), compression)
+
+    def iter_json(self) -> Iterator[str]:
+        """Serialize the artifact to json in chunks. The result is the same
+        as dumping `to_dict(omit_none=False)`.
+        """
+        streamed: Dict[str, Any] = {}
+        for name in self.streamed_fields:
+            value = getattr(self, name)
+            if isinstance(value, (Mapping, list, tuple)):
+                streamed[name] = value
+        # serialize everything else the usual way
+        shell = dataclasses.replace(self, **{
+            name: {} if isinstance(value, Mapping) else []
+            for name, value in streamed.items()
+        })
+        dct = shell.to_dict(omit_none=False)
+
+        yield '{'
+        for idx, (key, value) in enumerate(dct.items()):
+            if idx:
+                yield ', '
+            yield _dump_json(key) + ': '
+            if key in streamed:
+                yield from _iter_json_entries(streamed[key])
+            else:
+                yield _dump_json(value)
+        yield '}'
+
+
+def _dump_json(value: Any) -> str:
+    return json.dumps(value, cls=JSONEncoder)
+
+
+def _serialize_entry(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_serialize_entry(v) for v in value]
+    elif isinstance(value, dbtClassMixin):
+        return value.to_dict(omit_none=False)
+    else:
+        return value
+
+
+def _iter_json_entries(collection) -> Iterator[str]:
+    if isinstance(collection, Mapping):
+        yield '{'
+        for idx, (key, value) in enumerate(collection.items()):
+            if idx:
+                yield ', '
+            yield _dump_json(key) + ': ' + _dump_json(_serialize_entry(value))
+        yield '}'
+    else:
+        yield '['
+        for idx, value in enumerate(collection):
+            if idx:
+                yield ', '
+            yield _dump_json(_serialize_entry(value))
+        yield ']'
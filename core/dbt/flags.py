@@ -18,6 +18,7 @@ STRICT_MODE = False  # Only here for backwards compatibility
 FULL_REFRESH = False  # subcommand
 STORE_FAILURES = False  # subcommand
 GREEDY = None  # subcommand
+CRITICAL_PATH = False  # subcommand
 
 # Global CLI commands
 USE_EXPERIMENTAL_PARSER = None
@@ -32,6 +33,12 @@ VERSION_CHECK = None
 FAIL_FAST = None
 SEND_ANONYMOUS_USAGE_STATS = None
 PRINTER_WIDTH = 80
+PARANOID_HASHING = None
+PARALLEL_PARSE = None
+JINJA_CACHE = None
+ARTIFACT_COMPRESSION = None
+RELATIONS_CACHE_TTL = None
+GRAPH_BACKEND = None
 
 # Global CLI defaults. These flags are set from three places:
 # CLI args, environment variables, and user_config (profiles.yml).
@@ -49,7 +56,21 @@ flag_defaults = {
     "VERSION_CHECK": True,
     "FAIL_FAST": False,
     "SEND_ANONYMOUS_USAGE_STATS": True,
-    "PRINTER_WIDTH": 80
+    "PRINTER_WIDTH": 80,
+    "PARANOID_HASHING": False,
+    "PARALLEL_PARSE": False,
+    "JINJA_CACHE": False,
+    "ARTIFACT_COMPRESSION": "none",
+    "RELATIONS_CACHE_TTL": 0,
+    "GRAPH_BACKEND": "networkx",
+}
+
+# The values that flags with a fixed set of choices accept. Values from the
+# command line are checked by argparse, but environment variables and
+# user_config aren't.
+flag_choices = {
+    "ARTIFACT_COMPRESSION": ("none", "gzip", "zstd"),
+    "GRAPH_BACKEND": ("networkx", "compact"),
 }
 
 
@@ -97,13 +118,16 @@ def set_from_args(args, user_config):
     global STRICT_MODE, FULL_REFRESH, WARN_ERROR, \
         USE_EXPERIMENTAL_PARSER, STATIC_PARSER, WRITE_JSON, PARTIAL_PARSE, \
         USE_COLORS, STORE_FAILURES, PROFILES_DIR, DEBUG, LOG_FORMAT, GREEDY, \
-        VERSION_CHECK, FAIL_FAST, SEND_ANONYMOUS_USAGE_STATS, PRINTER_WIDTH
+        VERSION_CHECK, FAIL_FAST, SEND_ANONYMOUS_USAGE_STATS, PRINTER_WIDTH, \
+        CRITICAL_PATH, PARANOID_HASHING, PARALLEL_PARSE, JINJA_CACHE, \
+        ARTIFACT_COMPRESSION, RELATIONS_CACHE_TTL, GRAPH_BACKEND
 
     STRICT_MODE = False  # backwards compatibility
     # cli args without user_config or env var option
     FULL_REFRESH = getattr(args, 'full_refresh', FULL_REFRESH)
     STORE_FAILURES = getattr(args, 'store_failures', STORE_FAILURES)
     GREEDY = getattr(args, 'greedy', GREEDY)
+    CRITICAL_PATH = getattr(args, 'critical_path', CRITICAL_PATH)
 
     # global cli flags with env var and user_config alternatives
     USE_EXPERIMENTAL_PARSER = get_flag_value('USE_EXPERIMENTAL_PARSER', args, user_config)
@@ -119,6 +143,12 @@ def set_from_args(args, user_config):
     FAIL_FAST = get_flag_value('FAIL_FAST', args, user_config)
     SEND_ANONYMOUS_USAGE_STATS = get_flag_value('SEND_ANONYMOUS_USAGE_STATS', args, user_config)
     PRINTER_WIDTH = get_flag_value('PRINTER_WIDTH', args, user_config)
+    PARANOID_HASHING = get_flag_value('PARANOID_HASHING', args, user_config)
+    PARALLEL_PARSE = get_flag_value('PARALLEL_PARSE', args, user_config)
+    JINJA_CACHE = get_flag_value('JINJA_CACHE', args, user_config)
+    ARTIFACT_COMPRESSION = get_flag_value('ARTIFACT_COMPRESSION', args, user_config)
+    RELATIONS_CACHE_TTL = get_flag_value('RELATIONS_CACHE_TTL', args, user_config)
+    GRAPH_BACKEND = get_flag_value('GRAPH_BACKEND', args, user_config)
 
 
 def get_flag_value(flag, args, user_config):
@@ -131,7 +161,10 @@ def get_flag_value(flag, args, user_config):
         if env_value is not None and env_value != '':
             env_value = env_value.lower()
             # non Boolean values
-            if flag in ['LOG_FORMAT', 'PRINTER_WIDTH', 'PROFILES_DIR']:
+            if flag in [
+                'LOG_FORMAT', 'PRINTER_WIDTH', 'PROFILES_DIR',
+                'ARTIFACT_COMPRESSION', 'RELATIONS_CACHE_TTL', 'GRAPH_BACKEND',
+            ]:
                 flag_value = env_value
             else:
                 flag_value = env_set_bool(env_value)
@@ -141,8 +174,18 @@ def get_flag_value(flag, args, user_config):
             flag_value = flag_defaults[flag]
     if flag == 'PRINTER_WIDTH':  # printer_width must be an int or it hangs
         flag_value = int(flag_value)
+    if flag == 'RELATIONS_CACHE_TTL':  # seconds, 0 disables the cache
+        flag_value = int(flag_value)
     if flag == 'PROFILES_DIR':
         flag_value = os.path.abspath(flag_value)
+    if flag in flag_choices and flag_value not in flag_choices[flag]:
+        # avoid an import cycle
+        from dbt.exceptions import ValidationException
+        choices = ', '.join(flag_choices[flag])
+        raise ValidationException(
+            f'Invalid value for {flag.lower()}: "{flag_value}" '
+            f'(choose from {choices})'
+        )
 
     return flag_value
 
@@ -162,4 +205,10 @@ def get_flag_dict():
         "fail_fast": FAIL_FAST,
         "send_anonymous_usage_stats": SEND_ANONYMOUS_USAGE_STATS,
         "printer_width": PRINTER_WIDTH,
+        "paranoid_hashing": PARANOID_HASHING,
+        "parallel_parse": PARALLEL_PARSE,
+        "jinja_cache": JINJA_CACHE,
+        "artifact_compression": ARTIFACT_COMPRESSION,
+        "relations_cache_ttl": RELATIONS_CACHE_TTL,
+        "graph_backend": GRAPH_BACKEND,
     }
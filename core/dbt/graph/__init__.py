@@ -15,3 +15,4 @@ from .cli import (  # noqa: F401
 )
 from .queue import GraphQueue  # noqa: F401
 from .graph import Graph, UniqueId  # noqa: F401
+from .compact import CompactGraph  # noqa: F401
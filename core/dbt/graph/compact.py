@@ -0,0 +1,253 @@
+from array import array
+from typing import (
+    Dict, Set, Iterable, Iterator, List, Optional, Tuple
+)
+
+import networkx as nx  # type: ignore
+
+from dbt.exceptions import InternalException
+from .graph import Graph, UniqueId
+
+
+def _csr(
+    pairs: List[Tuple[int, int]], size: int
+) -> Tuple['array[int]', 'array[int]']:
+    """Build compressed sparse row arrays from (source, target) pairs: the
+    targets of source i are targets[offsets[i]:offsets[i + 1]], in the order
+    of the pairs.
+    """
+    offsets = array('q', [0]) * (size + 1)
+    for source, _ in pairs:
+        offsets[source + 1] += 1
+    for idx in range(size):
+        offsets[idx + 1] += offsets[idx]
+    targets = array('i', [0]) * len(pairs)
+    position = offsets[:-1]
+    for source, target in pairs:
+        targets[position[source]] = target
+        position[source] += 1
+    return offsets, targets
+
+
+class CompactDiGraph:
+    """An immutable directed graph that interns its nodes' unique IDs to
+    consecutive ints and stores its edges in compressed sparse row arrays,
+    once by parent and once by child. An edge costs 8 bytes instead of the
+    dicts networkx keeps for it on both of its nodes, and traversals walk
+    arrays of ints instead of dicts keyed by long unique ID strings.
+
+    It implements the parts of the networkx.DiGraph API that Graph and
+    GraphQueue use, so it can stand in for one once the graph is built.
+    Duplicate edges are dropped, like networkx does.
+    """
+    def __init__(
+        self,
+        nodes: Iterable[UniqueId],
+        edges: Iterable[Tuple[UniqueId, UniqueId]] = (),
+    ):
+        self._ids: List[UniqueId] = list(dict.fromkeys(nodes))
+        self._index: Dict[UniqueId, int] = {
+            node: idx for idx, node in enumerate(self._ids)
+        }
+        pairs = list(dict.fromkeys(
+            (self._intern(parent), self._intern(child))
+            for parent, child in edges
+        ))
+        size = len(self._ids)
+        self._succ_offsets, self._succ = _csr(pairs, size)
+        self._pred_offsets, self._pred = _csr(
+            [(child, parent) for parent, child in pairs], size
+        )
+
+    @classmethod
+    def from_networkx(cls, graph: nx.DiGraph) -> 'CompactDiGraph':
+        return cls(graph.nodes(), graph.edges())
+
+    def _intern(self, node: UniqueId) -> int:
+        if node not in self._index:
+            self._index[node] = len(self._ids)
+            self._ids.append(node)
+        return self._index[node]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[UniqueId]:
+        return iter(self._ids)
+
+    def __contains__(self, node) -> bool:
+        return node in self._index
+
+    def has_node(self, node: UniqueId) -> bool:
+        return node in self._index
+
+    def nodes(self) -> List[UniqueId]:
+        return list(self._ids)
+
+    def number_of_edges(self) -> int:
+        return len(self._succ)
+
+    def edges(self) -> Iterator[Tuple[UniqueId, UniqueId]]:
+        ids, offsets, targets = self._ids, self._succ_offsets, self._succ
+        for idx, node in enumerate(ids):
+            for target in targets[offsets[idx]:offsets[idx + 1]]:
+                yield node, ids[target]
+
+    def successors(self, node: UniqueId) -> List[UniqueId]:
+        idx = self._index[node]
+        offsets = self._succ_offsets
+        return [
+            self._ids[target]
+            for target in self._succ[offsets[idx]:offsets[idx + 1]]
+        ]
+
+    def predecessors(self, node: UniqueId) -> List[UniqueId]:
+        idx = self._index[node]
+        offsets = self._pred_offsets
+        return [
+            self._ids[target]
+            for target in self._pred[offsets[idx]:offsets[idx + 1]]
+        ]
+
+    def in_degree(self) -> Iterator[Tuple[UniqueId, int]]:
+        offsets = self._pred_offsets
+        for idx, node in enumerate(self._ids):
+            yield node, offsets[idx + 1] - offsets[idx]
+
+    def subgraph(self, nodes: Iterable[UniqueId]) -> 'CompactDiGraph':
+        """Return the graph induced on `nodes`. Unlike networkx, this is a
+        copy rather than a view.
+        """
+        keep = bytearray(len(self._ids))
+        for node in nodes:
+            if node in self._index:
+                keep[self._index[node]] = 1
+        ids, offsets, targets = self._ids, self._succ_offsets, self._succ
+        return CompactDiGraph(
+            (node for idx, node in enumerate(ids) if keep[idx]),
+            (
+                (ids[idx], ids[target])
+                for idx in range(len(ids)) if keep[idx]
+                for target in targets[offsets[idx]:offsets[idx + 1]]
+                if keep[target]
+            ),
+        )
+
+    def reachable(
+        self,
+        sources: Iterable[UniqueId],
+        max_depth: Optional[int] = None,
+        reverse: bool = False,
+    ) -> Set[UniqueId]:
+        """Find the nodes that any of `sources` reaches by following at
+        least one and at most `max_depth` edges, backwards if `reverse` is
+        set. This is the same level-by-level search as
+        Graph._select_reachable, over ints.
+        """
+        if reverse:
+            offsets, targets = self._pred_offsets, self._pred
+        else:
+            offsets, targets = self._succ_offsets, self._succ
+        seen = bytearray(len(self._ids))
+        frontier = [self._index[node] for node in sources]
+        reached: List[int] = []
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_frontier = []
+            for idx in frontier:
+                for target in targets[offsets[idx]:offsets[idx + 1]]:
+                    if not seen[target]:
+                        seen[target] = 1
+                        next_frontier.append(target)
+            reached.extend(next_frontier)
+            frontier = next_frontier
+        ids = self._ids
+        return {ids[idx] for idx in reached}
+
+    def topological_generations(self) -> Iterator[List[UniqueId]]:
+        """Yield the nodes in topological order, grouped by their depth: the
+        nodes without parents first, then the nodes whose parents were all
+        in the earlier groups, and so on.
+        """
+        offsets, targets = self._succ_offsets, self._succ
+        pred_offsets = self._pred_offsets
+        remaining = array('i', (
+            pred_offsets[idx + 1] - pred_offsets[idx]
+            for idx in range(len(self._ids))
+        ))
+        generation = [idx for idx, count in enumerate(remaining) if not count]
+        found = 0
+        while generation:
+            found += len(generation)
+            yield [self._ids[idx] for idx in generation]
+            next_generation = []
+            for idx in generation:
+                for target in targets[offsets[idx]:offsets[idx + 1]]:
+                    remaining[target] -= 1
+                    if not remaining[target]:
+                        next_generation.append(target)
+            generation = next_generation
+        if found != len(self._ids):
+            raise InternalException('Found a cycle in the graph!')
+
+    def topological_sort(self) -> List[UniqueId]:
+        return [
+            node for generation in self.topological_generations()
+            for node in generation
+        ]
+
+
+class CompactGraph(Graph):
+    """A Graph over a CompactDiGraph instead of a networkx graph. Build the
+    graph with networkx and convert it with from_networkx.
+    """
+    def __init__(self, graph: CompactDiGraph):
+        super().__init__(graph)
+
+    @classmethod
+    def from_networkx(cls, graph: nx.DiGraph) -> 'CompactGraph':
+        return cls(CompactDiGraph.from_networkx(graph))
+
+    def _expect_nodes(self, nodes: Iterable[UniqueId]) -> Iterable[UniqueId]:
+        for node in nodes:
+            if not self.graph.has_node(node):
+                raise InternalException(
+                    f'Node {node} not found in the graph!'
+                )
+        return nodes
+
+    def ancestors(
+        self, node: UniqueId, max_depth: Optional[int] = None
+    ) -> Set[UniqueId]:
+        return self.select_parents({node}, max_depth)
+
+    def descendants(
+        self, node: UniqueId, max_depth: Optional[int] = None
+    ) -> Set[UniqueId]:
+        return self.select_children({node}, max_depth)
+
+    def select_children(
+        self, selected: Set[UniqueId], max_depth: Optional[int] = None
+    ) -> Set[UniqueId]:
+        return self.graph.reachable(self._expect_nodes(selected), max_depth)
+
+    def select_parents(
+        self, selected: Set[UniqueId], max_depth: Optional[int] = None
+    ) -> Set[UniqueId]:
+        return self.graph.reachable(
+            self._expect_nodes(selected), max_depth, reverse=True
+        )
+
+    def _new_graph(
+        self,
+        nodes: Set[UniqueId],
+        edges: List[Tuple[UniqueId, UniqueId]],
+    ) -> 'CompactGraph':
+        return CompactGraph(CompactDiGraph(nodes, edges))
+
+    def _topological_sort(self, nodes: Set[UniqueId]) -> List[UniqueId]:
+        return self.graph.subgraph(nodes).topological_sort()
+
+    def get_dependent_nodes(self, node: UniqueId):
+        return self.descendants(node)
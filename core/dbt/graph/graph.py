@@ -1,5 +1,5 @@
 from typing import (
-    Set, Iterable, Iterator, Optional, NewType
+    Callable, Dict, Set, Iterable, Iterator, List, Optional, NewType, Tuple
 )
 import networkx as nx  # type: ignore
 
@@ -58,18 +58,57 @@ class Graph:
     def select_children(
         self, selected: Set[UniqueId], max_depth: Optional[int] = None
     ) -> Set[UniqueId]:
-        descendants: Set[UniqueId] = set()
-        for node in selected:
-            descendants.update(self.descendants(node, max_depth))
-        return descendants
+        """Returns the descendants of every node in `selected`, like calling
+        descendants() for each of them
+        """
+        return self._select_reachable(
+            selected, max_depth, self.graph.successors
+        )
 
     def select_parents(
         self, selected: Set[UniqueId], max_depth: Optional[int] = None
     ) -> Set[UniqueId]:
-        ancestors: Set[UniqueId] = set()
+        """Returns the ancestors of every node in `selected`, like calling
+        ancestors() for each of them
+        """
+        return self._select_reachable(
+            selected, max_depth, self.graph.predecessors
+        )
+
+    def _select_reachable(
+        self,
+        selected: Set[UniqueId],
+        max_depth: Optional[int],
+        neighbors: Callable[[UniqueId], Iterable[UniqueId]],
+    ) -> Set[UniqueId]:
+        """Find the nodes that any node in `selected` reaches by following
+        `neighbors` at least once and at most `max_depth` times.
+
+        This is one breadth-first search from all the selected nodes at
+        once. Each level holds the nodes whose nearest selected node is that
+        many steps away, so every node is visited once and a node is within
+        max_depth of some selected node exactly when it's found by then.
+        Selected nodes aren't reached at depth 0, so one is only included if
+        another selected node reaches it.
+        """
         for node in selected:
-            ancestors.update(self.ancestors(node, max_depth))
-        return ancestors
+            if not self.graph.has_node(node):
+                raise InternalException(
+                    f'Node {node} not found in the graph!'
+                )
+        reached: Set[UniqueId] = set()
+        frontier = list(selected)
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_frontier = []
+            for node in frontier:
+                for neighbor in neighbors(node):
+                    if neighbor not in reached:
+                        reached.add(neighbor)
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        return reached
 
     def select_successors(self, selected: Set[UniqueId]) -> Set[UniqueId]:
         successors: Set[UniqueId] = set()
@@ -81,25 +120,95 @@ class Graph:
         """Create and return a new graph that is a shallow copy of the graph,
         but with only the nodes in include_nodes. Transitive edges across
         removed nodes are preserved as explicit new edges.
-        """
-        new_graph = nx.algorithms.transitive_closure(self.graph)
 
+        Only the edges needed to preserve reachability between selected nodes
+        are added: each selected node gets an edge to the nearest selected
+        nodes downstream of it, found by walking through unselected nodes.
+        """
         include_nodes = set(selected)
 
-        for node in self:
-            if node not in include_nodes:
-                new_graph.remove_node(node)
-
         for node in include_nodes:
-            if node not in new_graph:
+            if node not in self.graph:
                 raise ValueError(
                     "Couldn't find model '{}' -- does it exist or is "
                     "it disabled?".format(node)
                 )
+
+        frontiers = self._selected_frontiers(include_nodes)
+        edges: List[Tuple[UniqueId, UniqueId]] = []
+        for node in include_nodes:
+            for child in self.graph.successors(node):
+                if child in include_nodes:
+                    edges.append((node, child))
+                else:
+                    edges.extend(
+                        (node, target) for target in frontiers[child]
+                    )
+        return self._new_graph(include_nodes, edges)
+
+    def _new_graph(
+        self,
+        nodes: Set[UniqueId],
+        edges: List[Tuple[UniqueId, UniqueId]],
+    ) -> 'Graph':
+        """Create a graph of the same kind as this one, keeping the
+        attributes of the nodes
+        """
+        new_graph = nx.DiGraph()
+        new_graph.add_nodes_from(
+            (node, self.graph.nodes[node]) for node in nodes
+        )
+        new_graph.add_edges_from(edges)
         return Graph(new_graph)
 
+    def _selected_frontiers(
+        self, include_nodes: Set[UniqueId]
+    ) -> Dict[UniqueId, Set[UniqueId]]:
+        """For every unselected node downstream of a selected node, find the
+        selected nodes it reaches through unselected nodes only.
+        """
+        # every unselected node that a selected node reaches without passing
+        # through another selected node
+        to_visit = [
+            child for node in include_nodes
+            for child in self.graph.successors(node)
+            if child not in include_nodes
+        ]
+        between: Set[UniqueId] = set()
+        while to_visit:
+            node = to_visit.pop()
+            if node in between:
+                continue
+            between.add(node)
+            to_visit.extend(
+                child for child in self.graph.successors(node)
+                if child not in include_nodes and child not in between
+            )
+
+        # children come before parents, so each frontier is built from the
+        # already-complete frontiers of its unselected children
+        frontiers: Dict[UniqueId, Set[UniqueId]] = {}
+        for node in reversed(self._topological_sort(between)):
+            children = list(self.graph.successors(node))
+            if len(children) == 1 and children[0] in frontiers:
+                # frontiers are never mutated once built, so chains of
+                # unselected nodes can share one set
+                frontiers[node] = frontiers[children[0]]
+                continue
+            frontier: Set[UniqueId] = set()
+            for child in children:
+                if child in include_nodes:
+                    frontier.add(child)
+                else:
+                    frontier.update(frontiers[child])
+            frontiers[node] = frontier
+        return frontiers
+
+    def _topological_sort(self, nodes: Set[UniqueId]) -> List[UniqueId]:
+        return list(nx.topological_sort(self.graph.subgraph(nodes)))
+
     def subgraph(self, nodes: Iterable[UniqueId]) -> 'Graph':
-        return Graph(self.graph.subgraph(nodes))
+        return type(self)(self.graph.subgraph(nodes))
 
     def get_dependent_nodes(self, node: UniqueId):
         return nx.descendants(self.graph, node)
@@ -2,8 +2,9 @@ import networkx as nx  # type: ignore
 import threading
 
 from queue import PriorityQueue
-from typing import Dict, Set, List, Generator, Optional
+from typing import Dict, Set, List, Generator, Iterable, Optional
 
+from .compact import CompactDiGraph
 from .graph import UniqueId
 from dbt.contracts.graph.parsed import ParsedSourceDefinition, ParsedExposure
 from dbt.contracts.graph.compiled import GraphMemberNode
@@ -12,15 +13,21 @@ from dbt.node_types import NodeType
 
 
 class GraphQueue:
-    """A fancy queue that is backed by the dependency graph.
-    Note: this will mutate input!
+    """A fancy queue that is backed by the dependency graph, either a
+    networkx.DiGraph or a CompactDiGraph.
 
     This queue is thread-safe for `mark_done` calls, though you must ensure
     that separate threads do not call `.empty()` or `__len__()` and `.get()` at
     the same time, as there is an unlocked race!
     """
 
-    def __init__(self, graph: nx.DiGraph, manifest: Manifest, selected: Set[UniqueId]):
+    def __init__(
+        self,
+        graph: nx.DiGraph,
+        manifest: Manifest,
+        selected: Set[UniqueId],
+        execution_times: Optional[Dict[UniqueId, float]] = None,
+    ):
         self.graph = graph
         self.manifest = manifest
         self._selected = selected
@@ -34,9 +41,20 @@ class GraphQueue:
         # this lock controls most things
         self.lock = threading.Lock()
         # store the 'score' of each node as a number. Lower is higher priority.
-        self._scores = self._get_scores(self.graph)
+        self._scores: Dict[UniqueId, float]
+        if execution_times is None:
+            self._scores = self._get_scores(self.graph)
+        else:
+            self._scores = self._get_critical_path_scores(
+                self.graph, execution_times
+            )
+        # the number of unfinished parents of each node. A node is ready to
+        # be queued when this reaches zero.
+        self._remaining_parents: Dict[UniqueId, int] = dict(
+            self.graph.in_degree()
+        )
         # populate the initial queue
-        self._find_new_additions()
+        self._find_new_additions(self.graph.nodes())
         # awaits after task end
         self.some_task_done = threading.Condition(self.lock)
 
@@ -56,7 +74,7 @@ class GraphQueue:
     @staticmethod
     def _grouped_topological_sort(
         graph: nx.DiGraph,
-    ) -> Generator[List[str], None, None]:
+    ) -> Generator[List[UniqueId], None, None]:
         """Topological sort of given graph that groups ties.
 
         Adapted from `nx.topological_sort`, this function returns a topo sort of a graph however
@@ -69,6 +87,9 @@ class GraphQueue:
         Returns:
             A generator that yields lists of nodes, one list per graph depth level.
         """
+        if isinstance(graph, CompactDiGraph):
+            yield from graph.topological_generations()
+            return
         indegree_map = {v: d for v, d in graph.in_degree() if d > 0}
         zero_indegree = [v for v, d in graph.in_degree() if d == 0]
 
@@ -76,13 +97,13 @@ class GraphQueue:
             yield zero_indegree
             new_zero_indegree = []
             for v in zero_indegree:
-                for _, child in graph.edges(v):
+                for child in graph.successors(v):
                     indegree_map[child] -= 1
                     if not indegree_map[child]:
                         new_zero_indegree.append(child)
             zero_indegree = new_zero_indegree
 
-    def _get_scores(self, graph: nx.DiGraph) -> Dict[str, int]:
+    def _get_scores(self, graph: nx.DiGraph) -> Dict[UniqueId, float]:
         """Scoring nodes for processing order.
 
         Scores are calculated by the graph depth level. Lowest score (0) should be processed first.
@@ -93,21 +114,59 @@ class GraphQueue:
         Returns:
             A dictionary consisting of `node name`:`score` pairs.
         """
-        # split graph by connected subgraphs
-        subgraphs = (
-            graph.subgraph(x) for x in nx.connected_components(nx.Graph(graph))
-        )
-
-        # score all nodes in all subgraphs
-        scores = {}
-        for subgraph in subgraphs:
-            grouped_nodes = self._grouped_topological_sort(subgraph)
-            for level, group in enumerate(grouped_nodes):
-                for node in group:
-                    scores[node] = level
+        # a node's depth level is the length of the longest path to it from
+        # a node without parents, so sorting the whole graph at once gives
+        # the same levels as sorting each connected subgraph on its own
+        scores: Dict[UniqueId, float] = {}
+        grouped_nodes = self._grouped_topological_sort(graph)
+        for level, group in enumerate(grouped_nodes):
+            for node in group:
+                scores[node] = float(level)
 
         return scores
 
+    @staticmethod
+    def _get_critical_path_scores(
+        graph: nx.DiGraph, execution_times: Dict[UniqueId, float]
+    ) -> Dict[UniqueId, float]:
+        """Scoring nodes for processing order, by critical path.
+
+        Each node is scored by the estimated runtime of the longest chain of
+        nodes that starts with it, so nodes gating long-running chains are
+        processed before cheap leaves. Nodes without a known execution time
+        are estimated at the mean of the known times (or 1 second if there
+        are none).
+
+        Args:
+            graph: The graph to be scored.
+            execution_times: A dictionary of `node name`:`seconds` pairs,
+                usually from a previous run.
+
+        Returns:
+            A dictionary consisting of `node name`:`score` pairs. Scores are
+            negated remaining runtimes, so the lowest score is still the
+            first to be processed.
+        """
+        known = [
+            execution_times[node] for node in graph
+            if node in execution_times
+        ]
+        default = sum(known) / len(known) if known else 1.0
+
+        remaining: Dict[UniqueId, float] = {}
+        order = [
+            node for group in GraphQueue._grouped_topological_sort(graph)
+            for node in group
+        ]
+        for node in reversed(order):
+            downstream = max(
+                (remaining[child] for child in graph.successors(node)),
+                default=0.0,
+            )
+            remaining[node] = execution_times.get(node, default) + downstream
+
+        return {node: -cost for node, cost in remaining.items()}
+
     def get(
         self, block: bool = True, timeout: Optional[float] = None
     ) -> GraphMemberNode:
@@ -135,7 +194,7 @@ class GraphQueue:
         This takes the lock.
         """
         with self.lock:
-            return len(self.graph) - len(self.in_progress)
+            return len(self._remaining_parents) - len(self.in_progress)
 
     def empty(self) -> bool:
         """The graph queue is 'empty' if it all remaining nodes in the graph
@@ -156,12 +215,21 @@ class GraphQueue:
         """
         return node in self.in_progress or node in self.queued
 
-    def _find_new_additions(self) -> None:
-        """Find any nodes in the graph that need to be added to the internal
-        queue and add them.
+    def _find_new_additions(self, candidates: Iterable[UniqueId]) -> None:
+        """Find any nodes among the candidates that need to be added to the
+        internal queue and add them.
+
+        Callers must hold the lock.
+
+        :param candidates: The nodes that might have become ready. Only these
+            nodes are examined, so this is proportional to their number rather
+            than to the size of the graph.
         """
-        for node, in_degree in self.graph.in_degree():
-            if not self._already_known(node) and in_degree == 0:
+        for node in candidates:
+            if (
+                self._remaining_parents[node] == 0 and
+                not self._already_known(node)
+            ):
                 self.inner.put((self._scores[node], node))
                 self.queued.add(node)
 
@@ -174,8 +242,11 @@ class GraphQueue:
         """
         with self.lock:
             self.in_progress.remove(node_id)
-            self.graph.remove_node(node_id)
-            self._find_new_additions()
+            children = list(self.graph.successors(node_id))
+            for child in children:
+                self._remaining_parents[child] -= 1
+            del self._remaining_parents[node_id]
+            self._find_new_additions(children)
             self.inner.task_done()
             self.some_task_done.notify_all()
 
@@ -1,10 +1,11 @@
-from typing import Set, List, Optional, Tuple
+from typing import Dict, Set, List, Optional, Tuple
 
 from .graph import Graph, UniqueId
 from .queue import GraphQueue
 from .selector_methods import MethodManager
 from .selector_spec import SelectionCriteria, SelectionSpec
 
+from dbt import flags
 from dbt.logger import GLOBAL_LOGGER as logger
 from dbt.node_types import NodeType
 from dbt.exceptions import (
@@ -296,8 +297,24 @@ class NodeSelector(MethodManager):
         """
         selected_nodes = self.get_selected(spec)
         new_graph = self.full_graph.get_subset_graph(selected_nodes)
+        execution_times = None
+        if flags.CRITICAL_PATH:
+            execution_times = self.previous_execution_times()
         # should we give a way here for consumers to mutate the graph?
-        return GraphQueue(new_graph.graph, self.manifest, selected_nodes)
+        return GraphQueue(
+            new_graph.graph, self.manifest, selected_nodes, execution_times
+        )
+
+    def previous_execution_times(self) -> Dict[UniqueId, float]:
+        """Returns the execution time of each node in the previous state's
+        run results, if there are any.
+        """
+        if self.previous_state is None or self.previous_state.results is None:
+            return {}
+        return {
+            UniqueId(result.unique_id): result.execution_time
+            for result in self.previous_state.results.results
+        }
 
 
 class ResourceTypeSelector(NodeSelector):
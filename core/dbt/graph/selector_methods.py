@@ -1,7 +1,9 @@
 import abc
 from itertools import chain
 from pathlib import Path
-from typing import Set, List, Dict, Iterator, Tuple, Any, Union, Type, Optional
+from typing import (
+    Set, List, Dict, Iterator, Tuple, Any, Union, Type, Optional, Mapping
+)
 
 from dbt.dataclass_schema import StrEnum
 
@@ -13,7 +15,8 @@ from dbt.contracts.graph.compiled import (
     CompileResultNode,
     ManifestNode,
 )
-from dbt.contracts.graph.manifest import Manifest, WritableManifest
+from dbt.contracts.graph.digest import NodeDigest, fingerprint
+from dbt.contracts.graph.manifest import Manifest
 from dbt.contracts.graph.parsed import (
     HasTestMetadata,
     ParsedSingularTestNode,
@@ -72,6 +75,133 @@ def is_selected_node(fqn: List[str], node_selector: str):
 
 
 SelectorTarget = Union[ParsedSourceDefinition, ManifestNode, ParsedExposure]
+# a node from the previous state's manifest, or its digest
+PreviousTarget = Union[SelectorTarget, NodeDigest]
+
+
+class _ConfigIndex:
+    """The unique IDs of the configurable nodes by the value of one config.
+    Values that can't be hashed are kept in a list and compared one by one.
+    """
+    def __init__(self) -> None:
+        self.by_value: Dict[Any, Set[UniqueId]] = {}
+        self.unhashable: List[Tuple[UniqueId, Any]] = []
+
+    def add(self, unique_id: UniqueId, value: Any) -> None:
+        try:
+            self.by_value.setdefault(value, set()).add(unique_id)
+        except TypeError:
+            self.unhashable.append((unique_id, value))
+
+    def get(self, selector: Any) -> Set[UniqueId]:
+        try:
+            found = set(self.by_value.get(selector, ()))
+        except TypeError:
+            found = {
+                unique_id
+                for value, unique_ids in self.by_value.items()
+                if selector == value
+                for unique_id in unique_ids
+            }
+        found.update(
+            unique_id for unique_id, value in self.unhashable
+            if selector == value
+        )
+        return found
+
+
+class SelectorIndex:
+    """Inverted indexes from the attributes that selector methods look at to
+    the unique IDs of the nodes that have them, so a selector with many terms
+    doesn't scan the whole manifest for each of them.
+
+    Each index is built with one pass over the manifest the first time a
+    method needs it, so the index must not outlive changes to the manifest.
+    The indexes cover the same nodes the methods search: tags, packages and
+    paths cover nodes, sources and exposures, configs cover nodes and
+    sources, and resource types cover nodes.
+    """
+    def __init__(self, manifest: Manifest) -> None:
+        self.manifest = manifest
+        self._tags: Optional[Dict[str, Set[UniqueId]]] = None
+        self._packages: Optional[Dict[str, Set[UniqueId]]] = None
+        self._paths: Optional[Dict[Path, Dict[Path, Set[UniqueId]]]] = None
+        self._resource_types: Optional[Dict[NodeType, Set[UniqueId]]] = None
+        self._configs: Dict[Tuple[Tuple[str, ...], bool], _ConfigIndex] = {}
+
+    def _all_nodes(self) -> Iterator[Tuple[UniqueId, SelectorTarget]]:
+        for key, node in chain(
+            self.manifest.nodes.items(),
+            self.manifest.sources.items(),
+            self.manifest.exposures.items(),
+        ):
+            yield UniqueId(key), node
+
+    def tag(self, tag: str) -> Set[UniqueId]:
+        if self._tags is None:
+            self._tags = {}
+            for unique_id, node in self._all_nodes():
+                for node_tag in node.tags:
+                    self._tags.setdefault(node_tag, set()).add(unique_id)
+        return self._tags.get(tag, set())
+
+    def package(self, package_name: str) -> Set[UniqueId]:
+        if self._packages is None:
+            self._packages = {}
+            for unique_id, node in self._all_nodes():
+                self._packages.setdefault(
+                    node.package_name, set()
+                ).add(unique_id)
+        return self._packages.get(package_name, set())
+
+    def path(self, root: Path, path: Path) -> Set[UniqueId]:
+        """Get the nodes of the project at root whose file is path, or is in
+        the directory path.
+        """
+        if self._paths is None:
+            self._paths = {}
+            for unique_id, node in self._all_nodes():
+                by_path = self._paths.setdefault(Path(node.root_path), {})
+                ofp = Path(node.original_file_path)
+                for prefix in chain((ofp,), ofp.parents):
+                    by_path.setdefault(prefix, set()).add(unique_id)
+        return self._paths.get(root, {}).get(path, set())
+
+    def resource_type(self, resource_type: NodeType) -> Set[UniqueId]:
+        if self._resource_types is None:
+            self._resource_types = {}
+            for key, node in self.manifest.nodes.items():
+                self._resource_types.setdefault(
+                    node.resource_type, set()
+                ).add(UniqueId(key))
+        return self._resource_types.get(resource_type, set())
+
+    def config(
+        self, parts: List[str], selector: Any, case_insensitive: bool = False
+    ) -> Set[UniqueId]:
+        """Get the nodes and sources whose config at parts equals selector.
+        If case_insensitive is set, strings are compared ignoring case.
+        """
+        key = (tuple(parts), case_insensitive)
+        if key not in self._configs:
+            index = _ConfigIndex()
+            for unique_id, node in chain(
+                self.manifest.nodes.items(), self.manifest.sources.items()
+            ):
+                try:
+                    value = _getattr_descend(node.config, parts)
+                except AttributeError:
+                    continue
+                if case_insensitive:
+                    # only strings can match case-insensitively
+                    if not isinstance(value, str):
+                        continue
+                    value = value.upper()
+                index.add(UniqueId(unique_id), value)
+            self._configs[key] = index
+        if case_insensitive:
+            selector = str(selector).upper()
+        return self._configs[key].get(selector)
 
 
 class SelectorMethod(metaclass=abc.ABCMeta):
@@ -79,11 +209,25 @@ class SelectorMethod(metaclass=abc.ABCMeta):
         self,
         manifest: Manifest,
         previous_state: Optional[PreviousState],
-        arguments: List[str]
+        arguments: List[str],
+        index: Optional[SelectorIndex] = None,
     ):
         self.manifest: Manifest = manifest
         self.previous_state = previous_state
         self.arguments: List[str] = arguments
+        if index is None:
+            index = SelectorIndex(manifest)
+        self.index: SelectorIndex = index
+
+    def indexed_nodes(
+        self,
+        included_nodes: Set[UniqueId],
+        unique_ids: Set[UniqueId],
+    ) -> Iterator[UniqueId]:
+        """Yield the unique IDs found in the index that are included."""
+        for unique_id in unique_ids:
+            if unique_id in included_nodes:
+                yield unique_id
 
     def parsed_nodes(
         self,
@@ -185,9 +329,7 @@ class TagSelectorMethod(SelectorMethod):
         self, included_nodes: Set[UniqueId], selector: str
     ) -> Iterator[UniqueId]:
         """ yields nodes from included that have the specified tag """
-        for node, real_node in self.all_nodes(included_nodes):
-            if selector in real_node.tags:
-                yield node
+        yield from self.indexed_nodes(included_nodes, self.index.tag(selector))
 
 
 class SourceSelectorMethod(SelectorMethod):
@@ -260,14 +402,10 @@ class PathSelectorMethod(SelectorMethod):
         # use '.' and not 'root' for easy comparison
         root = Path.cwd()
         paths = set(p.relative_to(root) for p in root.glob(selector))
-        for node, real_node in self.all_nodes(included_nodes):
-            if Path(real_node.root_path) != root:
-                continue
-            ofp = Path(real_node.original_file_path)
-            if ofp in paths:
-                yield node
-            elif any(parent in paths for parent in ofp.parents):
-                yield node
+        selected: Set[UniqueId] = set()
+        for path in paths:
+            selected.update(self.index.path(root, path))
+        yield from self.indexed_nodes(included_nodes, selected)
 
 
 class PackageSelectorMethod(SelectorMethod):
@@ -275,9 +413,9 @@ class PackageSelectorMethod(SelectorMethod):
         self, included_nodes: Set[UniqueId], selector: str
     ) -> Iterator[UniqueId]:
         """Yields nodes from included that have the specified package"""
-        for node, real_node in self.all_nodes(included_nodes):
-            if real_node.package_name == selector:
-                yield node
+        yield from self.indexed_nodes(
+            included_nodes, self.index.package(selector)
+        )
 
 
 def _getattr_descend(obj: Any, attrs: List[str]) -> Any:
@@ -298,14 +436,6 @@ def _getattr_descend(obj: Any, attrs: List[str]) -> Any:
     return value
 
 
-class CaseInsensitive(str):
-    def __eq__(self, other):
-        if isinstance(other, str):
-            return self.upper() == other.upper()
-        else:
-            return self.upper() == other
-
-
 class ConfigSelectorMethod(SelectorMethod):
     def search(
         self,
@@ -315,20 +445,15 @@ class ConfigSelectorMethod(SelectorMethod):
         parts = self.arguments
         # special case: if the user wanted to compare test severity,
         # make the comparison case-insensitive
-        if parts == ['severity']:
-            selector = CaseInsensitive(selector)
+        case_insensitive = parts == ['severity']
 
         # search sources is kind of useless now source configs only have
         # 'enabled', which you can't really filter on anyway, but maybe we'll
         # add more someday, so search them anyway.
-        for node, real_node in self.configurable_nodes(included_nodes):
-            try:
-                value = _getattr_descend(real_node.config, parts)
-            except AttributeError:
-                continue
-            else:
-                if selector == value:
-                    yield node
+        yield from self.indexed_nodes(
+            included_nodes,
+            self.index.config(parts, selector, case_insensitive),
+        )
 
 
 class ResourceTypeSelectorMethod(SelectorMethod):
@@ -341,9 +466,9 @@ class ResourceTypeSelectorMethod(SelectorMethod):
             raise RuntimeException(
                 f'Invalid resource_type selector "{selector}"'
             ) from exc
-        for node, real_node in self.parsed_nodes(included_nodes):
-            if real_node.resource_type == resource_type:
-                yield node
+        yield from self.indexed_nodes(
+            included_nodes, self.index.resource_type(resource_type)
+        )
 
 
 class TestNameSelectorMethod(SelectorMethod):
@@ -380,104 +505,136 @@ class TestTypeSelectorMethod(SelectorMethod):
 class StateSelectorMethod(SelectorMethod):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.modified_macros: Optional[List[str]] = None
+        self.modified_macros: Optional[Set[str]] = None
 
-    def _macros_modified(self) -> List[str]:
+    def _macros_modified(self) -> Set[str]:
         # we checked in the caller!
-        if self.previous_state is None or self.previous_state.manifest is None:
+        if self.previous_state is None or not self.previous_state.has_manifest:
             raise InternalException(
                 'No comparison manifest in _macros_modified'
             )
-        old_macros = self.previous_state.manifest.macros
         new_macros = self.manifest.macros
-
-        modified = []
+        digest = self.previous_state.digest
+        if digest is not None:
+            return self._digest_macros_modified(digest.macros)
+        manifest = self.previous_state.manifest
+        assert manifest is not None
+        old_macros = manifest.macros
+
+        modified = set()
         for uid, macro in new_macros.items():
             if uid in old_macros:
                 old_macro = old_macros[uid]
                 if macro.macro_sql != old_macro.macro_sql:
-                    modified.append(uid)
+                    modified.add(uid)
             else:
-                modified.append(uid)
+                modified.add(uid)
 
         for uid, macro in old_macros.items():
             if uid not in new_macros:
-                modified.append(uid)
+                modified.add(uid)
 
         return modified
 
-    def recursively_check_macros_modified(self, node, previous_macros):
-        # loop through all macros that this node depends on
-        for macro_uid in node.depends_on.macros:
-            # avoid infinite recursion if we've already seen this macro
-            if macro_uid in previous_macros:
-                continue
-            previous_macros.append(macro_uid)
-            # is this macro one of the modified macros?
-            if macro_uid in self.modified_macros:
-                return True
-            # if not, and this macro depends on other macros, keep looping
-            macro_node = self.manifest.macros[macro_uid]
-            if len(macro_node.depends_on.macros) > 0:
-                return self.recursively_check_macros_modified(macro_node, previous_macros)
-            else:
-                return False
+    def _digest_macros_modified(self, old_macros: Mapping[str, str]) -> Set[str]:
+        new_macros = self.manifest.macros
+        modified = set()
+        for uid, macro in new_macros.items():
+            if old_macros.get(uid) != fingerprint(macro.macro_sql):
+                modified.add(uid)
+
+        for uid in old_macros:
+            if uid not in new_macros:
+                modified.add(uid)
+
+        return modified
+
+    def _macros_modified_upstream(self) -> Set[str]:
+        """Find the macros that were modified or that call a modified macro,
+        directly or through other macros. This walks from the modified macros
+        to the macros that depend on them once, so checking a node is a set
+        lookup for each macro it depends on.
+        """
+        modified = self._macros_modified()
+        dependents: Dict[str, List[str]] = {}
+        for uid, macro in self.manifest.macros.items():
+            for macro_uid in macro.depends_on.macros:
+                dependents.setdefault(macro_uid, []).append(uid)
+
+        to_visit = list(modified)
+        while to_visit:
+            macro_uid = to_visit.pop()
+            for dependent in dependents.get(macro_uid, ()):
+                if dependent not in modified:
+                    modified.add(dependent)
+                    to_visit.append(dependent)
+        return modified
 
     def check_macros_modified(self, node):
-        # check if there are any changes in macros the first time
+        # find the modified macros and everything that calls them the first
+        # time
         if self.modified_macros is None:
-            self.modified_macros = self._macros_modified()
+            self.modified_macros = self._macros_modified_upstream()
         # no macros have been modified, skip looping entirely
         if not self.modified_macros:
             return False
-        # recursively loop through upstream macros to see if any is modified
-        else:
-            previous_macros = []
-            return self.recursively_check_macros_modified(node, previous_macros)
+        return not self.modified_macros.isdisjoint(node.depends_on.macros)
+
+    @staticmethod
+    def _same(
+        check: str, old: Optional[PreviousTarget], new: SelectorTarget
+    ) -> bool:
+        """Call the `check` comparison (like `same_body`) of the new node
+        with the old one. If the old one is from the state digest, call the
+        digest's version of it with the new node instead.
+        """
+        if isinstance(old, NodeDigest):
+            return getattr(old, check)(new)
+        return getattr(new, check)(old)
 
-    def check_modified(self, old: Optional[SelectorTarget], new: SelectorTarget) -> bool:
-        different_contents = not new.same_contents(old)  # type: ignore
+    def check_modified(self, old: Optional[PreviousTarget], new: SelectorTarget) -> bool:
+        different_contents = not self._same('same_contents', old, new)
         upstream_macro_change = self.check_macros_modified(new)
         return different_contents or upstream_macro_change
 
-    def check_modified_body(self, old: Optional[SelectorTarget], new: SelectorTarget) -> bool:
+    def check_modified_body(self, old: Optional[PreviousTarget], new: SelectorTarget) -> bool:
         if hasattr(new, "same_body"):
-            return not new.same_body(old)  # type: ignore
+            return not self._same('same_body', old, new)
         else:
             return False
 
-    def check_modified_configs(self, old: Optional[SelectorTarget], new: SelectorTarget) -> bool:
+    def check_modified_configs(self, old: Optional[PreviousTarget], new: SelectorTarget) -> bool:
         if hasattr(new, "same_config"):
-            return not new.same_config(old)  # type: ignore
+            return not self._same('same_config', old, new)
         else:
             return False
 
     def check_modified_persisted_descriptions(
-        self, old: Optional[SelectorTarget], new: SelectorTarget
+        self, old: Optional[PreviousTarget], new: SelectorTarget
     ) -> bool:
         if hasattr(new, "same_persisted_description"):
-            return not new.same_persisted_description(old)  # type: ignore
+            return not self._same('same_persisted_description', old, new)
         else:
             return False
 
     def check_modified_relation(
-        self, old: Optional[SelectorTarget], new: SelectorTarget
+        self, old: Optional[PreviousTarget], new: SelectorTarget
     ) -> bool:
         if hasattr(new, "same_database_representation"):
-            return not new.same_database_representation(old)  # type: ignore
+            return not self._same('same_database_representation', old, new)
         else:
             return False
 
     def check_modified_macros(self, _, new: SelectorTarget) -> bool:
         return self.check_macros_modified(new)
 
-    def check_new(self, old: Optional[SelectorTarget], new: SelectorTarget) -> bool:
+    def check_new(self, old: Optional[PreviousTarget], new: SelectorTarget) -> bool:
         return old is None
 
     def search(
         self, included_nodes: Set[UniqueId], selector: str
     ) -> Iterator[UniqueId]:
-        if self.previous_state is None or self.previous_state.manifest is None:
+        if self.previous_state is None or not self.previous_state.has_manifest:
             raise RuntimeException(
                 'Got a state selector method, but no comparison manifest'
             )
@@ -501,16 +658,20 @@ class StateSelectorMethod(SelectorMethod):
                 f'"{list(state_checks)}"'
             )
 
-        manifest: WritableManifest = self.previous_state.manifest
-
+        digest = self.previous_state.digest
         for node, real_node in self.all_nodes(included_nodes):
-            previous_node: Optional[SelectorTarget] = None
-            if node in manifest.nodes:
-                previous_node = manifest.nodes[node]
-            elif node in manifest.sources:
-                previous_node = manifest.sources[node]
-            elif node in manifest.exposures:
-                previous_node = manifest.exposures[node]
+            previous_node: Optional[PreviousTarget] = None
+            if digest is not None:
+                previous_node = digest.nodes.get(node)
+            else:
+                manifest = self.previous_state.manifest
+                assert manifest is not None
+                if node in manifest.nodes:
+                    previous_node = manifest.nodes[node]
+                elif node in manifest.sources:
+                    previous_node = manifest.sources[node]
+                elif node in manifest.exposures:
+                    previous_node = manifest.exposures[node]
 
             if checker(previous_node, real_node):
                 yield node
@@ -537,6 +698,8 @@ class MethodManager:
     ):
         self.manifest = manifest
         self.previous_state = previous_state
+        # shared by every method, so each index is built once
+        self.index = SelectorIndex(manifest)
 
     def get_method(
         self, method: MethodName, method_arguments: List[str]
@@ -548,4 +711,6 @@ class MethodManager:
                 f'method name, but it is not handled'
             )
         cls: Type[SelectorMethod] = self.SELECTOR_METHODS[method]
-        return cls(self.manifest, self.previous_state, method_arguments)
+        return cls(
+            self.manifest, self.previous_state, method_arguments, self.index
+        )
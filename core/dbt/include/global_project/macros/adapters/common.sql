@@ -120,7 +120,21 @@
     'get_columns_in_relation macro not implemented for adapter '+adapter.type()) }}
 {% endmacro %}
 
+{#
+  Return a table of the columns of every relation in the schema: the relation
+  identifier, followed by the same columns as get_columns_in_relation. Adapters
+  that return none here look up the columns of each relation on its own.
+#}
+{% macro get_columns_in_schema(schema_relation) -%}
+  {{ return(adapter.dispatch('get_columns_in_schema', 'dbt')(schema_relation)) }}
+{% endmacro %}
+
+{% macro default__get_columns_in_schema(schema_relation) -%}
+  {{ return(none) }}
+{% endmacro %}
+
 {% macro alter_column_type(relation, column_name, new_column_type) -%}
+  {% do adapter.cache_columns_altered(relation) %}
   {{ return(adapter.dispatch('alter_column_type', 'dbt')(relation, column_name, new_column_type)) }}
 {% endmacro %}
 
@@ -295,6 +309,32 @@
   {{ return(load_result('collect_freshness').table) }}
 {% endmacro %}
 
+{#-- The freshness of many sources in one query: a single row with the
+     max_loaded_at of each source in order, and then snapshotted_at. Each
+     source is queried in a scalar subquery with its own filter, so each
+     column keeps the type of that source's loaded_at_field --#}
+{% macro collect_freshness_batch(sources) %}
+  {{ return(adapter.dispatch('collect_freshness_batch', 'dbt')(sources))}}
+{% endmacro %}
+
+
+{% macro default__collect_freshness_batch(sources) %}
+  {% call statement('collect_freshness_batch', fetch_result=True, auto_begin=False) -%}
+    select
+    {%- for source in sources %}
+      (
+        select max({{ source.loaded_at_field }})
+        from {{ source.source }}
+        {% if source.filter %}
+        where {{ source.filter }}
+        {% endif %}
+      ) as max_loaded_at_{{ loop.index0 }},
+    {%- endfor %}
+      {{ current_timestamp() }} as snapshotted_at
+  {% endcall %}
+  {{ return(load_result('collect_freshness_batch').table) }}
+{% endmacro %}
+
 {% macro make_temp_relation(base_relation, suffix='__dbt_tmp') %}
   {{ return(adapter.dispatch('make_temp_relation', 'dbt')(base_relation, suffix))}}
 {% endmacro %}
@@ -313,6 +353,7 @@
 
 
 {% macro alter_relation_add_remove_columns(relation, add_columns = none, remove_columns = none) -%}
+  {% do adapter.cache_columns_altered(relation) %}
   {{ return(adapter.dispatch('alter_relation_add_remove_columns', 'dbt')(relation, add_columns, remove_columns)) }}
 {% endmacro %}
 
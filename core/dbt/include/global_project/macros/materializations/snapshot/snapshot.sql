@@ -2,6 +2,7 @@
     Add new columns to the table if applicable
 #}
 {% macro create_columns(relation, columns) %}
+  {% do adapter.cache_columns_altered(relation) %}
   {{ adapter.dispatch('create_columns', 'dbt')(relation, columns) }}
 {% endmacro %}
 
@@ -14,6 +14,105 @@
     ) dbt_internal_test
 {%- endmacro %}
 
+{% macro get_test_batch_sql(tests, fused_tests=[]) -%}
+  {{ adapter.dispatch('get_test_batch_sql', 'dbt')(tests, fused_tests) }}
+{%- endmacro %}
+
+
+{#-- Run many tests in one query, with one row per test. Each row has the
+     test's position in the batch as batch_index. Each entry of fused_tests
+     is a relation and the tests on it that share one scan of it --#}
+{% macro default__get_test_batch_sql(tests, fused_tests=[]) -%}
+  {%- set queries = [] -%}
+  {%- for test in tests -%}
+    {%- set query %}
+    select
+      {{ test.batch_index }} as batch_index,
+      failures,
+      should_warn,
+      should_error
+    from (
+      {{ get_test_sql(test.main_sql, test.fail_calc, test.warn_if, test.error_if, test.limit) }}
+    ) dbt_internal_test_batch_{{ test.batch_index }}
+    {%- endset -%}
+    {%- do queries.append(query) -%}
+  {%- endfor -%}
+  {%- for fused in fused_tests -%}
+    {%- set query %}
+    select
+      batch_index,
+      failures,
+      should_warn,
+      should_error
+    from (
+      {{ get_fused_test_sql(fused.relation, fused.tests) }}
+    ) dbt_internal_fused_batch_{{ loop.index0 }}
+    {%- endset -%}
+    {%- do queries.append(query) -%}
+  {%- endfor -%}
+  {{ queries | join('\n    union all') }}
+{%- endmacro %}
+
+
+{% macro get_fused_test_sql(relation, tests) -%}
+  {{ adapter.dispatch('get_fused_test_sql', 'dbt')(relation, tests) }}
+{%- endmacro %}
+
+
+{#-- Run not_null, unique and accepted_values tests on columns of the same
+     relation with a single scan of it, counting the failures of each test
+     the same way as the test itself does --#}
+{% macro default__get_fused_test_sql(relation, tests) -%}
+    with dbt_internal_fused_source as (
+      select
+      {%- for test in tests %}
+        {{ test.column_name }} as column_{{ loop.index0 }}
+        {%- if test.test_name == 'unique' -%},
+        count(*) over (partition by {{ test.column_name }}) as n_records_{{ loop.index0 }}
+        {%- endif -%}
+        {%- if not loop.last -%},{%- endif -%}
+      {%- endfor %}
+      from {{ relation }}
+    ),
+
+    dbt_internal_fused_counts as (
+      select
+      {%- for test in tests %}
+        {%- set column = 'column_' ~ loop.index0 %}
+        {%- if test.test_name == 'not_null' %}
+        count(case when {{ column }} is null then 1 end)
+        {%- elif test.test_name == 'unique' %}
+        count(distinct case when n_records_{{ loop.index0 }} > 1 then {{ column }} end)
+        {%- elif test.test_name == 'accepted_values' %}
+        count(distinct case when {{ column }} not in (
+          {%- for value in test['values'] -%}
+            {%- if test.quote -%}
+            '{{ value }}'
+            {%- else -%}
+            {{ value }}
+            {%- endif -%}
+            {%- if not loop.last -%},{%- endif -%}
+          {%- endfor -%}
+        ) then {{ column }} end)
+        {%- endif %} as failures_{{ loop.index0 }}
+        {%- if not loop.last -%},{%- endif -%}
+      {%- endfor %}
+      from dbt_internal_fused_source
+    )
+
+    {% for test in tests -%}
+    select
+      {{ test.batch_index }} as batch_index,
+      failures_{{ loop.index0 }} as failures,
+      failures_{{ loop.index0 }} {{ test.warn_if }} as should_warn,
+      failures_{{ loop.index0 }} {{ test.error_if }} as should_error
+    from dbt_internal_fused_counts
+    {% if not loop.last -%}
+    union all
+    {% endif -%}
+    {%- endfor %}
+{%- endmacro %}
+
 {%- materialization test, default -%}
 
   {% set relations = [] %}
@@ -505,6 +505,19 @@ def _add_defer_argument(*subparsers):
         )
 
 
+def _add_scheduling_arguments(*subparsers):
+    for sub in subparsers:
+        sub.add_argument(
+            '--critical-path',
+            action='store_true',
+            help='''
+            If set, run the nodes with the longest estimated remaining
+            downstream runtime first, using execution times from the
+            run_results.json in the --state directory when available.
+            '''
+        )
+
+
 def _build_run_subparser(subparsers, base_subparser):
     run_sub = subparsers.add_parser(
         'run',
@@ -743,6 +756,24 @@ def _build_test_subparser(subparsers, base_subparser):
         even if they also depend on unselected resources
         '''
     )
+    sub.add_argument(
+        '--batch-tests',
+        action='store_true',
+        help='''
+        Run tests that are ready at the same time in batches, with one query
+        per batch instead of one per test. Tests that store failures or use
+        a custom test materialization are still run one at a time.
+        '''
+    )
+    sub.add_argument(
+        '--test-batch-size',
+        type=int,
+        default=100,
+        help='''
+        The maximum number of tests in a batch with --batch-tests. Defaults
+        to 100.
+        '''
+    )
 
     sub.set_defaults(cls=test_task.TestTask, which='test', rpc_method='test')
     return sub
@@ -774,6 +805,23 @@ def _build_source_freshness_subparser(subparsers, base_subparser):
         Specify number of threads to use. Overrides settings in profiles.yml
         '''
     )
+    sub.add_argument(
+        '--batch-freshness',
+        action='store_true',
+        help='''
+        Query the freshness of the sources in each database and schema in
+        batches, with one query per batch instead of one per source.
+        '''
+    )
+    sub.add_argument(
+        '--freshness-batch-size',
+        type=int,
+        default=100,
+        help='''
+        The maximum number of sources in a batch with --batch-freshness.
+        Defaults to 100.
+        '''
+    )
     sub.set_defaults(
         cls=freshness_task.FreshnessTask,
         which='source-freshness',
@@ -939,6 +987,46 @@ def parse_args(args, cls=DBTArgumentParser):
         If set, skip writing the manifest and run_results.json files to disk
         '''
     )
+
+    p.add_argument(
+        '--artifact-compression',
+        choices=['none', 'gzip', 'zstd'],
+        default=None,
+        help='''
+        Compress manifest.json and run_results.json, writing them as
+        manifest.json.gz and run_results.json.gz (gzip) or .zst (zstd).
+        --state and --defer read compressed artifacts too. zstd requires the
+        zstandard package. The uncompressed manifest.json is removed, and
+        `dbt docs serve` needs it, so run `dbt docs generate` without
+        compression.
+        '''
+    )
+
+    p.add_argument(
+        '--relations-cache-ttl',
+        type=int,
+        default=None,
+        metavar='SECONDS',
+        help='''
+        Save the relations dbt lists in each schema to the target directory,
+        and reuse them in later invocations for this many seconds instead of
+        listing those schemas again. dbt keeps the saved relations up to date
+        with the relations it creates, drops and renames itself, but not with
+        changes made outside of dbt. 0, the default, disables this.
+        '''
+    )
+
+    p.add_argument(
+        '--graph-backend',
+        choices=['networkx', 'compact'],
+        default=None,
+        help='''
+        The graph dbt selects and schedules nodes with. compact interns
+        unique IDs to ints and stores edges in arrays, which uses much less
+        memory and is faster to traverse in very large projects. The default
+        is networkx.
+        '''
+    )
     colors_flag = p.add_mutually_exclusive_group()
     colors_flag.add_argument(
         '--use-colors',
@@ -1007,6 +1095,38 @@ def parse_args(args, cls=DBTArgumentParser):
         ''',
     )
 
+    p.add_argument(
+        '--paranoid-hashing',
+        action='store_true',
+        default=None,
+        help='''
+        Read and hash every project file when looking for changes to
+        partially parse, even if its modification time, size and inode are
+        the same as in the last parse.
+        '''
+    )
+
+    p.add_argument(
+        '--parallel-parse',
+        action='store_true',
+        default=None,
+        help='''
+        Parse model, snapshot, analysis and singular test files in a pool of
+        worker processes, one per CPU.
+        '''
+    )
+
+    p.add_optional_argument_inverse(
+        '--jinja-cache',
+        enable_help='''
+        Cache the python code that jinja templates compile to in the target
+        directory, and reuse it in later invocations.
+        ''',
+        disable_help='''
+        Compile every jinja template from scratch. This is the default.
+        ''',
+    )
+
     # if set, run dbt in single-threaded mode: thread count is ignored, and
     # calls go through `map` instead of the thread pool. This is useful for
     # getting performance information about aspects of dbt that normally run in
@@ -1105,6 +1225,9 @@ def parse_args(args, cls=DBTArgumentParser):
         run_sub, compile_sub, generate_sub, test_sub, snapshot_sub, seed_sub)
     # --defer
     _add_defer_argument(run_sub, test_sub, build_sub)
+    # --critical-path
+    _add_scheduling_arguments(
+        run_sub, test_sub, build_sub, seed_sub, snapshot_sub)
     # --full-refresh
     _add_table_mutability_arguments(run_sub, compile_sub, build_sub)
 
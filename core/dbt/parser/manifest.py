@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from dataclasses import field
 from datetime import datetime
@@ -26,11 +27,12 @@ from dbt.clients.jinja_static import statically_extract_macro_calls
 from dbt.clients.system import make_directory
 from dbt.config import Project, RuntimeConfig
 from dbt.context.docs import generate_runtime_docs
-from dbt.context.macro_resolver import MacroResolver, TestMacroNamespace
+from dbt.context.macro_resolver import TestMacroNamespace
 from dbt.context.configured import generate_macro_context
 from dbt.context.providers import ParseProvider
 from dbt.contracts.files import FileHash, ParseFileType, SchemaSourceFile
 from dbt.parser.read_files import read_files, load_source_file
+from dbt.parser.parallel import ParallelParser
 from dbt.parser.partial import PartialParsing, special_override_macros
 from dbt.contracts.graph.compiled import ManifestNode
 from dbt.contracts.graph.manifest import (
@@ -135,6 +137,8 @@ class ManifestLoader:
         self.new_manifest = self.manifest
         self.manifest.metadata = root_project.get_metadata()
         self.macro_resolver = None  # built after macros are loaded
+        # only set while parsing with --parallel-parse
+        self.parallel_parser: Optional[ParallelParser] = None
         self.started_at = int(time.time())
         # This is a MacroQueryStringSetter callable, which is called
         # later after we set the MacroManifest in the adapter. It sets
@@ -210,8 +214,14 @@ class ManifestLoader:
         saved_files = {}
         if self.saved_manifest:
             saved_files = self.saved_manifest.files
-        for project in self.all_projects.values():
-            read_files(project, self.manifest.files, project_parser_files, saved_files)
+        # Reading and hashing the files is mostly I/O, so it's done in a
+        # thread pool. The files are still added in a deterministic order.
+        with ThreadPoolExecutor(thread_name_prefix='read_files') as executor:
+            for project in self.all_projects.values():
+                read_files(
+                    project, self.manifest.files, project_parser_files,
+                    saved_files, executor
+                )
         orig_project_parser_files = project_parser_files
         self._perf_info.path_count = len(self.manifest.files)
         self._perf_info.read_files_elapsed = (time.perf_counter() - start_read_files)
@@ -304,14 +314,25 @@ class ManifestLoader:
             parser_types: List[Type[Parser]] = [
                 ModelParser, SnapshotParser, AnalysisParser, SingularTestParser,
                 SeedParser, DocumentationParser, HookParser]
-            for project in self.all_projects.values():
-                if project.project_name not in project_parser_files:
-                    continue
-                self.parse_project(
-                    project,
-                    project_parser_files[project.project_name],
-                    parser_types
+            if flags.PARALLEL_PARSE:
+                # the workers get a copy of the macros, so they must be
+                # started after the macros are loaded
+                self.parallel_parser = ParallelParser(
+                    self.root_project, self.all_projects, self.manifest
                 )
+            try:
+                for project in self.all_projects.values():
+                    if project.project_name not in project_parser_files:
+                        continue
+                    self.parse_project(
+                        project,
+                        project_parser_files[project.project_name],
+                        parser_types
+                    )
+            finally:
+                if self.parallel_parser is not None:
+                    self.parallel_parser.shutdown()
+                    self.parallel_parser = None
 
             # Now that we've loaded most of the nodes (except for schema tests and sources)
             # load up the Lookup objects to resolve them by name, so the SourceFiles store
@@ -415,18 +436,24 @@ class ManifestLoader:
 
             # Parse the project files for this parser
             parser: Parser = parser_cls(project, self.manifest, self.root_project)
-            for file_id in parser_files[parser_name]:
-                block = FileBlock(self.manifest.files[file_id])
-                if isinstance(parser, SchemaParser):
-                    assert isinstance(block.file, SchemaSourceFile)
-                    if self.partially_parsing:
-                        dct = block.file.pp_dict
+            file_ids = parser_files[parser_name]
+            if (self.parallel_parser is not None and
+                    self.parallel_parser.can_parse(parser_cls, file_ids)):
+                self.parallel_parser.parse_files(project, parser, file_ids)
+                project_parsed_path_count = len(file_ids)
+            else:
+                for file_id in file_ids:
+                    block = FileBlock(self.manifest.files[file_id])
+                    if isinstance(parser, SchemaParser):
+                        assert isinstance(block.file, SchemaSourceFile)
+                        if self.partially_parsing:
+                            dct = block.file.pp_dict
+                        else:
+                            dct = block.file.dict_from_yaml
+                        parser.parse_file(block, dct=dct)
                     else:
-                        dct = block.file.dict_from_yaml
-                    parser.parse_file(block, dct=dct)
-                else:
-                    parser.parse_file(block)
-                project_parsed_path_count = project_parsed_path_count + 1
+                        parser.parse_file(block)
+                    project_parsed_path_count = project_parsed_path_count + 1
 
             # Save timing info
             project_loader_info.parsers.append(ParserInfo(
@@ -464,8 +491,9 @@ class ManifestLoader:
         internal_package_names = get_adapter_package_names(
             self.root_project.credentials.type
         )
-        self.macro_resolver = MacroResolver(
-            self.manifest.macros,
+        # partial parsing can remove macros from the manifest, so always
+        # rebuild the resolver that the manifest shares with its contexts
+        self.macro_resolver = self.manifest.rebuild_macro_resolver(
             self.root_project.project_name,
             internal_package_names
         )
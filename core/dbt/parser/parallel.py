@@ -0,0 +1,220 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+import os
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Type, cast
+
+import logbook
+
+from dbt import flags
+from dbt.adapters.factory import load_plugin, register_adapter
+from dbt.clients.jinja import get_code_cache, set_code_cache
+from dbt.config import Project, RuntimeConfig
+from dbt.contracts.files import AnySourceFile
+from dbt.contracts.graph.compiled import ManifestNode
+from dbt.contracts.graph.manifest import Manifest, ManifestMetadata
+from dbt.contracts.graph.parsed import ManifestNodes, ParsedMacro
+from dbt.logger import GLOBAL_LOGGER as logger
+from dbt.parser.analysis import AnalysisParser
+from dbt.parser.base import Parser
+from dbt.parser.models import ModelParser
+from dbt.parser.search import FileBlock
+from dbt.parser.singular_test import SingularTestParser
+from dbt.parser.snapshots import SnapshotParser
+
+
+# The parsers whose files can be parsed in worker processes. Each file only
+# creates nodes (enabled or disabled) and doesn't look at the rest of the
+# manifest, except for the macros. Schema files patch nodes, sources and
+# macros from other files, so they are always parsed in the main process.
+PARALLEL_PARSERS: Dict[str, Type[Parser]] = {
+    ModelParser.__name__: ModelParser,
+    SnapshotParser.__name__: SnapshotParser,
+    AnalysisParser.__name__: AnalysisParser,
+    SingularTestParser.__name__: SingularTestParser,
+}
+
+# How many files are sent to a worker at a time
+CHUNK_SIZE = 50
+
+
+@dataclass
+class ParsedFile:
+    """The result of parsing one file in a worker process: the nodes it
+    created, in order, with whether each one is enabled.
+    """
+    file_id: str
+    nodes: List[Tuple[bool, ManifestNode]] = field(default_factory=list)
+    static_analysis_path_count: int = 0
+    static_analysis_parsed_path_count: int = 0
+
+
+# Set up by init_worker in each worker process
+_worker_manifest: Optional[Manifest] = None
+_worker_root_project: Optional[RuntimeConfig] = None
+_worker_projects: Mapping[str, Project] = {}
+
+
+def _flag_values() -> Dict[str, Any]:
+    return {
+        name: value for name, value in vars(flags).items()
+        if name.isupper() and name != 'MP_CONTEXT'
+    }
+
+
+def init_worker(
+    flag_values: Dict[str, Any],
+    root_project: RuntimeConfig,
+    all_projects: Mapping[str, Project],
+    macros: Dict[str, ParsedMacro],
+    metadata: ManifestMetadata,
+    code_cache_dir: Optional[str],
+) -> None:
+    global _worker_manifest, _worker_root_project, _worker_projects
+    # workers are spawned, so they don't share any state with the main
+    # process: set up the flags, the adapter and the logger again
+    for name, value in flag_values.items():
+        setattr(flags, name, value)
+    # only show warnings and errors, the main process logs everything else
+    logbook.NullHandler().push_application()
+    logbook.StderrHandler(level=logbook.WARNING, bubble=False).push_application()
+    load_plugin(root_project.credentials.type)
+    register_adapter(root_project)
+    # the main process has already pruned the cache
+    set_code_cache(code_cache_dir, prune=False)
+
+    _worker_root_project = root_project
+    _worker_projects = all_projects
+    _worker_manifest = Manifest(macros=macros, metadata=metadata)
+
+
+def _parse_file(parser: Parser, manifest: Manifest, source_file) -> ParsedFile:
+    # the manifest only ever holds the nodes of the file being parsed
+    manifest.nodes = {}
+    manifest.disabled = {}
+    manifest._parsing_info.static_analysis_path_count = 0
+    manifest._parsing_info.static_analysis_parsed_path_count = 0
+    file_node_count = len(source_file.nodes)
+
+    parser.parse_file(FileBlock(source_file))
+
+    result = ParsedFile(
+        file_id=source_file.file_id,
+        static_analysis_path_count=(
+            manifest._parsing_info.static_analysis_path_count
+        ),
+        static_analysis_parsed_path_count=(
+            manifest._parsing_info.static_analysis_parsed_path_count
+        ),
+    )
+    # add_node and add_disabled both record the unique_id in the file, so
+    # use it to replay them in the same order in the main process
+    enabled = dict(manifest.nodes)
+    disabled = {k: list(v) for k, v in manifest.disabled.items()}
+    for unique_id in source_file.nodes[file_node_count:]:
+        if unique_id in enabled:
+            result.nodes.append((True, enabled.pop(unique_id)))
+        else:
+            # parsers only disable the nodes they create, never sources
+            result.nodes.append(
+                (False, cast(ManifestNode, disabled[unique_id].pop(0)))
+            )
+    return result
+
+
+def parse_files(
+    project_name: str, parser_name: str, source_files: List[AnySourceFile]
+) -> List[ParsedFile]:
+    """Parse the given files in a worker process."""
+    assert _worker_manifest is not None and _worker_root_project is not None
+    parser_cls = PARALLEL_PARSERS[parser_name]
+    parser = parser_cls(
+        _worker_projects[project_name], _worker_manifest, _worker_root_project
+    )
+    return [
+        _parse_file(parser, _worker_manifest, source_file)
+        for source_file in source_files
+    ]
+
+
+class ParallelParser:
+    """Parse files in a pool of worker processes. Each worker has its own
+    copy of the macros, the files are sent to the workers in chunks, and the
+    nodes they return are added to the manifest in the same order as if the
+    files had been parsed one at a time.
+    """
+    def __init__(
+        self,
+        root_project: RuntimeConfig,
+        all_projects: Mapping[str, Project],
+        manifest: Manifest,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self.manifest = manifest
+        code_cache = get_code_cache()
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers or os.cpu_count(),
+            mp_context=flags.MP_CONTEXT,
+            initializer=init_worker,
+            initargs=(
+                _flag_values(), root_project, all_projects,
+                dict(manifest.macros), manifest.metadata,
+                code_cache.directory if code_cache is not None else None,
+            ),
+        )
+
+    @staticmethod
+    def can_parse(parser_cls: Type[Parser], file_ids: List[str]) -> bool:
+        return (
+            parser_cls.__name__ in PARALLEL_PARSERS and
+            len(file_ids) > CHUNK_SIZE
+        )
+
+    def parse_files(
+        self, project: Project, parser: Parser, file_ids: List[str]
+    ) -> None:
+        chunks = [
+            file_ids[idx:idx + CHUNK_SIZE]
+            for idx in range(0, len(file_ids), CHUNK_SIZE)
+        ]
+        futures: List[Future] = [
+            self.executor.submit(
+                parse_files, project.project_name, type(parser).__name__,
+                [self.manifest.files[file_id] for file_id in chunk],
+            )
+            for chunk in chunks
+        ]
+        for chunk, future in zip(chunks, futures):
+            try:
+                results = future.result()
+            except Exception as exc:
+                # parse the chunk here instead, which raises the same error
+                # as a serial parse would (exceptions don't always survive
+                # the trip back from the worker)
+                logger.debug(
+                    f'Parsing in a worker process failed, parsing '
+                    f'{len(chunk)} files serially: {exc}'
+                )
+                for file_id in chunk:
+                    parser.parse_file(FileBlock(self.manifest.files[file_id]))
+                continue
+            for result in results:
+                self._merge(result)
+
+    def _merge(self, result: ParsedFile) -> None:
+        source_file = self.manifest.files[result.file_id]
+        for enabled, node in result.nodes:
+            if enabled:
+                # the workers only parse, so the nodes aren't compiled yet
+                self.manifest.add_node(source_file, cast(ManifestNodes, node))
+            else:
+                self.manifest.add_disabled(source_file, node)
+        parsing_info = self.manifest._parsing_info
+        parsing_info.static_analysis_path_count += (
+            result.static_analysis_path_count
+        )
+        parsing_info.static_analysis_parsed_path_count += (
+            result.static_analysis_parsed_path_count
+        )
+
+    def shutdown(self) -> None:
+        self.executor.shutdown()
@@ -421,7 +421,7 @@ class PartialParsing:
                     source_file.macros.remove(unique_id)
                 continue
 
-            base_macro = self.saved_manifest.macros.pop(unique_id)
+            base_macro = self.saved_manifest.remove_macro(unique_id)
             self.deleted_manifest.macros[unique_id] = base_macro
 
             # Recursively check children of this macro
@@ -732,7 +732,7 @@ class PartialParsing:
             macro_unique_id = schema_file.macro_patches[macro['name']]
             del schema_file.macro_patches[macro['name']]
         if macro_unique_id and macro_unique_id in self.saved_manifest.macros:
-            macro = self.saved_manifest.macros.pop(macro_unique_id)
+            macro = self.saved_manifest.remove_macro(macro_unique_id)
             self.deleted_manifest.macros[macro_unique_id] = macro
             macro_file_id = macro.file_id
             if macro_file_id in self.new_files:
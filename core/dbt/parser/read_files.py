@@ -1,3 +1,7 @@
+from concurrent.futures import Executor
+from functools import partial
+
+from dbt import flags
 from dbt.clients.system import load_file_contents
 from dbt.contracts.files import (
     FilePath, ParseFileType, SourceFile, FileHash, AnySourceFile, SchemaSourceFile
@@ -6,7 +10,26 @@ from dbt.contracts.files import (
 from dbt.parser.schemas import yaml_from_file, schema_file_keys, check_format_version
 from dbt.exceptions import CompilationException
 from dbt.parser.search import FilesystemSearcher
-from typing import Optional
+from typing import Callable, Iterable, Optional, List
+
+
+# If the file at this path has the same modification time, size and inode
+# as when it was saved by the previous parse, assume it hasn't changed and
+# return the saved file, so it doesn't have to be read and hashed again.
+# With --paranoid-hashing, files are always read and hashed.
+def get_unchanged_saved_file(
+    path: FilePath, file_id: str, saved_files
+) -> Optional[AnySourceFile]:
+    if flags.PARANOID_HASHING or not saved_files or file_id not in saved_files:
+        return None
+    old_source_file = saved_files[file_id]
+    old_path = old_source_file.path
+    if (path.modification_time != 0.0 and
+            old_path.modification_time == path.modification_time and
+            old_path.file_size == path.file_size and
+            old_path.inode == path.inode):
+        return old_source_file
+    return None
 
 
 # This loads the files contents and creates the SourceFile object
@@ -18,17 +41,21 @@ def load_source_file(
     source_file = sf_cls(path=path, checksum=FileHash.empty(),
                          parse_file_type=parse_file_type, project_name=project_name)
 
-    skip_loading_schema_file = False
-    if (parse_file_type == ParseFileType.Schema and
-            saved_files and source_file.file_id in saved_files):
-        old_source_file = saved_files[source_file.file_id]
-        if (source_file.path.modification_time != 0.0 and
-                old_source_file.path.modification_time == source_file.path.modification_time):
+    skip_loading_file = False
+    old_source_file = get_unchanged_saved_file(path, source_file.file_id, saved_files)
+    if old_source_file is not None:
+        if (isinstance(source_file, SchemaSourceFile) and
+                isinstance(old_source_file, SchemaSourceFile)):
             source_file.checksum = old_source_file.checksum
             source_file.dfy = old_source_file.dfy
-            skip_loading_schema_file = True
+            skip_loading_file = True
+        # files saved by older versions of dbt don't have their contents
+        elif old_source_file.contents is not None:
+            source_file.checksum = old_source_file.checksum
+            source_file.contents = old_source_file.contents
+            skip_loading_file = True
 
-    if not skip_loading_schema_file:
+    if not skip_loading_file:
         file_contents = load_file_contents(path.absolute_path, strip=False)
         source_file.checksum = FileHash.from_contents(file_contents)
         source_file.contents = file_contents.strip()
@@ -67,14 +94,21 @@ def validate_yaml(file_path, dct):
 
 
 # Special processing for big seed files
-def load_seed_source_file(match: FilePath, project_name) -> SourceFile:
+def load_seed_source_file(match: FilePath, project_name, saved_files=None) -> SourceFile:
     if match.seed_too_large():
         # We don't want to calculate a hash of this file. Use the path.
         source_file = SourceFile.big_seed(match)
     else:
-        file_contents = load_file_contents(match.absolute_path, strip=False)
-        checksum = FileHash.from_contents(file_contents)
-        source_file = SourceFile(path=match, checksum=checksum)
+        source_file = SourceFile(path=match, checksum=FileHash.empty())
+        source_file.project_name = project_name
+        old_source_file = get_unchanged_saved_file(
+            match, source_file.file_id, saved_files
+        )
+        if old_source_file is not None:
+            source_file.checksum = old_source_file.checksum
+        else:
+            file_contents = load_file_contents(match.absolute_path, strip=False)
+            source_file.checksum = FileHash.from_contents(file_contents)
         source_file.contents = ''
     source_file.parse_file_type = ParseFileType.Seed
     source_file.project_name = project_name
@@ -82,29 +116,50 @@ def load_seed_source_file(match: FilePath, project_name) -> SourceFile:
 
 
 # Use the FilesystemSearcher to get a bunch of FilePaths, then turn
-# them into a bunch of FileSource objects
-def get_source_files(project, paths, extension, parse_file_type, saved_files):
+# them into a bunch of FileSource objects. If an executor is given,
+# the files are read (and hashed, and their yaml loaded) concurrently.
+def get_source_files(
+    project, paths, extension, parse_file_type, saved_files,
+    executor: Optional[Executor] = None,
+) -> List[AnySourceFile]:
     # file path list
     fp_list = list(FilesystemSearcher(
         project, paths, extension
     ))
+    load: Callable[[FilePath], Optional[AnySourceFile]]
+    if parse_file_type == ParseFileType.Seed:
+        load = partial(
+            load_seed_source_file, project_name=project.project_name,
+            saved_files=saved_files,
+        )
+    else:
+        load = partial(
+            load_source_file, parse_file_type=parse_file_type,
+            project_name=project.project_name, saved_files=saved_files,
+        )
+    # map returns the results in the order of fp_list, whether or not the
+    # files are read concurrently, so the order of the files is stable
+    files: Iterable[Optional[AnySourceFile]]
+    if executor is None:
+        files = map(load, fp_list)
+    else:
+        files = executor.map(load, fp_list)
     # file block list
     fb_list = []
-    for fp in fp_list:
-        if parse_file_type == ParseFileType.Seed:
-            fb_list.append(load_seed_source_file(fp, project.project_name))
-        else:
-            file = load_source_file(fp, parse_file_type, project.project_name, saved_files)
-            # only append the list if it has contents. added to fix #3568
-            if file:
-                fb_list.append(file)
+    for file in files:
+        # only append the list if it has contents. added to fix #3568
+        if file:
+            fb_list.append(file)
     return fb_list
 
 
-def read_files_for_parser(project, files, dirs, extension, parse_ft, saved_files):
+def read_files_for_parser(
+    project, files, dirs, extension, parse_ft, saved_files,
+    executor: Optional[Executor] = None,
+):
     parser_files = []
     source_files = get_source_files(
-        project, dirs, extension, parse_ft, saved_files
+        project, dirs, extension, parse_ft, saved_files, executor
     )
     for sf in source_files:
         files[sf.file_id] = sf
@@ -116,46 +171,59 @@ def read_files_for_parser(project, files, dirs, extension, parse_ft, saved_files
 # dictionary needs to be passed in. What determines the order of
 # the various projects? Is the root project always last? Do the
 # non-root projects need to be done separately in order?
-def read_files(project, files, parser_files, saved_files):
+# The files are read with the executor, if one is given.
+def read_files(
+    project, files, parser_files, saved_files,
+    executor: Optional[Executor] = None,
+):
 
     project_files = {}
 
     project_files['MacroParser'] = read_files_for_parser(
-        project, files, project.macro_paths, '.sql', ParseFileType.Macro, saved_files
+        project, files, project.macro_paths, '.sql', ParseFileType.Macro, saved_files,
+        executor
     )
 
     project_files['ModelParser'] = read_files_for_parser(
-        project, files, project.model_paths, '.sql', ParseFileType.Model, saved_files
+        project, files, project.model_paths, '.sql', ParseFileType.Model, saved_files,
+        executor
     )
 
     project_files['SnapshotParser'] = read_files_for_parser(
-        project, files, project.snapshot_paths, '.sql', ParseFileType.Snapshot, saved_files
+        project, files, project.snapshot_paths, '.sql', ParseFileType.Snapshot, saved_files,
+        executor
     )
 
     project_files['AnalysisParser'] = read_files_for_parser(
-        project, files, project.analysis_paths, '.sql', ParseFileType.Analysis, saved_files
+        project, files, project.analysis_paths, '.sql', ParseFileType.Analysis, saved_files,
+        executor
     )
 
     project_files['SingularTestParser'] = read_files_for_parser(
-        project, files, project.test_paths, '.sql', ParseFileType.Test, saved_files
+        project, files, project.test_paths, '.sql', ParseFileType.Test, saved_files,
+        executor
     )
 
     project_files['SeedParser'] = read_files_for_parser(
-        project, files, project.seed_paths, '.csv', ParseFileType.Seed, saved_files
+        project, files, project.seed_paths, '.csv', ParseFileType.Seed, saved_files,
+        executor
     )
 
     project_files['DocumentationParser'] = read_files_for_parser(
-        project, files, project.docs_paths, '.md', ParseFileType.Documentation, saved_files
+        project, files, project.docs_paths, '.md', ParseFileType.Documentation, saved_files,
+        executor
     )
 
     project_files['SchemaParser'] = read_files_for_parser(
-        project, files, project.all_source_paths, '.yml', ParseFileType.Schema, saved_files
+        project, files, project.all_source_paths, '.yml', ParseFileType.Schema, saved_files,
+        executor
     )
 
     # Also read .yaml files for schema files. Might be better to change
     # 'read_files_for_parser' accept an array in the future.
     yaml_files = read_files_for_parser(
-        project, files, project.all_source_paths, '.yaml', ParseFileType.Schema, saved_files
+        project, files, project.all_source_paths, '.yaml', ParseFileType.Schema, saved_files,
+        executor
     )
     project_files['SchemaParser'].extend(yaml_files)
 
@@ -86,6 +86,8 @@ class FilesystemSearcher(Iterable[FilePath]):
                 relative_path=result['relative_path'],
                 modification_time=result['modification_time'],
                 project_root=root,
+                file_size=result['file_size'],
+                inode=result['inode'],
             )
             yield file_match
 
@@ -21,6 +21,7 @@ from .printer import print_skip_caused_by_error, print_skip_line
 
 
 from dbt.adapters.factory import register_adapter
+from dbt.clients.jinja import set_code_cache, CODE_CACHE_DIR_NAME
 from dbt.config import RuntimeConfig, Project
 from dbt.config.profile import read_profile
 import dbt.exceptions
@@ -158,6 +159,12 @@ class ConfiguredTask(BaseTask):
     def __init__(self, args, config):
         super().__init__(args, config)
         register_adapter(self.config)
+        if flags.JINJA_CACHE:
+            set_code_cache(
+                os.path.join(self.config.target_path, CODE_CACHE_DIR_NAME)
+            )
+        else:
+            set_code_cache(None)
 
     @classmethod
     def from_args(cls, args):
@@ -1,6 +1,8 @@
+import math
 import os
 import threading
 import time
+from typing import Any, Dict, List, Optional, Tuple
 
 from .base import BaseRunner
 from .printer import (
@@ -10,13 +12,14 @@ from .printer import (
 )
 from .runnable import GraphRunnableTask
 
+from dbt.adapters.factory import get_adapter
 from dbt.contracts.results import (
     FreshnessExecutionResultArtifact,
     FreshnessResult, PartialSourceFreshnessResult,
-    SourceFreshnessResult, FreshnessStatus
+    SourceFreshnessResult, FreshnessStatus, collect_timing_info
 )
 from dbt.exceptions import RuntimeException, InternalException
-from dbt.logger import print_timestamped_line
+from dbt.logger import GLOBAL_LOGGER as logger, print_timestamped_line
 from dbt.node_types import NodeType
 
 from dbt.graph import ResourceTypeSelector
@@ -27,14 +30,21 @@ RESULT_FILE_NAME = 'sources.json'
 
 
 class FreshnessRunner(BaseRunner):
+    # a source whose batch query failed has already printed its start line
+    # when it's queried on its own
+    _started = False
+
     def on_skip(self):
         raise RuntimeException(
             'Freshness: nodes cannot be skipped!'
         )
 
     def before_execute(self):
+        if self._started:
+            return
         description = 'freshness of {0.source_name}.{0.name}'.format(self.node)
         print_start_line(description, self.node_index, self.num_nodes)
+        self._started = True
 
     def after_execute(self, result):
         print_freshness_result_line(result, self.node_index, self.num_nodes)
@@ -94,7 +104,11 @@ class FreshnessRunner(BaseRunner):
                 compiled_node.freshness.filter,
                 manifest=manifest
             )
+        return self.build_freshness_result(compiled_node, freshness)
 
+    def build_freshness_result(
+        self, compiled_node, freshness: Dict[str, Any]
+    ) -> SourceFreshnessResult:
         status = compiled_node.freshness.status(freshness['age'])
 
         return SourceFreshnessResult(
@@ -117,6 +131,81 @@ class FreshnessRunner(BaseRunner):
         return self.node
 
 
+class FreshnessBatchRunner:
+    """Calculate the freshness of a batch of sources with a single query.
+    Each source keeps its own FreshnessRunner for printing and results, and
+    adapter.calculate_freshness_batch returns the freshness of each of them
+    in order.
+
+    If the batch query fails, the sources in the batch are handed back to be
+    queried on their own instead, so the source that caused the failure gets
+    the error.
+    """
+    def __init__(self, adapter, runners: List[FreshnessRunner]) -> None:
+        self.adapter = adapter
+        self.runners = runners
+
+    @property
+    def name(self) -> str:
+        return f'freshness_batch.{self.runners[0].node.unique_id}'
+
+    def run(
+        self, manifest
+    ) -> Tuple[List[SourceFreshnessResult], List[FreshnessRunner]]:
+        """Run the batch. Returns the results of the sources that were
+        queried in the batch, and the runners of the sources that have to be
+        queried on their own because the batch query failed.
+        """
+        started = time.time()
+        for runner in self.runners:
+            runner.before_execute()
+
+        nodes = []
+        compile_timings = []
+        for runner in self.runners:
+            with collect_timing_info('compile') as timing_info:
+                nodes.append(runner.compile(manifest))
+            compile_timings.append(timing_info)
+
+        freshnesses: Optional[List[Dict[str, Any]]] = None
+        try:
+            with self.adapter.connection_named(self.name):
+                self.adapter.clear_transaction()
+                with collect_timing_info('execute') as execute_timing:
+                    freshnesses = self.adapter.calculate_freshness_batch(
+                        [
+                            (
+                                self.adapter.Relation.create_from_source(node),
+                                node.loaded_at_field,
+                                node.freshness.filter,
+                            )
+                            for node in nodes
+                        ],
+                        manifest=manifest
+                    )
+        except Exception as exc:
+            logger.debug(
+                f'Calculating the freshness of {len(nodes)} sources in one '
+                f'query failed, querying them one at a time: {exc}'
+            )
+        finally:
+            self.adapter.release_connection()
+
+        if freshnesses is None:
+            return [], self.runners
+
+        results = []
+        for idx, runner in enumerate(self.runners):
+            result = runner.from_run_result(
+                runner.build_freshness_result(nodes[idx], freshnesses[idx]),
+                started,
+                [compile_timings[idx], execute_timing],
+            )
+            runner.after_execute(result)
+            results.append(result)
+        return results, []
+
+
 class FreshnessSelector(ResourceTypeSelector):
     def node_is_match(self, node):
         if not super().node_is_match(node):
@@ -151,6 +240,35 @@ class FreshnessTask(GraphRunnableTask):
     def get_runner_type(self, _):
         return FreshnessRunner
 
+    def submit_node(self, pool, node, callback):
+        if not getattr(self.args, 'batch_freshness', False):
+            return super().submit_node(pool, node, callback)
+
+        by_schema: Dict[Tuple[str, str], List[ParsedSourceDefinition]] = {}
+        for ready in self.get_ready_nodes(node):
+            if ready.loaded_at_field is None:
+                super().submit_node(pool, ready, callback)
+            else:
+                key = (ready.database, ready.schema)
+                by_schema.setdefault(key, []).append(ready)
+
+        adapter = get_adapter(self.config)
+        batch_size = getattr(self.args, 'freshness_batch_size', 100)
+        for sources in by_schema.values():
+            # spread the sources over all the threads, in batches of at most
+            # --freshness-batch-size sources
+            per_thread = math.ceil(len(sources) / self.config.threads)
+            size = max(1, min(batch_size, per_thread))
+            for idx in range(0, len(sources), size):
+                batch = FreshnessBatchRunner(
+                    adapter,
+                    [
+                        self.get_runner(source)
+                        for source in sources[idx:idx + size]
+                    ],
+                )
+                self.submit_batch(pool, batch, callback)
+
     def write_result(self, result):
         artifact = FreshnessExecutionResultArtifact.from_result(result)
         artifact.write(self.result_path())
@@ -13,6 +13,8 @@ from dbt.parser.manifest import (
 )
 from dbt.logger import DbtProcessState, print_timestamped_line
 from dbt.clients.system import write_file
+from dbt.contracts.graph.digest import StateDigest
+from dbt.contracts.state import STATE_DIGEST_FILE_NAME
 from dbt.graph import Graph
 import time
 from typing import Optional
@@ -35,6 +37,8 @@ class ParseTask(ConfiguredTask):
     def write_manifest(self):
         path = os.path.join(self.config.target_path, MANIFEST_FILE_NAME)
         self.manifest.write(path)
+        path = os.path.join(self.config.target_path, STATE_DIGEST_FILE_NAME)
+        StateDigest.from_manifest(self.manifest).write(path)
 
     def write_perf_info(self):
         path = os.path.join(self.config.target_path, PERF_INFO_FILE_NAME)
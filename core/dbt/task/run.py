@@ -408,7 +408,9 @@ class RunTask(CompileTask):
     def before_run(self, adapter, selected_uids: AbstractSet[str]):
         with adapter.connection_named('master'):
             self.create_schemas(adapter, selected_uids)
-            self.populate_adapter_cache(adapter)
+            self.populate_adapter_cache(
+                adapter, self.get_cache_schemas(adapter, selected_uids)
+            )
             self.defer_to_manifest(adapter, selected_uids)
             self.safe_run_hooks(adapter, RunHookType.Start, {})
 
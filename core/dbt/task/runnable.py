@@ -1,4 +1,5 @@
 import os
+import queue
 import time
 import json
 from abc import abstractmethod
@@ -35,7 +36,8 @@ from dbt.contracts.graph.compiled import CompileResultNode
 from dbt.contracts.graph.manifest import Manifest
 from dbt.contracts.graph.parsed import ParsedSourceDefinition
 from dbt.contracts.results import NodeStatus, RunExecutionResult
-from dbt.contracts.state import PreviousState
+from dbt.contracts.graph.digest import StateDigest
+from dbt.contracts.state import PreviousState, STATE_DIGEST_FILE_NAME
 from dbt.exceptions import (
     InternalException,
     NotImplementedException,
@@ -72,6 +74,9 @@ class ManifestTask(ConfiguredTask):
         if flags.WRITE_JSON:
             path = os.path.join(self.config.target_path, MANIFEST_FILE_NAME)
             self.manifest.write(path)
+            # written after the manifest, so --state can tell it's current
+            path = os.path.join(self.config.target_path, STATE_DIGEST_FILE_NAME)
+            StateDigest.from_manifest(self.manifest).write(path)
         if os.getenv('DBT_WRITE_FILES'):
             path = os.path.join(self.config.target_path, 'files.json')
             write_file(path, json.dumps(self.manifest.files, cls=dbt.utils.JSONEncoder, indent=4))
@@ -201,25 +206,35 @@ class GraphRunnableTask(ManifestTask):
         cls = self.get_runner_type(node)
         return cls(self.config, adapter, node, run_count, num_nodes)
 
+    def _log_node_started(self, runner):
+        startctx = TimestampNamed('node_started_at')
+        index = self.index_offset(runner.node_index)
+        extended_metadata = ModelMetadata(runner.node, index)
+        with startctx, extended_metadata:
+            logger.debug('Began running node {}'.format(
+                runner.node.unique_id))
+
+    def _log_node_finished(self, runner, status: Dict[str, str]):
+        finishctx = TimestampNamed('node_finished_at')
+        with finishctx, DbtModelState(status):
+            logger.debug('Finished running node {}'.format(
+                runner.node.unique_id))
+
     def call_runner(self, runner):
         uid_context = UniqueID(runner.node.unique_id)
         with RUNNING_STATE, uid_context:
-            startctx = TimestampNamed('node_started_at')
-            index = self.index_offset(runner.node_index)
-            extended_metadata = ModelMetadata(runner.node, index)
-            with startctx, extended_metadata:
-                logger.debug('Began running node {}'.format(
-                    runner.node.unique_id))
+            self._log_node_started(runner)
             status: Dict[str, str]
             try:
                 result = runner.run_with_hooks(self.manifest)
                 status = runner.get_result_status(result)
             finally:
-                finishctx = TimestampNamed('node_finished_at')
-                with finishctx, DbtModelState(status):
-                    logger.debug('Finished running node {}'.format(
-                        runner.node.unique_id))
+                self._log_node_finished(runner, status)
+
+        self._check_result_for_errors(result)
+        return result
 
+    def _check_result_for_errors(self, result):
         fail_fast = flags.FAIL_FAST
 
         if result.status in (NodeStatus.Error, NodeStatus.Fail) and fail_fast:
@@ -234,8 +249,6 @@ class GraphRunnableTask(ManifestTask):
             # next 'tick' - should be soon since our thread is about to finish!
             self._raise_next_tick = RuntimeException(result.message)
 
-        return result
-
     def _submit(self, pool, args, callback):
         """If the caller has passed the magic 'single-threaded' flag, call the
         function directly instead of pool.apply_async. The single-threaded flag
@@ -250,6 +263,73 @@ class GraphRunnableTask(ManifestTask):
         else:
             pool.apply_async(self.call_runner, args=args, callback=callback)
 
+    def submit_node(self, pool, node, callback):
+        """Submit a node that came off the job queue to the pool."""
+        runner = self.get_runner(node)
+        # we finally know what we're running! Make sure we haven't decided
+        # to skip it due to upstream failures
+        if runner.node.unique_id in self._skipped_children:
+            cause = self._skipped_children.pop(runner.node.unique_id)
+            runner.do_skip(cause=cause)
+        args = (runner,)
+        self._submit(pool, args, callback)
+
+    def get_ready_nodes(self, node) -> List[CompileResultNode]:
+        """Return the node and every other node on the job queue that is
+        ready to run right now, for tasks that run nodes in batches.
+        """
+        nodes = [node]
+        assert self.job_queue is not None
+        while True:
+            try:
+                nodes.append(self.job_queue.get(block=False))
+            except queue.Empty:
+                break
+        return nodes
+
+    def submit_batch(self, pool, batch, callback):
+        """Submit a batch runner to the pool. Its run method returns the
+        results of the nodes it ran, which the callback gets one at a time,
+        and the runners of the nodes it couldn't run, which are submitted on
+        their own.
+        """
+        def batch_callback(batch_results):
+            results, rerun = batch_results
+            for runner in rerun:
+                self._submit(pool, (runner,), callback)
+            for result in results:
+                callback(result)
+
+        def batch_error(exc):
+            # every node must be marked done, or the queue never finishes
+            for runner in batch.runners:
+                callback(runner.error_result(runner.node, str(exc), time.time(), []))
+
+        if self.config.args.single_threaded:
+            batch_callback(self.call_batch_runner(batch))
+        else:
+            pool.apply_async(
+                self.call_batch_runner, args=(batch,),
+                callback=batch_callback, error_callback=batch_error,
+            )
+
+    def call_batch_runner(self, batch):
+        runners = {runner.node.unique_id: runner for runner in batch.runners}
+        with RUNNING_STATE:
+            for runner in batch.runners:
+                with UniqueID(runner.node.unique_id):
+                    self._log_node_started(runner)
+            results, rerun = batch.run(self.manifest)
+            for result in results:
+                runner = runners[result.node.unique_id]
+                with UniqueID(runner.node.unique_id):
+                    self._log_node_finished(
+                        runner, runner.get_result_status(result)
+                    )
+        for result in results:
+            self._check_result_for_errors(result)
+        return results, rerun
+
     def _raise_set_error(self):
         if self._raise_next_tick is not None:
             raise self._raise_next_tick
@@ -277,14 +357,7 @@ class GraphRunnableTask(ManifestTask):
         while not self.job_queue.empty():
             node = self.job_queue.get()
             self._raise_set_error()
-            runner = self.get_runner(node)
-            # we finally know what we're running! Make sure we haven't decided
-            # to skip it due to upstream failures
-            if runner.node.unique_id in self._skipped_children:
-                cause = self._skipped_children.pop(runner.node.unique_id)
-                runner.do_skip(cause=cause)
-            args = (runner,)
-            self._submit(pool, args, callback)
+            self.submit_node(pool, node, callback)
 
         # block on completion
         if flags.FAIL_FAST:
@@ -392,15 +465,46 @@ class GraphRunnableTask(ManifestTask):
         for dep_node_id in self.graph.get_dependent_nodes(node_id):
             self._skipped_children[dep_node_id] = cause
 
-    def populate_adapter_cache(self, adapter):
-        adapter.set_relations_cache(self.manifest)
+    def populate_adapter_cache(self, adapter, required_schemas=None):
+        adapter.set_relations_cache(
+            self.manifest, required_schemas=required_schemas
+        )
+
+    def get_cache_schemas(
+        self, adapter, selected_uids: Iterable[str]
+    ) -> Optional[Set[BaseRelation]]:
+        """Get the schemas the relations cache must hold when it's loaded
+        with --relations-cache-ttl, or None for all of them. With --defer,
+        dbt looks up the relation of every unselected node.
+        """
+        if getattr(self.args, 'defer', False):
+            return None
+        return self.get_model_schemas(adapter, selected_uids)
+
+    def persist_adapter_cache(self, adapter, results) -> None:
+        """Save the relations cache for later invocations. If the run didn't
+        finish, results is None. The schemas of nodes that errored are not
+        saved, as dbt can't know what those nodes left in the database.
+        """
+        invalidate = None
+        if results is not None:
+            invalidate = {
+                adapter.Relation.create_from(
+                    self.config, result.node
+                ).without_identifier()
+                for result in results
+                if result.status == NodeStatus.Error
+            }
+        adapter.persist_relations_cache(invalidate)
 
     def before_hooks(self, adapter):
         pass
 
     def before_run(self, adapter, selected_uids: AbstractSet[str]):
         with adapter.connection_named('master'):
-            self.populate_adapter_cache(adapter)
+            self.populate_adapter_cache(
+                adapter, self.get_cache_schemas(adapter, selected_uids)
+            )
 
     def after_run(self, adapter, results):
         pass
@@ -410,6 +514,7 @@ class GraphRunnableTask(ManifestTask):
 
     def execute_with_hooks(self, selected_uids: AbstractSet[str]):
         adapter = get_adapter(self.config)
+        res = None
         try:
             self.before_hooks(adapter)
             started = time.time()
@@ -420,6 +525,7 @@ class GraphRunnableTask(ManifestTask):
             self.after_hooks(adapter, res, elapsed)
 
         finally:
+            self.persist_adapter_cache(adapter, res)
             adapter.cleanup_connections()
 
         result = self.get_result(
@@ -593,7 +699,7 @@ class GraphRunnableTask(ManifestTask):
             default_false_keys = (
                 'debug', 'full_refresh', 'fail_fast', 'warn_error',
                 'single_threaded', 'log_cache_events',
-                'use_experimental_parser',
+                'use_experimental_parser', 'paranoid_hashing', 'parallel_parse',
             )
             if key in default_false_keys and var_args[key] is False:
                 continue
@@ -1,9 +1,12 @@
 from dataclasses import dataclass
 from dbt import utils
 from dbt.dataclass_schema import dbtClassMixin
+import math
 import threading
-from typing import Dict, Any, Union
+import time
+from typing import Dict, Any, Union, List, Optional, Tuple, FrozenSet, Set
 
+from .base import ExecutionContext
 from .compile import CompileRunner
 from .run import RunTask
 from .printer import print_start_line, print_test_result_line
@@ -14,20 +17,34 @@ from dbt.contracts.graph.compiled import (
     CompiledTestNode,
 )
 from dbt.contracts.graph.manifest import Manifest
-from dbt.contracts.results import TestStatus, PrimitiveDict, RunResult
+from dbt.contracts.results import (
+    TestStatus, PrimitiveDict, RunResult, collect_timing_info
+)
 from dbt.context.providers import generate_runtime_model
 from dbt.clients.jinja import MacroGenerator
+from dbt.adapters.factory import get_adapter
 from dbt.exceptions import (
     InternalException,
     missing_materialization
 )
+from dbt.include.global_project import PROJECT_NAME as GLOBAL_PROJECT_NAME
 from dbt.graph import (
     ResourceTypeSelector,
 )
+from dbt.logger import GLOBAL_LOGGER as logger, UniqueID
 from dbt.node_types import NodeType, RunHookType
 from dbt import flags
 
 
+# The materialization that batched tests would otherwise run with. Tests
+# that use any other test materialization are never batched.
+DEFAULT_TEST_MATERIALIZATION = 'macro.dbt.materialization_test_default'
+
+# The generic tests from the dbt package that get_fused_test_sql can run
+# together with a single scan of the model they test.
+FUSIBLE_TESTS = frozenset(('not_null', 'unique', 'accepted_values'))
+
+
 @dataclass
 class TestResultData(dbtClassMixin):
     failures: int
@@ -36,6 +53,10 @@ class TestResultData(dbtClassMixin):
 
 
 class TestRunner(CompileRunner):
+    # a test whose batch query failed has already printed its start line
+    # when it's run on its own
+    _started = False
+
     def describe_node(self):
         node_name = self.node.name
         return "test {}".format(node_name)
@@ -48,7 +69,9 @@ class TestRunner(CompileRunner):
         print_start_line(description, self.node_index, self.num_nodes)
 
     def before_execute(self):
-        self.print_start_line()
+        if not self._started:
+            self.print_start_line()
+            self._started = True
 
     def execute_test(
         self,
@@ -108,7 +131,11 @@ class TestRunner(CompileRunner):
 
     def execute(self, test: CompiledTestNode, manifest: Manifest):
         result = self.execute_test(test, manifest)
+        return self.build_test_result(test, result)
 
+    def build_test_result(
+        self, test: CompiledTestNode, result: TestResultData
+    ) -> RunResult:
         severity = test.config.severity.upper()
         thread_id = threading.current_thread().name
         num_errors = utils.pluralize(result.failures, 'result')
@@ -145,6 +172,276 @@ class TestRunner(CompileRunner):
         self.print_result_line(result)
 
 
+class TestBatchRunner:
+    """Run a batch of tests with a single query. Each test is compiled by
+    its own TestRunner, the get_test_batch_sql macro combines the compiled
+    tests into one `union all` query, and each row of its result is turned
+    back into the result of one test.
+
+    Generic tests in `fusible_tests` on columns of the same model are
+    fused: get_fused_test_sql computes all of their failure counts with a
+    single scan of the model, and each of them still gets its own row.
+
+    If the batch query fails, the tests in the batch are handed back to be
+    run on their own instead, so the test that caused the failure gets the
+    error.
+    """
+    def __init__(
+        self,
+        adapter,
+        runners: List[TestRunner],
+        fusible_tests: FrozenSet[str] = frozenset(),
+    ) -> None:
+        self.adapter = adapter
+        self.runners = runners
+        self.fusible_tests = fusible_tests
+
+    @property
+    def name(self) -> str:
+        return f'test_batch.{self.runners[0].node.unique_id}'
+
+    def run(
+        self, manifest: Manifest
+    ) -> Tuple[List[RunResult], List[TestRunner]]:
+        """Run the batch. Returns the results of the tests that ran in the
+        batch query or failed to compile, and the runners of the tests that
+        have to be run on their own because the batch query failed.
+        """
+        started = time.time()
+        for runner in self.runners:
+            with self.node_context(runner):
+                runner.before_execute()
+
+        results: Dict[int, RunResult] = {}
+        compiled: List[Tuple[int, ExecutionContext]] = []
+        batch_results: Optional[List[TestResultData]] = None
+        try:
+            with self.adapter.connection_named(self.name):
+                for idx, runner in enumerate(self.runners):
+                    with self.node_context(runner):
+                        ctx = ExecutionContext(runner.node)
+                        try:
+                            with collect_timing_info('compile') as timing_info:
+                                ctx.node = runner.compile(manifest)
+                            ctx.timing.append(timing_info)
+                        except Exception as exc:
+                            results[idx] = self._error_result(
+                                runner, exc, ctx, started
+                            )
+                        else:
+                            compiled.append((idx, ctx))
+
+                if compiled:
+                    try:
+                        with collect_timing_info('execute') as execute_timing:
+                            batch_results = self.execute_batch(
+                                [ctx.node for _, ctx in compiled], manifest
+                            )
+                    except Exception as exc:
+                        logger.debug(
+                            f'Running {len(compiled)} tests in one query '
+                            f'failed, running them one at a time: {exc}'
+                        )
+        except Exception as exc:
+            # the batch couldn't get a connection, so none of its tests ran
+            for idx, runner in enumerate(self.runners):
+                if idx not in results:
+                    with self.node_context(runner):
+                        results[idx] = self._error_result(
+                            runner, exc, ExecutionContext(runner.node), started
+                        )
+            compiled = []
+        finally:
+            self._release_connection()
+
+        rerun: List[TestRunner] = []
+        for position, (idx, ctx) in enumerate(compiled):
+            runner = self.runners[idx]
+            if batch_results is None:
+                rerun.append(runner)
+                continue
+            with self.node_context(runner):
+                try:
+                    ctx.timing.append(execute_timing)
+                    result = runner.build_test_result(
+                        ctx.node, batch_results[position]
+                    )
+                    results[idx] = runner.from_run_result(
+                        result, started, ctx.timing
+                    )
+                except Exception as exc:
+                    results[idx] = self._error_result(
+                        runner, exc, ctx, started
+                    )
+
+        finished: List[RunResult] = []
+        for idx, runner in enumerate(self.runners):
+            if idx not in results:
+                continue
+            with self.node_context(runner):
+                try:
+                    runner.after_execute(results[idx])
+                except Exception as exc:
+                    results[idx] = self._error_result(
+                        runner, exc, ExecutionContext(runner.node), started
+                    )
+            finished.append(results[idx])
+        return finished, rerun
+
+    @staticmethod
+    def node_context(runner: TestRunner) -> UniqueID:
+        """Attribute the logs written while working on one test of the
+        batch to that test.
+        """
+        return UniqueID(runner.node.unique_id)
+
+    @staticmethod
+    def _error_result(
+        runner: TestRunner, exc: Exception, ctx: ExecutionContext, started: float
+    ) -> RunResult:
+        error = runner.handle_exception(exc, ctx)
+        return runner.error_result(ctx.node, error, started, [])
+
+    def _release_connection(self) -> None:
+        try:
+            self.adapter.release_connection()
+        except Exception as exc:
+            logger.debug(f'Error releasing connection for {self.name}: {exc}')
+
+    def execute_batch(
+        self, tests: List[CompiledTestNode], manifest: Manifest
+    ) -> List[TestResultData]:
+        by_parent: Dict[str, List[Dict[str, Any]]] = {}
+        for idx, test in enumerate(tests):
+            fused = self.fused_test_kwargs(test, manifest)
+            if fused is not None:
+                fused['batch_index'] = idx
+                parent_id = test.depends_on.nodes[0]
+                by_parent.setdefault(parent_id, []).append(fused)
+
+        fused_tests = []
+        fused_indexes: Set[int] = set()
+        for parent_id, parent_tests in by_parent.items():
+            # there's nothing to share with a single test
+            if len(parent_tests) < 2:
+                continue
+            parent = manifest.expect(parent_id)
+            relation = self.adapter.Relation.create_from(
+                self.runners[0].config, parent
+            )
+            fused_tests.append({'relation': relation, 'tests': parent_tests})
+            fused_indexes.update(t['batch_index'] for t in parent_tests)
+
+        sql = self.adapter.execute_macro(
+            'get_test_batch_sql',
+            manifest=manifest,
+            kwargs={
+                'tests': [
+                    {
+                        'batch_index': idx,
+                        'main_sql': test.compiled_sql,
+                        'fail_calc': test.config.fail_calc,
+                        'warn_if': test.config.warn_if,
+                        'error_if': test.config.error_if,
+                        'limit': test.config.limit,
+                    }
+                    for idx, test in enumerate(tests)
+                    if idx not in fused_indexes
+                ],
+                'fused_tests': fused_tests,
+            },
+        )
+        _, table = self.adapter.execute(sql, auto_begin=True, fetch=True)
+
+        batch_results: List[Optional[TestResultData]] = [None] * len(tests)
+        column_names = [name.lower() for name in table.column_names]
+        for row in table.rows:
+            dct: PrimitiveDict = dict(
+                zip(column_names, map(utils._coerce_decimal, row))
+            )
+            batch_index = dct.pop('batch_index')
+            if not isinstance(batch_index, (int, float)):
+                raise InternalException(
+                    f'Test batch returned a row without a test: {batch_index}'
+                )
+            idx = int(batch_index)
+            if not 0 <= idx < len(tests) or batch_results[idx] is not None:
+                raise InternalException(
+                    f'Test batch returned an unexpected row for test {idx}'
+                )
+            TestResultData.validate(dct)
+            batch_results[idx] = TestResultData.from_dict(dct)
+
+        found = [r for r in batch_results if r is not None]
+        if len(found) != len(tests):
+            raise InternalException(
+                f'Test batch returned no rows for {len(tests) - len(found)} tests'
+            )
+        return found
+
+    def fused_test_kwargs(
+        self, test: CompiledTestNode, manifest: Manifest
+    ) -> Optional[Dict[str, Any]]:
+        """Return what get_fused_test_sql needs to know about the test, or
+        None if the test can't be fused with the other tests on its model.
+        """
+        metadata = getattr(test, 'test_metadata', None)
+        if (
+            metadata is None or
+            metadata.namespace is not None or
+            metadata.name not in self.fusible_tests
+        ):
+            return None
+        # the fused query only counts failing rows or values of one column
+        # of the whole model
+        config = test.config
+        if (
+            config.where or
+            config.limit is not None or
+            config.fail_calc != 'count(*)' or
+            len(test.depends_on.nodes) != 1
+        ):
+            return None
+        parent = manifest.expect(test.depends_on.nodes[0])
+        if getattr(parent, 'is_ephemeral_model', False):
+            return None
+
+        kwargs = dict(metadata.kwargs)
+        kwargs.pop('model', None)
+        column_name = kwargs.pop('column_name', None)
+        if not isinstance(column_name, str) or _needs_rendering(column_name):
+            return None
+        fused: Dict[str, Any] = {
+            'test_name': metadata.name,
+            'column_name': column_name,
+            'warn_if': config.warn_if,
+            'error_if': config.error_if,
+        }
+        if metadata.name == 'accepted_values':
+            values = kwargs.pop('values', None)
+            quote = kwargs.pop('quote', True)
+            if (
+                not isinstance(values, list) or not values or
+                not isinstance(quote, bool) or
+                any(_needs_rendering(value) for value in values)
+            ):
+                return None
+            fused['values'] = values
+            fused['quote'] = quote
+        if kwargs:
+            return None
+        return fused
+
+
+def _needs_rendering(value: Any) -> bool:
+    """Test kwargs are rendered when the test is compiled. Strings without
+    jinja or a function call like `var(...)` render as themselves.
+    """
+    if isinstance(value, str):
+        return '{' in value or '(' in value
+    return not isinstance(value, (int, float))
+
+
 class TestSelector(ResourceTypeSelector):
     def __init__(self, graph, manifest, previous_state):
         super().__init__(
@@ -161,6 +458,9 @@ class TestTask(RunTask):
         Read schema files + custom data tests and validate that
         constraints are satisfied.
     """
+    def __init__(self, args, config):
+        super().__init__(args, config)
+        self._fusible_tests: Optional[FrozenSet[str]] = None
 
     def raise_on_first_error(self):
         return False
@@ -184,3 +484,80 @@ class TestTask(RunTask):
 
     def get_runner_type(self, _):
         return TestRunner
+
+    @property
+    def batch_tests(self) -> bool:
+        return getattr(self.args, 'batch_tests', False)
+
+    def submit_node(self, pool, node, callback):
+        if not self.batch_tests:
+            return super().submit_node(pool, node, callback)
+
+        by_database: Dict[Optional[str], List[CompiledTestNode]] = {}
+        for ready in self.get_ready_nodes(node):
+            if self._can_batch(ready):
+                by_database.setdefault(ready.database, []).append(ready)
+            else:
+                super().submit_node(pool, ready, callback)
+
+        for tests in by_database.values():
+            for batch in self._make_batches(tests):
+                self._submit_batch(pool, batch, callback)
+
+    @property
+    def fusible_tests(self) -> FrozenSet[str]:
+        """The tests in FUSIBLE_TESTS that no project or package overrides,
+        directly or through an adapter-specific implementation.
+        """
+        if self._fusible_tests is None:
+            assert self.manifest is not None
+            overridden = set()
+            for macro in self.manifest.macros.values():
+                if macro.package_name == GLOBAL_PROJECT_NAME:
+                    continue
+                for name in FUSIBLE_TESTS:
+                    test_macro = utils.get_test_macro_name(
+                        name, with_prefix=False
+                    )
+                    if (
+                        macro.name == test_macro or
+                        macro.name.endswith(f'__{test_macro}')
+                    ):
+                        overridden.add(name)
+            self._fusible_tests = FUSIBLE_TESTS - overridden
+        return self._fusible_tests
+
+    def _can_batch(self, node) -> bool:
+        if node.unique_id in self._skipped_children:
+            return False
+        if node.resource_type != NodeType.Test or node.should_store_failures:
+            return False
+        assert self.manifest is not None
+        macro = self.manifest.find_materialization_macro_by_name(
+            self.config.project_name,
+            node.get_materialization(),
+            get_adapter(self.config).type()
+        )
+        return (
+            macro is not None and
+            macro.unique_id == DEFAULT_TEST_MATERIALIZATION
+        )
+
+    def _make_batches(self, tests: List[CompiledTestNode]):
+        # spread the tests over all the threads, in batches of at most
+        # --test-batch-size tests
+        per_thread = math.ceil(len(tests) / self.config.threads)
+        batch_size = getattr(self.args, 'test_batch_size', 100)
+        size = max(1, min(batch_size, per_thread))
+        # keep the tests of each model together, so they can be fused
+        tests = sorted(tests, key=lambda test: test.depends_on.nodes)
+        for idx in range(0, len(tests), size):
+            yield tests[idx:idx + size]
+
+    def _submit_batch(self, pool, tests, callback):
+        batch = TestBatchRunner(
+            get_adapter(self.config),
+            [self.get_runner(test) for test in tests],
+            self.fusible_tests,
+        )
+        self.submit_batch(pool, batch, callback)
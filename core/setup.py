@@ -70,6 +70,9 @@ setup(
         'idna>=2.5,<4',
         'cffi>=1.9,<2.0.0',
     ],
+    extras_require={
+        'zstd': ['zstandard>=0.15'],
+    },
     zip_safe=False,
     classifiers=[
         'Development Status :: 5 - Production/Stable',
@@ -0,0 +1,97 @@
+"""Compare the memory and speed of the networkx and compact graph backends.
+
+Builds the same synthetic DAG with both backends, then times the operations
+dbt runs on it: expanding `+selector+` operators, building the subset graph
+of the selected nodes, and draining a GraphQueue over that subset. Memory is
+what the graph itself holds on to after it's built, measured with
+tracemalloc, not counting the unique ID strings that the manifest owns.
+
+Usage:
+    python performance/benchmarks/graph_backend.py [--sizes 10000 100000]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+import networkx as nx
+
+from dbt.graph import CompactGraph, Graph, GraphQueue
+from dbt.graph.compact import CompactDiGraph
+
+from graph_queue import _Manifest, drain, make_dag
+
+
+def measure(build: Callable[[], Graph]) -> Tuple[Graph, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    graph = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return graph, elapsed, size
+
+
+def timed(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run(graph: Graph, seeds: List[str], subset: List[str]):
+    children = timed(lambda: graph.select_children(set(seeds)))
+    parents = timed(lambda: graph.select_parents(set(seeds)))
+    start = time.perf_counter()
+    subset_graph = graph.get_subset_graph(subset)
+    subset_time = time.perf_counter() - start
+    start = time.perf_counter()
+    queue = GraphQueue(subset_graph.graph, _Manifest(), set(subset))
+    drain(queue)
+    queue_time = time.perf_counter() - start
+    return children, parents, subset_time, queue_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument(
+        '--selected', type=float, default=0.01,
+        help='The share of nodes a +selector+ starts from',
+    )
+    args = parser.parse_args()
+
+    print(f'{"nodes":>8} {"edges":>8} {"backend":>9} {"MB":>7} '
+          f'{"build (s)":>10} {"children":>9} {"parents":>9} '
+          f'{"subset":>9} {"queue":>9}')
+    for size in args.sizes:
+        dag = make_dag(size)
+        nodes = list(dag.nodes())
+        edges = list(dag.edges())
+        del dag
+        rng = random.Random(0)
+        seeds = rng.sample(nodes, max(1, int(size * args.selected)))
+        subset = rng.sample(nodes, size // 2)
+
+        def build_networkx():
+            graph = nx.DiGraph()
+            graph.add_nodes_from(nodes)
+            graph.add_edges_from(edges)
+            return Graph(graph)
+
+        def build_compact():
+            return CompactGraph(CompactDiGraph(nodes, edges))
+
+        for name, build in (
+            ('networkx', build_networkx), ('compact', build_compact)
+        ):
+            graph, build_time, memory = measure(build)
+            timings = run(graph, seeds, subset)
+            print(f'{size:>8} {len(edges):>8} {name:>9} '
+                  f'{memory / 1024 / 1024:>7.1f} {build_time:>10.3f} ' +
+                  ' '.join(f'{t:>9.3f}' for t in timings))
+            del graph
+
+
+if __name__ == '__main__':
+    main()
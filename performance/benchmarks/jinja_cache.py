@@ -0,0 +1,93 @@
+"""Time compiling jinja templates with a cold and a warm code cache.
+
+Generates macros and model bodies similar to the ones in a dbt project and
+compiles each of them with dbt's jinja environment three ways: without a
+code cache, with an empty code cache (the first invocation, which also
+writes the cache), and with a code cache written by a previous invocation.
+The warm run uses a new CodeCache, so nothing is served from the memory of
+the cold run.
+
+Usage:
+    python performance/benchmarks/jinja_cache.py [--sizes 500 2000]
+"""
+import argparse
+import tempfile
+import time
+from typing import List
+
+from dbt.clients.jinja import get_template, set_code_cache
+
+
+MACRO = '''
+{%- macro generate_thing_{idx}(column_name, relation, values=none) -%}
+  {%- set things = [] -%}
+  {%- for value in (values or ['a', 'b', 'c']) -%}
+    {%- do things.append(column_name ~ ' = ' ~ value | string) -%}
+  {%- endfor -%}
+  {%- if relation is not none %}
+    select {{ things | join(', ') }} from {{ relation }}
+  {%- else %}
+    select {{ column_name }} as thing_{idx}
+  {%- endif -%}
+{%- endmacro -%}
+'''
+
+MODEL = '''
+{{{{ config(materialized='table', tags=['tag_{idx}']) }}}}
+with source as (
+    select * from {{{{ ref('model_{parent}') }}}}
+),
+renamed as (
+    select
+    {{% for column in ['id', 'name', 'created_at'] %}}
+        {{{{ column }}}} as {{{{ column }}}}_{idx}{{% if not loop.last %}},{{% endif %}}
+    {{% endfor %}}
+    from source
+    {{% if is_incremental() %}}
+    where created_at > (select max(created_at) from {{{{ this }}}})
+    {{% endif %}}
+)
+select * from renamed
+'''
+
+
+def make_templates(size: int) -> List[str]:
+    templates = []
+    for idx in range(size):
+        templates.append(MACRO.replace('{idx}', str(idx)))
+        templates.append(MODEL.format(idx=idx, parent=max(idx - 1, 0)))
+    return templates
+
+
+def timed_compile(templates: List[str]) -> float:
+    start = time.perf_counter()
+    for template in templates:
+        get_template(template, {})
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 2000])
+    args = parser.parse_args()
+
+    print(f'{"templates":>10} {"no cache (s)":>13} {"cold (s)":>9} '
+          f'{"warm (s)":>9}')
+    for size in args.sizes:
+        templates = make_templates(size)
+        set_code_cache(None)
+        uncached = timed_compile(templates)
+        with tempfile.TemporaryDirectory() as directory:
+            set_code_cache(directory)
+            cold = timed_compile(templates)
+            # a new cache over the same directory, like the next invocation
+            set_code_cache(None)
+            set_code_cache(directory)
+            warm = timed_compile(templates)
+            set_code_cache(None)
+        print(f'{len(templates):>10} {uncached:>13.3f} {cold:>9.3f} '
+              f'{warm:>9.3f}')
+
+
+if __name__ == '__main__':
+    main()
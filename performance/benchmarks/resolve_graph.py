@@ -0,0 +1,113 @@
+"""Compare Compiler.resolve_graph against the previous per-node algorithm.
+
+Builds a synthetic project with two generic tests per model, plus a
+relationship test on every tenth model, and times how long each
+implementation takes to add the test -> model edges. Both must produce the
+same edges.
+
+Usage:
+    python performance/benchmarks/resolve_graph.py [--sizes 1000 2000 5000]
+"""
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+import networkx as nx
+
+from dbt.compilation import Compiler, Linker, _get_tests_for_node
+from dbt.node_types import NodeType
+
+from graph_queue import make_dag
+
+
+def make_project(size: int, seed: int = 0):
+    rng = random.Random(seed)
+    graph = make_dag(size, seed=seed)
+    nodes = {}
+    child_map = {node: [] for node in graph}
+    for node in graph:
+        nodes[node] = SimpleNamespace(
+            resource_type=NodeType.Model,
+            depends_on_nodes=list(graph.predecessors(node)),
+        )
+
+    models = list(graph)
+    for idx, model in enumerate(models):
+        depends_on = [[model], [model]]
+        if idx % 10 == 0:
+            depends_on.append([model, rng.choice(models)])
+        for test_idx, test_depends_on in enumerate(depends_on):
+            test_id = f'test.bench.test_{idx}_{test_idx}'
+            nodes[test_id] = SimpleNamespace(
+                resource_type=NodeType.Test,
+                depends_on_nodes=test_depends_on,
+            )
+            child_map[test_id] = []
+            for parent in set(test_depends_on):
+                graph.add_edge(parent, test_id)
+                child_map[parent].append(test_id)
+
+    linker = Linker()
+    linker.graph = graph
+    return linker, SimpleNamespace(nodes=nodes, child_map=child_map)
+
+
+def resolve_graph_per_node(linker, manifest):
+    """The previous implementation: a reverse BFS from every node"""
+    for node_id in linker.graph:
+        if (
+            node_id in manifest.nodes and
+            manifest.nodes[node_id].resource_type != NodeType.Test
+        ):
+            all_upstream_nodes = nx.traversal.bfs_tree(
+                linker.graph, node_id, reverse=True
+            )
+            upstream_nodes = set([
+                n for n in all_upstream_nodes if n != node_id
+            ])
+            upstream_tests = []
+            for upstream_node in upstream_nodes:
+                upstream_tests += _get_tests_for_node(manifest, upstream_node)
+            for upstream_test in upstream_tests:
+                test_depends_on = set(
+                    manifest.nodes[upstream_test].depends_on_nodes
+                )
+                if (test_depends_on < upstream_nodes):
+                    linker.graph.add_edge(upstream_test, node_id)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[500, 1000, 2000],
+    )
+    parser.add_argument(
+        '--skip-previous', action='store_true',
+        help='Only time the current implementation',
+    )
+    args = parser.parse_args()
+
+    compiler = Compiler(config=None)
+    print(f'{"models":>8} {"edges":>9} {"previous (s)":>13} {"current (s)":>12}')
+    for size in args.sizes:
+        linker, manifest = make_project(size)
+        current = timed(compiler.resolve_graph, linker, manifest)
+        previous = float('nan')
+        if not args.skip_previous:
+            other, manifest = make_project(size)
+            previous = timed(resolve_graph_per_node, other, manifest)
+            if set(other.edges()) != set(linker.edges()):
+                raise RuntimeError(f'Edges differ for {size} models!')
+        print(f'{size:>8} {linker.graph.number_of_edges():>9} '
+              f'{previous:>13.3f} {current:>12.3f}')
+
+
+if __name__ == '__main__':
+    main()
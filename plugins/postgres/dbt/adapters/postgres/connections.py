@@ -28,6 +28,7 @@ class PostgresCredentials(Credentials):
     sslkey: Optional[str] = None
     sslrootcert: Optional[str] = None
     application_name: Optional[str] = 'dbt'
+    reuse_connections: bool = False
 
     _ALIASES = {
         'dbname': 'database',
@@ -78,6 +79,15 @@ class PostgresConnectionManager(SQLConnectionManager):
 
             raise dbt.exceptions.RuntimeException(e) from e
 
+    def use_connection_pool(self) -> bool:
+        return self.profile.credentials.reuse_connections
+
+    @classmethod
+    def check_handle_alive(cls, connection):
+        if connection.handle.closed:
+            raise dbt.exceptions.RuntimeException('Connection is closed')
+        super().check_handle_alive(connection)
+
     @classmethod
     def open(cls, connection):
         if connection.state == 'open':
@@ -1,6 +1,6 @@
 from datetime import datetime
 from dataclasses import dataclass
-from typing import Optional, Set, List, Any
+from typing import Optional, Set, FrozenSet, List, Any
 from dbt.adapters.base.meta import available
 from dbt.adapters.base.impl import AdapterConfig
 from dbt.adapters.sql import SQLAdapter
@@ -87,9 +87,13 @@ class PostgresAdapter(SQLAdapter):
     def parse_index(self, raw_index: Any) -> Optional[PostgresIndexConfig]:
         return PostgresIndexConfig.parse(raw_index)
 
-    def _link_cached_database_relations(self, schemas: Set[str]):
+    def _link_cached_database_relations(
+        self, schemas: Set[str], uncached_schemas: FrozenSet[str] = frozenset()
+    ):
         """
         :param schemas: The set of schemas that should have links added.
+        :param uncached_schemas: The set of schemas that must not get any
+            dependents added, because they aren't cached.
         """
         database = self.config.credentials.database
         table = self.execute_macro(GET_RELATIONS_MACRO_NAME)
@@ -108,7 +112,10 @@ class PostgresAdapter(SQLAdapter):
 
             # don't record in cache if this relation isn't in a relevant
             # schema
-            if refed_schema.lower() in schemas:
+            if (
+                refed_schema.lower() in schemas and
+                dep_schema.lower() not in uncached_schemas
+            ):
                 self.cache.add_link(referenced, dependent)
 
     def _get_catalog_schemas(self, manifest):
@@ -125,16 +132,20 @@ class PostgresAdapter(SQLAdapter):
 
     def _link_cached_relations(self, manifest):
         schemas: Set[str] = set()
+        uncached_schemas: Set[str] = set()
         relations_schemas = self._get_cache_schemas(manifest)
         for relation in relations_schemas:
             self.verify_database(relation.database)
-            schemas.add(relation.schema.lower())
-
-        self._link_cached_database_relations(schemas)
-
-    def _relations_cache_for_schemas(self, manifest):
-        super()._relations_cache_for_schemas(manifest)
-        self._link_cached_relations(manifest)
+            # with --relations-cache-ttl, some schemas are only listed when
+            # they're needed. Adding a dependent would make them look cached.
+            if (relation.database, relation.schema) in self.cache:
+                schemas.add(relation.schema.lower())
+            else:
+                uncached_schemas.add(relation.schema.lower())
+
+        self._link_cached_database_relations(
+            schemas, frozenset(uncached_schemas)
+        )
 
     def timestamp_add_sql(
         self, add_to: str, number: int = 1, interval: str = 'hour'
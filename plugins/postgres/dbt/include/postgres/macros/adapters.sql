@@ -69,6 +69,25 @@
 {% endmacro %}
 
 
+{% macro postgres__get_columns_in_schema(schema_relation) -%}
+  {% call statement('get_columns_in_schema', fetch_result=True) %}
+      select
+          table_name,
+          column_name,
+          data_type,
+          character_maximum_length,
+          numeric_precision,
+          numeric_scale
+
+      from {{ schema_relation.information_schema('columns') }}
+      where table_schema = '{{ schema_relation.schema }}'
+      order by table_name, ordinal_position
+
+  {% endcall %}
+  {{ return(load_result('get_columns_in_schema').table) }}
+{% endmacro %}
+
+
 {% macro postgres__list_relations_without_caching(schema_relation) %}
   {% call statement('list_relations_without_caching', fetch_result=True) -%}
     select
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""Rebuild dbt's relations cache graph from the cache events in a log file.
+
+Run dbt with --log-cache-events, then point this at logs/dbt.log to print
+the cache graph (each relation and the relations that reference it) as it
+was after any event of any invocation in the log.
+"""
+from argparse import ArgumentParser
+import json
+from typing import Any, Dict, List
+
+from dbt.adapters.cache import parse_cache_event, replay_cache_events
+
+
+def read_invocations(path: str) -> List[List[Dict[str, Any]]]:
+    """Split the cache events in the log into one list per invocation. The
+    events of each invocation are numbered from 0.
+    """
+    invocations: List[List[Dict[str, Any]]] = []
+    with open(path) as fp:
+        for line in fp:
+            event = parse_cache_event(line)
+            if event is None:
+                continue
+            if event['seq'] == 0 or not invocations:
+                invocations.append([])
+            invocations[-1].append(event)
+    return invocations
+
+
+def parse_args():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        'log_path', help='The dbt log file, usually logs/dbt.log'
+    )
+    parser.add_argument(
+        '--invocation', type=int, default=-1,
+        help='Which invocation in the log to replay, from 0. Negative '
+             'values count from the end, the default is the last one',
+    )
+    parser.add_argument(
+        '--until', type=int, default=None,
+        help='Stop after the event with this number, instead of replaying '
+             'all of the events of the invocation',
+    )
+    parser.add_argument(
+        '--events', action='store_true',
+        help='Print the events that would be replayed instead of the graph',
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    invocations = read_invocations(args.log_path)
+    if not invocations:
+        raise SystemExit(
+            f'No cache events found in {args.log_path}, was dbt run with '
+            f'--log-cache-events?'
+        )
+    events = invocations[args.invocation]
+    if args.events:
+        for event in events:
+            if args.until is not None and event['seq'] > args.until:
+                break
+            print(json.dumps(event))
+    else:
+        graph = replay_cache_events(events, until=args.until)
+        print(json.dumps(graph, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,3 @@
+with __dbt__cte__inner_ephemeral as (
+select * from source_table
+)select * from __dbt__cte__inner_ephemeral
\ No newline at end of file
@@ -0,0 +1 @@
+select * from source_table
\ No newline at end of file
@@ -59,6 +59,23 @@ class TestSchemaTests(DBTIntegrationTest):
                 self.assertTestPassed(result)
         self.assertEqual(sum(x.failures for x in test_results), 6)
 
+    @use_profile('postgres')
+    def test_postgres_schema_tests_batched(self):
+        results = self.run_dbt()
+        self.assertEqual(len(results), 5)
+        test_results = self.run_dbt(
+            ['test', '--batch-tests', '--test-batch-size', '4'],
+            expect_pass=False,
+        )
+        self.assertEqual(len(test_results), 19)
+
+        for result in test_results:
+            if 'failure' in result.node.name:
+                self.assertTestFailed(result)
+            else:
+                self.assertTestPassed(result)
+        self.assertEqual(sum(x.failures for x in test_results), 6)
+
     @use_profile('postgres')
     def test_postgres_schema_test_selection(self):
         results = self.run_dbt()
@@ -400,6 +400,18 @@ class TestSourceFreshness(SuccessfulSourcesTest):
         self.assertEqual(results[0].status, 'pass')
         self._assert_freshness_results('target/ancestor_source.json', 'pass')
 
+    @use_profile('postgres')
+    def test_postgres_source_freshness_batched(self):
+        self._set_updated_at_to(timedelta(hours=-2))
+        self.freshness_start_time = datetime.utcnow()
+        results = self.run_dbt_with_vars(
+            ['source', 'freshness', '--batch-freshness',
+                '-o', 'target/batched_source.json'],
+        )
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].status, 'pass')
+        self._assert_freshness_results('target/batched_source.json', 'pass')
+
 
 class TestSourceFreshnessErrors(SuccessfulSourcesTest):
     @property
@@ -415,6 +427,15 @@ class TestSourceFreshnessErrors(SuccessfulSourcesTest):
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0].status, 'runtime error')
 
+    @use_profile('postgres')
+    def test_postgres_error_batched(self):
+        results = self.run_dbt_with_vars(
+            ['source', 'freshness', '--batch-freshness'],
+            expect_pass=False
+        )
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].status, 'runtime error')
+
 
 class TestSourceFreshnessFilter(SuccessfulSourcesTest):
     @property
@@ -1,5 +1,15 @@
-from unittest import TestCase
-from dbt.adapters.cache import RelationsCache
+import json
+import os
+import tempfile
+from unittest import TestCase, mock
+
+import logbook
+
+from dbt.adapters.cache import (
+    CACHE_EVENT_PREFIX, RelationsCache, RelationsCacheStore, parse_cache_event,
+    replay_cache_events
+)
+from dbt.logger import log_cache_events
 from dbt.adapters.base.relation import BaseRelation
 from multiprocessing.dummy import Pool as ThreadPool
 import dbt.exceptions
@@ -18,10 +28,23 @@ def make_mock_relationship(database, schema, identifier):
     )
 
 
+def assert_schema_index_consistent(test, cache):
+    """The (database, schema) index of the cache holds exactly the cached
+    relations.
+    """
+    expected = {}
+    for key, relation in cache.relations.items():
+        expected.setdefault((key.database, key.schema), {})[key] = relation
+    test.assertEqual(cache._relations_by_schema, expected)
+
+
 class TestCache(TestCase):
     def setUp(self):
         self.cache = RelationsCache()
 
+    def tearDown(self):
+        assert_schema_index_consistent(self, self.cache)
+
     def assert_relations_state(self, database, schema, identifiers):
         relations = self.cache.get_relations(database, schema)
         for identifier, expect in identifiers.items():
@@ -264,6 +287,9 @@ class TestAdd(TestCache):
 
 
 class TestLikeDbt(TestCase):
+    def tearDown(self):
+        assert_schema_index_consistent(self, self.cache)
+
     def setUp(self):
         self.cache = RelationsCache()
         self._sleep = True
@@ -395,6 +421,9 @@ class TestLikeDbt(TestCase):
 
 
 class TestComplexCache(TestCase):
+    def tearDown(self):
+        assert_schema_index_consistent(self, self.cache)
+
     def setUp(self):
         self.cache = RelationsCache()
         inputs = [
@@ -489,3 +518,221 @@ class TestComplexCache(TestCase):
         self.assertEqual(len(self.cache.get_relations('dbt', 'bar')), 1)
         self.assertEqual(len(self.cache.get_relations('dbt_2', 'foo')), 1)
         self.assertEqual(len(self.cache.relations), 2)
+
+    def test_drop_schema(self):
+        # dropping dbt.foo cascades to dbt.bar.table3 and dbt_2.foo.table1
+        self.cache.drop_schema('DBT', 'Foo')
+        self.assertEqual(len(self.cache.get_relations('dbt', 'foo')), 0)
+        self.assertEqual(len(self.cache.get_relations('dbt', 'bar')), 1)
+        self.assertEqual(len(self.cache.get_relations('dbt_2', 'foo')), 1)
+        self.assertNotIn(('dbt', 'foo'), self.cache._relations_by_schema)
+        self.assertNotIn(('dbt', 'foo'), self.cache)
+
+    def test_clear(self):
+        self.cache.clear()
+        self.assertEqual(self.cache.get_relations('dbt', 'foo'), [])
+        self.assertEqual(self.cache._relations_by_schema, {})
+
+
+class TestCacheEvents(TestCase):
+    def setUp(self):
+        log_cache_events(True)
+        self.handler = logbook.TestHandler(level=logbook.DEBUG)
+        self.handler.push_thread()
+        self.cache = RelationsCache()
+        # (the number of the last event, the graph after it)
+        self.snapshots = []
+
+    def tearDown(self):
+        self.handler.pop_thread()
+        log_cache_events(False)
+
+    def events(self):
+        events = [parse_cache_event(r.message) for r in self.handler.records]
+        return [e for e in events if e is not None]
+
+    def snapshot(self):
+        self.snapshots.append((self.events()[-1]['seq'], self.cache.dump_graph()))
+
+    def test_replay(self):
+        for ident in 'abcde':
+            self.cache.add(make_relation('dbt', 'schema', ident))
+            self.snapshot()
+        self.cache.add(make_relation('dbt', 'other', 'f'))
+        self.snapshot()
+        # b and c reference a, d references b, f references c, so dropping
+        # the schema of a later on drops everything but e and g
+        for referenced, dependent in [('a', 'b'), ('a', 'c'), ('b', 'd')]:
+            self.cache.add_link(make_relation('dbt', 'schema', referenced),
+                                make_relation('dbt', 'schema', dependent))
+            self.snapshot()
+        self.cache.add_link(make_relation('dbt', 'schema', 'c'),
+                            make_relation('dbt', 'other', 'f'))
+        self.snapshot()
+        self.cache.rename(make_relation('dbt', 'schema', 'b'),
+                          make_relation('dbt', 'schema', 'b_renamed'))
+        self.snapshot()
+        self.cache.rename(make_relation('dbt', 'schema', 'a'),
+                          make_relation('dbt', 'other', 'a'))
+        self.snapshot()
+        # a temporary table
+        self.cache.rename(make_relation('dbt', 'schema', 'tmp'),
+                          make_relation('dbt', 'schema', 'g'))
+        self.snapshot()
+        self.cache.drop(make_relation('dbt', 'schema', 'c'))
+        self.snapshot()
+        self.cache.drop_schema('dbt', 'other')
+        self.snapshot()
+        self.cache.clear()
+        self.snapshot()
+        self.cache.add(make_relation('dbt', 'schema', 'h'))
+        self.snapshot()
+
+        events = self.events()
+        self.assertEqual([e['seq'] for e in events], list(range(len(events))))
+        self.assertEqual(events[-1], {
+            'event': 'add', 'seq': len(events) - 1, 'key': ['dbt', 'schema', 'h'],
+        })
+        self.assertEqual(
+            [e['event'] for e in events if e['event'] not in ('add', 'link')],
+            ['rename', 'rename', 'drop', 'drop_schema', 'drop', 'clear'],
+        )
+        for seq, graph in self.snapshots:
+            self.assertEqual(replay_cache_events(events, until=seq), graph)
+
+    def test_parse_cache_event(self):
+        event = {'event': 'add', 'seq': 0, 'key': ['dbt', 'schema', 'a']}
+        line = CACHE_EVENT_PREFIX + json.dumps(event)
+        self.assertEqual(
+            parse_cache_event(f'2021-10-11 12:00:00.000000 (MainThread): {line}\n'),
+            event,
+        )
+        self.assertEqual(
+            parse_cache_event(json.dumps({'message': line, 'levelname': 'DEBUG'})),
+            event,
+        )
+        self.assertIsNone(parse_cache_event('2021-10-11 12:00:00.000000 (MainThread): hi'))
+
+    def test_disabled(self):
+        log_cache_events(False)
+        self.cache.add(make_relation('dbt', 'schema', 'a'))
+        self.assertEqual(self.events(), [])
+
+
+class TestChangedSchemas(TestCache):
+    def test_changed_schemas(self):
+        self.cache.add(make_relation('dbt', 'A', 'a'))
+        self.cache.add(make_relation('dbt', 'b', 'b'))
+        self.assertEqual(self.cache.changed_schemas, {('dbt', 'a'), ('dbt', 'b')})
+        self.cache.clear()
+        self.assertEqual(self.cache.changed_schemas, set())
+
+        # drops and renames of relations dbt didn't know about still count
+        self.cache.drop(make_relation('dbt', 'c', 'c'))
+        self.cache.rename(make_relation('dbt', 'd', 'd'), make_relation('dbt', 'e', 'e'))
+        self.cache.drop_schema('dbt', 'f')
+        self.assertEqual(
+            self.cache.changed_schemas,
+            {('dbt', 'c'), ('dbt', 'd'), ('dbt', 'e'), ('dbt', 'f')},
+        )
+
+
+
+class TestColumns(TestCache):
+    def setUp(self):
+        super().setUp()
+        self.cache.add(make_relation('dbt', 'schema', 'a'))
+        self.cache.add(make_relation('dbt', 'schema', 'b'))
+
+    def test_get_set(self):
+        relation = make_relation('DBT', 'SCHEMA', 'A')
+        self.assertIsNone(self.cache.get_columns(relation))
+        self.cache.set_columns(relation, ['id'])
+        columns = self.cache.get_columns(make_relation('dbt', 'schema', 'a'))
+        self.assertEqual(columns, ['id'])
+        # callers get their own list
+        columns.append('name')
+        self.assertEqual(self.cache.get_columns(relation), ['id'])
+
+        # only the columns of cached relations are kept
+        self.cache.set_columns(make_relation('dbt', 'schema', 'c'), ['id'])
+        self.assertIsNone(self.cache.get_columns(make_relation('dbt', 'schema', 'c')))
+
+    def test_forgotten(self):
+        a = make_relation('dbt', 'schema', 'a')
+        b = make_relation('dbt', 'schema', 'b')
+        self.cache.set_columns(a, ['id'])
+        self.cache.set_columns(b, ['id'])
+        self.cache.rename(a, make_relation('dbt', 'schema', 'c'))
+        self.assertIsNone(self.cache.get_columns(a))
+        self.assertIsNone(self.cache.get_columns(make_relation('dbt', 'schema', 'c')))
+        self.cache.drop(b)
+        self.assertIsNone(self.cache.get_columns(b))
+        self.assertEqual(self.cache.columns, {})
+
+    def test_update_schema_columns(self):
+        self.cache.columns_changed(make_relation('dbt', 'schema', 'b'))
+        self.cache.update_schema_columns('dbt', 'Schema', {
+            'A': ['id'], 'b': ['id', 'name'], 'not_cached': ['id'],
+        })
+        self.assertEqual(self.cache.get_columns(make_relation('dbt', 'schema', 'a')), ['id'])
+        # b changed during the run, so it's left out
+        self.assertIsNone(self.cache.get_columns(make_relation('dbt', 'schema', 'b')))
+        self.assertNotIn(('dbt', 'schema', 'not_cached'), self.cache.columns)
+
+        self.cache.set_columns(make_relation('dbt', 'schema', 'b'), ['id', 'name'])
+        self.cache.clear()
+        self.assertEqual(self.cache.columns, {})
+        self.assertEqual(self.cache._columns_changed, set())
+
+class TestRelationsCacheStore(TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempdir.name, 'relations_cache', 'target.json')
+        self.store = RelationsCacheStore(self.path, ttl=100)
+        self.relations = [{'path': {'identifier': 'a'}}]
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_missing(self):
+        self.assertEqual(self.store.load(), {})
+        # nothing to save, so no file
+        self.store.save({}, invalidate=[])
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_ttl(self):
+        self.store.save({
+            ('dbt', 'a'): (1000, self.relations),
+            ('dbt', 'b'): (1050, []),
+        }, now=1000)
+        self.assertEqual(self.store.load(now=1099), {
+            ('dbt', 'a'): (1000, self.relations),
+            ('dbt', 'b'): (1050, []),
+        })
+        self.assertEqual(self.store.load(now=1100), {('dbt', 'b'): (1050, [])})
+
+        # stale schemas are removed when saving
+        self.store.save({('dbt', 'c'): (1120, [])}, now=1120)
+        with open(self.path) as fp:
+            saved = json.load(fp)
+        self.assertEqual(
+            [(s['schema'], s['listed_at']) for s in saved['schemas']],
+            [('b', 1050), ('c', 1120)],
+        )
+
+    def test_invalidate(self):
+        self.store.save({
+            ('dbt', 'a'): (1000, self.relations),
+            ('dbt', 'b'): (1000, []),
+        }, now=1000)
+        self.store.save({}, invalidate=[('dbt', 'a'), ('dbt', 'x')], now=1000)
+        self.assertEqual(self.store.load(now=1000), {('dbt', 'b'): (1000, [])})
+
+    def test_other_version(self):
+        self.store.save({('dbt', 'a'): (1000, [])}, now=1000)
+        with mock.patch('dbt.adapters.cache.dbt_version', '0.0.1'):
+            self.assertEqual(self.store.load(now=1000), {})
+        with open(self.path, 'w') as fp:
+            fp.write('{"schemas": ')
+        self.assertEqual(self.store.load(now=1000), {})
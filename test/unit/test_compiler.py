@@ -1,6 +1,9 @@
+import random
 import unittest
 from unittest.mock import MagicMock, patch
 
+import networkx as nx
+
 import dbt.flags
 import dbt.compilation
 from dbt.adapters.postgres import Plugin
@@ -563,3 +566,136 @@ class CompilerTest(unittest.TestCase):
             'select * from __dbt__cte__inner_ephemeral')
         )
 
+
+def _resolve_graph_reference(linker, manifest):
+    """The original per-node implementation of Compiler.resolve_graph,
+    verbatim. It adds edges while it iterates, so later nodes see the edges
+    added for earlier ones.
+    """
+    for node_id in linker.graph:
+        # If node is executable (in manifest.nodes) and does _not_
+        # represent a test, continue.
+        if (
+            node_id in manifest.nodes and
+            manifest.nodes[node_id].resource_type != NodeType.Test
+        ):
+            # Get *everything* upstream of the node
+            all_upstream_nodes = nx.traversal.bfs_tree(
+                linker.graph, node_id, reverse=True
+            )
+            # Get the set of upstream nodes not including the current node.
+            upstream_nodes = set([
+                n for n in all_upstream_nodes if n != node_id
+            ])
+
+            # Get all tests that depend on any upstream nodes.
+            upstream_tests = []
+            for upstream_node in upstream_nodes:
+                upstream_tests += dbt.compilation._get_tests_for_node(
+                    manifest,
+                    upstream_node
+                )
+
+            for upstream_test in upstream_tests:
+                # Get the set of all nodes that the test depends on
+                # including the upstream_node itself. This is necessary
+                # because tests can depend on multiple nodes (ex:
+                # relationship tests). Test nodes do not distinguish
+                # between what node the test is "testing" and what
+                # node(s) it depends on.
+                test_depends_on = set(
+                    manifest.nodes[upstream_test].depends_on_nodes
+                )
+
+                # If the set of nodes that an upstream test depends on
+                # is a proper (or strict) subset of all upstream nodes of
+                # the current node, add an edge from the upstream test
+                # to the current node. Must be a proper/strict subset to
+                # avoid adding a circular dependency to the graph.
+                if (test_depends_on < upstream_nodes):
+                    linker.graph.add_edge(
+                        upstream_test,
+                        node_id
+                    )
+
+
+def _random_project(rng, size):
+    nodes = {}
+    child_map = {}
+
+    def add_node(unique_id, resource_type, depends_on):
+        nodes[unique_id] = MagicMock(
+            unique_id=unique_id,
+            resource_type=resource_type,
+            depends_on_nodes=list(depends_on),
+        )
+        child_map[unique_id] = []
+        for parent in depends_on:
+            child_map[parent].append(unique_id)
+
+    models = []
+    for idx in range(size):
+        unique_id = f'model.pkg.m{idx}'
+        parents = rng.sample(models, min(len(models), rng.randint(0, 3)))
+        add_node(unique_id, NodeType.Model, parents)
+        models.append(unique_id)
+
+    for idx in range(size * 2):
+        unique_id = f'test.pkg.t{idx}'
+        parents = rng.sample(models, min(len(models), rng.choice([1, 1, 2, 3])))
+        add_node(unique_id, NodeType.Test, parents)
+
+    # the result depends on the order the nodes are visited in
+    order = list(nodes)
+    rng.shuffle(order)
+    linker = dbt.compilation.Linker()
+    for unique_id in order:
+        node = nodes[unique_id]
+        linker.add_node(unique_id)
+        for parent in node.depends_on_nodes:
+            linker.dependency(unique_id, parent)
+    return linker, MagicMock(nodes=nodes, child_map=child_map)
+
+
+class ResolveGraphTest(unittest.TestCase):
+    def test_simple_chain(self):
+        # model1 --> model2 --> model3, test1 on model1, test2 on model2
+        linker = dbt.compilation.Linker()
+        nodes = {
+            'model.pkg.model1': [],
+            'model.pkg.model2': ['model.pkg.model1'],
+            'model.pkg.model3': ['model.pkg.model2'],
+            'test.pkg.test1': ['model.pkg.model1'],
+            'test.pkg.test2': ['model.pkg.model2'],
+        }
+        manifest = MagicMock(nodes={}, child_map={n: [] for n in nodes})
+        for unique_id, depends_on in nodes.items():
+            resource_type = NodeType.Test if unique_id.startswith('test.') else NodeType.Model
+            manifest.nodes[unique_id] = MagicMock(
+                resource_type=resource_type, depends_on_nodes=depends_on
+            )
+            linker.add_node(unique_id)
+            for parent in depends_on:
+                linker.dependency(unique_id, parent)
+                manifest.child_map[parent].append(unique_id)
+
+        dbt.compilation.Compiler(MagicMock()).resolve_graph(linker, manifest)
+        self.assertIn(('test.pkg.test1', 'model.pkg.model3'), linker.edges())
+        self.assertIn(('test.pkg.test2', 'model.pkg.model3'), linker.edges())
+        # test1 covers all of model2's upstream, so it is not a strict subset
+        self.assertNotIn(('test.pkg.test1', 'model.pkg.model2'), linker.edges())
+
+    def test_random_projects_match_reference(self):
+        rng = random.Random(42)
+        compiler = dbt.compilation.Compiler(MagicMock())
+        for _ in range(50):
+            size = rng.randint(1, 40)
+            linker, manifest = _random_project(rng, size)
+            expected_linker = dbt.compilation.Linker()
+            expected_linker.graph = linker.graph.copy()
+
+            compiler.resolve_graph(linker, manifest)
+            _resolve_graph_reference(expected_linker, manifest)
+            self.assertEqual(
+                set(expected_linker.edges()), set(linker.edges())
+            )
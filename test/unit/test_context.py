@@ -9,13 +9,15 @@ import pytest
 from dbt.adapters import postgres
 from dbt.adapters import factory
 from dbt.adapters.base import AdapterConfig
-from dbt.clients.jinja import MacroStack
+from dbt.clients.jinja import MacroStack, MACRO_NAMESPACE_KEY, get_rendered
 from dbt.contracts.graph.parsed import (
     ParsedModelNode, NodeConfig, DependsOn, ParsedMacro
 )
 from dbt.config.project import VarProvider
 from dbt.context import base, target, configured, providers, docs, manifest, macros
+from dbt.context.macro_resolver import MacroResolver
 from dbt.contracts.files import FileHash
+from dbt.include.global_project import PACKAGE_PATH as GLOBAL_PROJECT_PATH
 from dbt.node_types import NodeType
 import dbt.exceptions
 from .utils import profile_from_dict, config_from_parts_or_dicts, inject_adapter, clear_plugin
@@ -306,7 +308,11 @@ def mock_manifest(config):
     for name in ['macro_a', 'macro_b']:
         macro = mock_macro(name, config.project_name)
         manifest_macros[macro.unique_id] = macro
-    return mock.MagicMock(macros=manifest_macros)
+    manifest = mock.MagicMock(macros=manifest_macros)
+    manifest.get_macro_resolver.side_effect = (
+        lambda root, internal: MacroResolver(manifest_macros, root, internal)
+    )
+    return manifest
 
 
 def mock_model():
@@ -381,7 +387,8 @@ def test_query_header_context(config_postgres, manifest_fx):
         config=config_postgres,
         manifest=manifest_fx,
     )
-    assert_has_keys(REQUIRED_QUERY_HEADER_KEYS, MAYBE_KEYS, ctx)
+    assert_has_keys(REQUIRED_QUERY_HEADER_KEYS, MAYBE_KEYS, ctx['context'])
+    assert set(ctx[MACRO_NAMESPACE_KEY]) == MACROS
 
 
 def test_macro_runtime_context(config_postgres, manifest_fx, get_adapter, get_include_paths):
@@ -391,7 +398,7 @@ def test_macro_runtime_context(config_postgres, manifest_fx, get_adapter, get_in
         manifest=manifest_fx,
         package_name='root',
     )
-    assert_has_keys(REQUIRED_MACRO_KEYS, MAYBE_KEYS, ctx)
+    assert_has_keys(REQUIRED_MACRO_KEYS, MAYBE_KEYS, ctx['context'])
 
 
 def test_model_parse_context(config_postgres, manifest_fx, get_adapter, get_include_paths):
@@ -401,7 +408,7 @@ def test_model_parse_context(config_postgres, manifest_fx, get_adapter, get_incl
         manifest=manifest_fx,
         context_config=mock.MagicMock(),
     )
-    assert_has_keys(REQUIRED_MODEL_KEYS, MAYBE_KEYS, ctx)
+    assert_has_keys(REQUIRED_MODEL_KEYS, MAYBE_KEYS, ctx['context'])
 
 
 def test_model_runtime_context(config_postgres, manifest_fx, get_adapter, get_include_paths):
@@ -410,7 +417,7 @@ def test_model_runtime_context(config_postgres, manifest_fx, get_adapter, get_in
         config=config_postgres,
         manifest=manifest_fx,
     )
-    assert_has_keys(REQUIRED_MODEL_KEYS, MAYBE_KEYS, ctx)
+    assert_has_keys(REQUIRED_MODEL_KEYS, MAYBE_KEYS, ctx['context'])
 
 
 def test_docs_runtime_context(config_postgres):
@@ -463,3 +470,79 @@ def test_macro_namespace(config_postgres, manifest_fx):
         assert result['dbt']['some_macro'].macro is pg_macro
         assert result['root']['some_macro'].macro is package_macro
         assert result['some_macro'].macro is package_macro
+
+
+def test_lazy_macro_namespace(config_postgres, manifest_fx):
+    mn = macros.MacroNamespaceBuilder(
+        'root', 'search', MacroStack(), ['dbt_postgres', 'dbt'])
+
+    dbt_macro = mock_macro('some_macro', 'dbt')
+    pg_macro = mock_macro('some_macro', 'dbt_postgres')
+    package_macro = mock_macro('some_macro', 'root')
+    search_macro = mock_macro('macro_a', 'search')
+
+    all_macros = {
+        m.unique_id: m for m in itertools.chain(
+            manifest_fx.macros.values(),
+            [dbt_macro, pg_macro, package_macro, search_macro]
+        )
+    }
+    resolver = MacroResolver(all_macros, 'root', ['dbt_postgres', 'dbt'])
+
+    with mock.patch.object(macros, 'MacroGenerator') as generator:
+        generator.side_effect = lambda macro, *args: mock.MagicMock(macro=macro)
+        namespace = mn.build_lazy_namespace(resolver, {})
+        # nothing is bound until it's looked up
+        assert not generator.called
+
+        assert set(namespace) == {
+            'dbt', 'root', 'search', 'some_macro', 'macro_a', 'macro_b'
+        }
+        assert 'dbt_postgres' not in namespace
+        assert not generator.called
+
+        assert namespace['some_macro'].macro is package_macro
+        assert namespace['dbt']['some_macro'].macro is pg_macro
+        assert namespace['macro_a'].macro is search_macro
+        assert namespace['root']['macro_a'].macro is not search_macro
+        # the same macro is bound once, however it's looked up
+        assert namespace['some_macro'] is namespace['root']['some_macro']
+        assert namespace.get_from_package('root', 'some_macro') is namespace['some_macro']
+        assert generator.call_count == 4
+
+
+def test_snapshot_strategy_dispatch_context(config_postgres, manifest_fx):
+    # strategy_dispatch finds the strategy macros through `context`
+    path = os.path.join(
+        GLOBAL_PROJECT_PATH, 'macros', 'materializations', 'snapshot',
+        'strategies.sql'
+    )
+    with open(path) as fp:
+        macro_sql = fp.read()
+    for name in ['strategy_dispatch', 'snapshot_check_strategy']:
+        macro = ParsedMacro(
+            name=name,
+            macro_sql=macro_sql,
+            unique_id=f'macro.dbt.{name}',
+            package_name='dbt',
+            root_path=GLOBAL_PROJECT_PATH,
+            path=path,
+            original_file_path=path,
+            resource_type=NodeType.Macro,
+        )
+        manifest_fx.macros[macro.unique_id] = macro
+
+    ctx = manifest.generate_query_header_context(
+        config=config_postgres,
+        manifest=manifest_fx,
+    )
+    assert 'snapshot_check_strategy' in ctx['context']
+    assert ctx['context']['dbt']['snapshot_check_strategy'].macro is macro
+    rendered = get_rendered(
+        "{{ strategy_dispatch('check').macro.unique_id }}|"
+        "{{ strategy_dispatch('dbt.check').macro.unique_id }}",
+        ctx,
+    )
+    assert rendered == (
+        'macro.dbt.snapshot_check_strategy|macro.dbt.snapshot_check_strategy'
+    )
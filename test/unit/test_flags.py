@@ -6,6 +6,7 @@ from .utils import normalize
 from dbt import flags
 from dbt.contracts.project import UserConfig
 from dbt.config.profile import DEFAULT_PROFILES_DIR
+from dbt.exceptions import ValidationException
 
 
 class TestFlags(TestCase):
@@ -195,3 +196,113 @@ class TestFlags(TestCase):
         os.environ.pop('DBT_PRINTER_WIDTH')
         delattr(self.args, 'printer_width')
         self.user_config.printer_width = None
+
+        # paranoid_hashing
+        self.user_config.paranoid_hashing = True
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.PARANOID_HASHING, True)
+        os.environ['DBT_PARANOID_HASHING'] = 'false'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.PARANOID_HASHING, False)
+        setattr(self.args, 'paranoid_hashing', True)
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.PARANOID_HASHING, True)
+        # cleanup
+        os.environ.pop('DBT_PARANOID_HASHING')
+        delattr(self.args, 'paranoid_hashing')
+        flags.PARANOID_HASHING = False
+        self.user_config.paranoid_hashing = None
+
+        # parallel_parse
+        self.user_config.parallel_parse = True
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.PARALLEL_PARSE, True)
+        os.environ['DBT_PARALLEL_PARSE'] = 'false'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.PARALLEL_PARSE, False)
+        setattr(self.args, 'parallel_parse', True)
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.PARALLEL_PARSE, True)
+        # cleanup
+        os.environ.pop('DBT_PARALLEL_PARSE')
+        delattr(self.args, 'parallel_parse')
+        flags.PARALLEL_PARSE = False
+        self.user_config.parallel_parse = None
+
+        # jinja_cache
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.JINJA_CACHE, False)
+        self.user_config.jinja_cache = True
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.JINJA_CACHE, True)
+        os.environ['DBT_JINJA_CACHE'] = 'false'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.JINJA_CACHE, False)
+        setattr(self.args, 'jinja_cache', True)
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.JINJA_CACHE, True)
+        # cleanup
+        os.environ.pop('DBT_JINJA_CACHE')
+        delattr(self.args, 'jinja_cache')
+        flags.JINJA_CACHE = False
+        self.user_config.jinja_cache = None
+
+        # artifact_compression -- none, gzip, zstd
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.ARTIFACT_COMPRESSION, 'none')
+        self.user_config.artifact_compression = 'gzip'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.ARTIFACT_COMPRESSION, 'gzip')
+        os.environ['DBT_ARTIFACT_COMPRESSION'] = 'ZSTD'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.ARTIFACT_COMPRESSION, 'zstd')
+        setattr(self.args, 'artifact_compression', 'none')
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.ARTIFACT_COMPRESSION, 'none')
+        delattr(self.args, 'artifact_compression')
+        os.environ['DBT_ARTIFACT_COMPRESSION'] = 'bzip2'
+        with self.assertRaises(ValidationException):
+            flags.set_from_args(self.args, self.user_config)
+        # cleanup
+        os.environ.pop('DBT_ARTIFACT_COMPRESSION')
+        flags.ARTIFACT_COMPRESSION = 'none'
+        self.user_config.artifact_compression = None
+
+        # relations_cache_ttl -- seconds
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.RELATIONS_CACHE_TTL, 0)
+        self.user_config.relations_cache_ttl = 600
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.RELATIONS_CACHE_TTL, 600)
+        os.environ['DBT_RELATIONS_CACHE_TTL'] = '3600'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.RELATIONS_CACHE_TTL, 3600)
+        setattr(self.args, 'relations_cache_ttl', 0)
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.RELATIONS_CACHE_TTL, 0)
+        # cleanup
+        os.environ.pop('DBT_RELATIONS_CACHE_TTL')
+        delattr(self.args, 'relations_cache_ttl')
+        flags.RELATIONS_CACHE_TTL = 0
+        self.user_config.relations_cache_ttl = None
+
+        # graph_backend -- networkx, compact
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.GRAPH_BACKEND, 'networkx')
+        self.user_config.graph_backend = 'compact'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.GRAPH_BACKEND, 'compact')
+        os.environ['DBT_GRAPH_BACKEND'] = 'NetworkX'
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.GRAPH_BACKEND, 'networkx')
+        setattr(self.args, 'graph_backend', 'compact')
+        flags.set_from_args(self.args, self.user_config)
+        self.assertEqual(flags.GRAPH_BACKEND, 'compact')
+        delattr(self.args, 'graph_backend')
+        os.environ['DBT_GRAPH_BACKEND'] = 'igraph'
+        with self.assertRaises(ValidationException):
+            flags.set_from_args(self.args, self.user_config)
+        # cleanup
+        os.environ.pop('DBT_GRAPH_BACKEND')
+        flags.GRAPH_BACKEND = 'networkx'
+        self.user_config.graph_backend = None
@@ -0,0 +1,187 @@
+import random
+import unittest
+
+import networkx as nx
+
+from dbt.exceptions import InternalException
+from dbt.graph import CompactGraph, Graph
+from dbt.graph.compact import CompactDiGraph
+from dbt.graph.queue import GraphQueue
+
+
+def _random_dag(rng, size, edge_probability):
+    graph = nx.DiGraph()
+    graph.add_nodes_from(f'model.pkg.n{idx}' for idx in range(size))
+    for child in range(size):
+        for parent in range(child):
+            if rng.random() < edge_probability:
+                graph.add_edge(f'model.pkg.n{parent}', f'model.pkg.n{child}')
+    return graph
+
+
+def _closure_subset_graph(graph, selected):
+    """The original implementation of get_subset_graph, for reference"""
+    new_graph = nx.algorithms.transitive_closure(graph)
+    for node in graph:
+        if node not in selected:
+            new_graph.remove_node(node)
+    return new_graph
+
+
+def _depths(graph):
+    depths = {}
+    for node in nx.topological_sort(graph):
+        depths[node] = max(
+            (depths[parent] + 1 for parent in graph.predecessors(node)),
+            default=0,
+        )
+    return depths
+
+
+class GraphSubsetTest(unittest.TestCase):
+    def assert_same_reachability(self, expected, got):
+        self.assertEqual(set(expected.nodes()), set(got.nodes()))
+        self.assertEqual(
+            set(nx.algorithms.transitive_closure(expected).edges()),
+            set(nx.algorithms.transitive_closure(got).edges()),
+        )
+
+    def test_chain_through_unselected(self):
+        graph = Graph(nx.DiGraph([('a', 'b'), ('b', 'c'), ('c', 'd')]))
+        subset = graph.get_subset_graph(['a', 'd'])
+        self.assertEqual(set(subset.nodes()), {'a', 'd'})
+        self.assertEqual(set(subset.edges()), {('a', 'd')})
+
+    def test_stops_at_selected_descendant(self):
+        graph = Graph(nx.DiGraph([('a', 'b'), ('b', 'c'), ('c', 'd')]))
+        subset = graph.get_subset_graph(['a', 'c', 'd'])
+        # a -> d is implied by a -> c -> d
+        self.assertEqual(set(subset.edges()), {('a', 'c'), ('c', 'd')})
+
+    def test_missing_node(self):
+        graph = Graph(nx.DiGraph([('a', 'b')]))
+        with self.assertRaises(ValueError):
+            graph.get_subset_graph(['a', 'z'])
+
+    def test_random_dags_match_transitive_closure(self):
+        rng = random.Random(1234)
+        for _ in range(200):
+            size = rng.randint(1, 30)
+            nx_graph = _random_dag(rng, size, rng.choice([0.05, 0.1, 0.3]))
+            selected = {
+                node for node in nx_graph if rng.random() < rng.random()
+            }
+            expected = _closure_subset_graph(nx_graph, selected)
+            got = Graph(nx_graph).get_subset_graph(selected).graph
+            self.assert_same_reachability(expected, got)
+            # the scheduler's topological depth must not change either
+            self.assertEqual(_depths(expected), _depths(got))
+
+
+class GraphSelectReachableTest(unittest.TestCase):
+    def test_depth_is_per_selected_node(self):
+        graph = Graph(nx.DiGraph([('a', 'b'), ('b', 'c'), ('c', 'd'), ('x', 'c')]))
+        self.assertEqual(graph.select_children({'a', 'x'}, 1), {'b', 'c'})
+        self.assertEqual(graph.select_children({'a', 'x'}, 2), {'b', 'c', 'd'})
+        self.assertEqual(graph.select_parents({'d'}, 1), {'c'})
+        self.assertEqual(graph.select_parents({'d'}, 2), {'b', 'c', 'x'})
+
+    def test_selected_nodes_only_when_reached(self):
+        graph = Graph(nx.DiGraph([('a', 'b'), ('b', 'c')]))
+        self.assertEqual(graph.select_children({'a', 'b'}), {'b', 'c'})
+        self.assertEqual(graph.select_children({'a', 'c'}), {'b', 'c'})
+        self.assertEqual(graph.select_children({'a', 'b'}, 0), set())
+
+    def test_missing_node(self):
+        graph = Graph(nx.DiGraph([('a', 'b')]))
+        with self.assertRaises(InternalException):
+            graph.select_children({'a', 'z'})
+        with self.assertRaises(InternalException):
+            graph.select_parents({'z'})
+
+    def test_random_dags_match_per_node(self):
+        rng = random.Random(1234)
+        for _ in range(200):
+            size = rng.randint(1, 30)
+            graph = Graph(_random_dag(rng, size, rng.choice([0.05, 0.1, 0.3])))
+            selected = {
+                node for node in graph.nodes() if rng.random() < rng.random()
+            }
+            for max_depth in (None, 0, 1, 2, 3):
+                children = set()
+                parents = set()
+                for node in selected:
+                    children.update(graph.descendants(node, max_depth))
+                    parents.update(graph.ancestors(node, max_depth))
+                self.assertEqual(graph.select_children(selected, max_depth), children)
+                self.assertEqual(graph.select_parents(selected, max_depth), parents)
+
+
+class CompactGraphTest(unittest.TestCase):
+    def test_networkx_api(self):
+        graph = CompactDiGraph(['a', 'b', 'c', 'd'], [('a', 'b'), ('a', 'c'), ('b', 'c'), ('a', 'b')])
+        self.assertEqual(len(graph), 4)
+        self.assertEqual(list(graph), ['a', 'b', 'c', 'd'])
+        self.assertIn('d', graph)
+        self.assertNotIn('z', graph)
+        self.assertEqual(graph.number_of_edges(), 3)
+        self.assertEqual(set(graph.edges()), {('a', 'b'), ('a', 'c'), ('b', 'c')})
+        self.assertEqual(graph.successors('a'), ['b', 'c'])
+        self.assertEqual(graph.predecessors('c'), ['a', 'b'])
+        self.assertEqual(dict(graph.in_degree()), {'a': 0, 'b': 1, 'c': 2, 'd': 0})
+        self.assertEqual(list(graph.topological_generations()), [['a', 'd'], ['b'], ['c']])
+        subgraph = graph.subgraph(['a', 'c', 'z'])
+        self.assertEqual(subgraph.nodes(), ['a', 'c'])
+        self.assertEqual(list(subgraph.edges()), [('a', 'c')])
+
+    def test_cycle(self):
+        graph = CompactDiGraph(['a', 'b', 'c'], [('a', 'b'), ('b', 'c'), ('c', 'b')])
+        with self.assertRaises(InternalException):
+            graph.topological_sort()
+
+    def test_missing_node(self):
+        graph = CompactGraph(CompactDiGraph(['a', 'b'], [('a', 'b')]))
+        with self.assertRaises(InternalException):
+            graph.ancestors('z')
+        with self.assertRaises(InternalException):
+            graph.select_children({'a', 'z'})
+        with self.assertRaises(ValueError):
+            graph.get_subset_graph(['a', 'z'])
+
+    def test_random_dags_match_networkx(self):
+        rng = random.Random(1234)
+        for _ in range(200):
+            size = rng.randint(1, 30)
+            nx_graph = _random_dag(rng, size, rng.choice([0.05, 0.1, 0.3]))
+            expected = Graph(nx_graph)
+            got = CompactGraph.from_networkx(nx_graph)
+            self.assertEqual(got.nodes(), expected.nodes())
+            self.assertEqual(set(got.edges()), set(expected.edges()))
+            selected = {
+                node for node in nx_graph if rng.random() < rng.random()
+            }
+            for max_depth in (None, 0, 1, 2):
+                self.assertEqual(
+                    got.select_children(selected, max_depth),
+                    expected.select_children(selected, max_depth),
+                )
+                self.assertEqual(
+                    got.select_parents(selected, max_depth),
+                    expected.select_parents(selected, max_depth),
+                )
+            for node in nx_graph:
+                self.assertEqual(got.ancestors(node), expected.ancestors(node))
+                self.assertEqual(got.get_dependent_nodes(node), expected.get_dependent_nodes(node))
+
+            subset = got.get_subset_graph(selected)
+            self.assertIsInstance(subset, CompactGraph)
+            self.assertEqual(
+                set(subset.edges()), set(expected.get_subset_graph(selected).edges())
+            )
+            self.assertEqual(
+                set(got.subgraph(selected).edges()), set(expected.subgraph(selected).edges())
+            )
+            self.assertEqual(
+                [set(level) for level in GraphQueue._grouped_topological_sort(got.graph)],
+                [set(level) for level in GraphQueue._grouped_topological_sort(nx_graph)],
+            )
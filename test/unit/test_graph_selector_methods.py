@@ -20,6 +20,7 @@ from dbt.contracts.graph.parsed import (
     TestMetadata,
     ColumnInfo,
 )
+from dbt.contracts.graph.digest import StateDigest
 from dbt.contracts.graph.manifest import Manifest
 from dbt.contracts.graph.unparsed import ExposureType, ExposureOwner
 from dbt.contracts.state import PreviousState
@@ -36,6 +37,8 @@ from dbt.graph.selector_methods import (
     TestTypeSelectorMethod,
     StateSelectorMethod,
     ExposureSelectorMethod,
+    ResourceTypeSelectorMethod,
+    SelectorIndex,
 )
 import dbt.exceptions
 import dbt.contracts.graph.parsed
@@ -694,6 +697,70 @@ def test_select_config_materialized(manifest):
         'table_model', 'union_model', 'mynamespace.union_model'}
 
 
+def test_select_config_severity(manifest):
+    methods = MethodManager(manifest, None)
+    method = methods.get_method('config', ['severity'])
+    # severity is compared case-insensitively
+    assert search_manifest_using_method(manifest, method, 'error') == {
+        'unique_table_model_id', 'not_null_table_model_id', 'unique_view_model_id',
+        'unique_ext_raw_ext_source_id', 'view_test_nothing'}
+    assert not search_manifest_using_method(manifest, method, 'warn')
+
+
+def test_select_resource_type(manifest):
+    method = ResourceTypeSelectorMethod(manifest, None, [])
+    assert search_manifest_using_method(manifest, method, 'seed') == {
+        'seed', 'mynamespace.seed'}
+    with pytest.raises(dbt.exceptions.RuntimeException):
+        set(method.search(set(manifest.nodes), 'not_a_type'))
+
+
+def test_selector_index_paths(manifest):
+    index = SelectorIndex(manifest)
+    nodes = list(manifest.nodes.values()) + list(manifest.sources.values())
+    for node in nodes:
+        root = Path(node.root_path)
+        ofp = Path(node.original_file_path)
+        for path in [ofp, *ofp.parents]:
+            # the same nodes the path method used to find by scanning
+            expected = {
+                other.unique_id for other in nodes + list(manifest.exposures.values())
+                if Path(other.root_path) == root and (
+                    Path(other.original_file_path) == path or
+                    path in Path(other.original_file_path).parents
+                )
+            }
+            assert index.path(root, path) == expected
+    assert index.path(Path('/not/a/project'), Path('models')) == set()
+
+
+def test_selector_index_shared(manifest):
+    methods = MethodManager(manifest, None)
+    tag_method = methods.get_method('tag', [])
+    package_method = methods.get_method('package', [])
+    assert tag_method.index is package_method.index
+
+    with mock.patch.object(SelectorIndex, '_all_nodes', autospec=True,
+                           side_effect=SelectorIndex._all_nodes) as all_nodes:
+        for tag in ('uses_ephemeral', 'missing', 'uses_ephemeral'):
+            search_manifest_using_method(manifest, tag_method, tag)
+        assert all_nodes.call_count == 1
+        # only the included nodes are selected
+        assert set(tag_method.search({'model.pkg.view_model'}, 'uses_ephemeral')) == {
+            'model.pkg.view_model'}
+
+        search_manifest_using_method(manifest, package_method, 'pkg')
+        assert all_nodes.call_count == 2
+
+    config_index = SelectorIndex(manifest)
+    assert config_index.config(['materialized'], 'view') == {
+        'model.pkg.view_model', 'model.ext.ext_model'}
+    # values that can't be hashed are compared one at a time
+    assert config_index.config(['materialized'], ['view']) == set()
+    assert config_index.config(['tags'], []) == {
+        unique_id for unique_id, node in manifest.nodes.items() if node.config.tags == []}
+
+
 def test_select_test_name(manifest):
     methods = MethodManager(manifest, None)
     method = methods.get_method('test_name', [])
@@ -735,10 +802,25 @@ def test_select_exposure(manifest):
         manifest, method, 'not_my_exposure')
 
 
-@pytest.fixture
-def previous_state(manifest):
+class DigestPreviousState(PreviousState):
+    """A previous state that compares with a digest of its manifest, built
+    each time it's used so tests can change the manifest first
+    """
+    @property
+    def digest(self):
+        if self._manifest is None:
+            return None
+        return StateDigest.from_manifest(self._manifest)
+
+    @digest.setter
+    def digest(self, value):
+        pass
+
+
+@pytest.fixture(params=[PreviousState, DigestPreviousState])
+def previous_state(request, manifest):
     writable = copy.deepcopy(manifest).writable_manifest()
-    state = PreviousState(Path('/path/does/not/exist'))
+    state = request.param(Path('/path/does/not/exist'))
     state.manifest = writable
     return state
 
@@ -989,3 +1071,21 @@ def test_select_state_changed_test_macro_sql(manifest, previous_state, macro_def
     assert search_manifest_using_method(
         manifest, method, 'modified.macros') == {'not_null_table_model_id'}
     assert not search_manifest_using_method(manifest, method, 'new')
+
+
+def test_select_state_changed_upstream_macro_sql(manifest, previous_state, macro_default_test_not_null):
+    # a model whose first macro is unchanged, and whose second macro calls a
+    # changed macro through another macro
+    outer = make_macro('pkg', 'outer', 'outer', depends_on_macros=['macro.dbt.test_not_null'])
+    manifest.macros[outer.unique_id] = outer
+    previous_state.manifest.macros[outer.unique_id] = outer
+    model = make_model('pkg', 'macro_model', 'select 1 as id')
+    model.depends_on.macros = ['macro.dbt.test_unique', outer.unique_id]
+    add_node(manifest, model)
+    manifest.macros[macro_default_test_not_null.unique_id] = macro_default_test_not_null.replace(macro_sql='lalala')
+    method = statemethod(manifest, previous_state)
+    assert search_manifest_using_method(
+        manifest, method, 'modified.macros') == {'not_null_table_model_id', 'macro_model'}
+    assert method.modified_macros == {
+        'macro.dbt.default__test_not_null', 'macro.dbt.test_not_null', 'macro.pkg.outer'
+    }
@@ -1,11 +1,16 @@
 from contextlib import contextmanager
+import os
 import pytest
+import tempfile
 import unittest
+from unittest import mock
 import yaml
 
 from dbt.clients.jinja import get_rendered
 from dbt.clients.jinja import get_template
+from dbt.clients.jinja import MACRO_NAMESPACE_KEY
 from dbt.clients.jinja import extract_toplevel_blocks
+from dbt.clients.jinja import CodeCache, MacroFuzzEnvironment, set_code_cache
 from dbt.exceptions import CompilationException, JinjaRenderingException
 
 
@@ -424,6 +429,111 @@ class TestJinja(unittest.TestCase):
         value = get_rendered(s, {}, native=True)
         assert value == '1991'
 
+    def test_macro_namespace_lookup(self):
+        ctx = {
+            MACRO_NAMESPACE_KEY: {'my_macro': 'from_namespace'},
+            'my_macro': 'from_context',
+            'other': 'from_context',
+        }
+        for native in (False, True):
+            # the namespace wins over the context dictionary
+            value = get_rendered('{{ my_macro }}', ctx, native=native)
+            assert value == 'from_namespace'
+            value = get_rendered('{{ other }}', ctx, native=native)
+            assert value == 'from_context'
+            # but not over variables set in the template
+            s = '{% set my_macro = "from_template" %}{{ my_macro }}'
+            value = get_rendered(s, ctx, native=native)
+            assert value == 'from_template'
+            value = get_rendered('{{ missing is defined }}', ctx, native=native)
+            assert value in ('False', False)
+
+    def test_code_cache(self):
+        s = '{% set x = [1, 2] %}{{ x | length }}'
+        parse = MacroFuzzEnvironment._parse
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(MacroFuzzEnvironment, '_parse', autospec=True, side_effect=parse) as mock_parse:
+            stale = os.path.join(directory, 'dbt0.0.1-cpython-00-jinja0.0')
+            os.makedirs(stale)
+            try:
+                set_code_cache(directory)
+                assert not os.path.exists(stale)
+                assert get_rendered(s, {}) == '2'
+                assert get_rendered(s, {}, native=True) == 2
+                # the text and native code differ, so they're cached separately
+                assert mock_parse.call_count == 2
+                # the same template is compiled once per process...
+                assert get_rendered(s, {}) == '2'
+                assert mock_parse.call_count == 2
+
+                # ...and loaded from disk in the next one
+                set_code_cache(None)
+                code_cache = set_code_cache(directory)
+                assert code_cache.memory == {}
+                assert get_rendered(s, {}) == '2'
+                assert get_rendered(s, {}, native=True) == 2
+                assert mock_parse.call_count == 2
+                assert len(code_cache.memory) == 2
+
+                # a corrupt file is compiled again
+                set_code_cache(None)
+                code_cache = set_code_cache(directory)
+                key = CodeCache.key(MacroFuzzEnvironment(), s, False)
+                with open(code_cache._file_path(key), 'wb') as fp:
+                    fp.write(b'not code')
+                assert get_rendered(s, {}) == '2'
+                assert mock_parse.call_count == 3
+
+                # templates with errors aren't cached
+                for _ in range(2):
+                    with self.assertRaises(CompilationException):
+                        get_template('{% if %}', {})
+                assert mock_parse.call_count == 5
+            finally:
+                set_code_cache(None)
+
+    def test_code_cache_prune(self):
+        templates = ['{{ 1 }}', '{{ 2 }}', '{{ 3 }}']
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                code_cache = set_code_cache(directory)
+                for idx, s in enumerate(templates):
+                    assert get_rendered(s, {}) == str(idx + 1)
+                paths = [
+                    code_cache._file_path(CodeCache.key(MacroFuzzEnvironment(), s, False))
+                    for s in templates
+                ]
+                for idx, path in enumerate(paths):
+                    os.utime(path, (1000 + idx, 1000 + idx))
+                size = sum(os.path.getsize(path) for path in paths)
+
+                # the first template is loaded in another invocation, so
+                # it's the most recently used
+                set_code_cache(None)
+                code_cache = set_code_cache(directory)
+                assert get_rendered(templates[0], {}) == '1'
+                assert os.path.getmtime(paths[0]) > 1002
+
+                # a cache under the limit is left alone
+                set_code_cache(None)
+                with mock.patch.object(CodeCache, 'max_size', size):
+                    set_code_cache(directory)
+                assert all(os.path.exists(path) for path in paths)
+
+                # over the limit, the least recently used files are removed
+                set_code_cache(None)
+                with mock.patch.object(CodeCache, 'max_size', size - 1):
+                    set_code_cache(directory)
+                assert [os.path.exists(path) for path in paths] == [True, False, True]
+
+                # without pruning, nothing is removed
+                set_code_cache(None)
+                with mock.patch.object(CodeCache, 'max_size', 0):
+                    set_code_cache(directory, prune=False)
+                assert os.path.exists(paths[0])
+            finally:
+                set_code_cache(None)
+
 
 class TestBlockLexer(unittest.TestCase):
     def test_basic(self):
@@ -9,6 +9,7 @@ try:
 except ImportError:
     from Queue import Empty
 
+from dbt.graph import CompactGraph
 from dbt.graph.selector import NodeSelector
 from dbt.graph.cli import parse_difference
 
@@ -63,9 +64,10 @@ class LinkerTest(unittest.TestCase):
         """test join() without timeout risk"""
         self.assertEqual(queue.inner.unfinished_tasks, 0)
 
-    def _get_graph_queue(self, manifest, include=None, exclude=None):
+    def _get_graph_queue(self, manifest, include=None, exclude=None,
+                         previous_state=None):
         graph = compilation.Graph(self.linker.graph)
-        selector = NodeSelector(graph, manifest)
+        selector = NodeSelector(graph, manifest, previous_state)
         spec = parse_difference(include, exclude)
         return selector.get_graph_queue(spec)
 
@@ -165,6 +167,71 @@ class LinkerTest(unittest.TestCase):
         queue_2.mark_done('A')
         self.assert_would_join(queue_2)
 
+    def test_linker_waits_for_all_parents(self):
+        actual_deps = [('B', 'A'), ('C', 'A'), ('D', 'B'), ('D', 'C')]
+
+        for (l, r) in actual_deps:
+            self.linker.dependency(l, r)
+
+        queue = self._get_graph_queue(_mock_manifest('ABCD'))
+        got = queue.get(block=False)
+        self.assertEqual(got.unique_id, 'A')
+        with self.assertRaises(Empty):
+            queue.get(block=False)
+        queue.mark_done('A')
+
+        first = queue.get(block=False)
+        second = queue.get(block=False)
+        self.assertEqual({first.unique_id, second.unique_id}, {'B', 'C'})
+        queue.mark_done(first.unique_id)
+        # D still has an unfinished parent
+        with self.assertRaises(Empty):
+            queue.get(block=False)
+        queue.mark_done(second.unique_id)
+
+        got = queue.get(block=False)
+        self.assertEqual(got.unique_id, 'D')
+        self.assertTrue(queue.empty())
+        queue.mark_done('D')
+        self.assert_would_join(queue)
+
+    def test_linker_critical_path(self):
+        # X is a slow leaf, A -> B -> C is a chain of medium nodes, and Z is
+        # a fast leaf. By depth, all of X, A and Z are tied.
+        actual_deps = [('B', 'A'), ('C', 'B')]
+
+        for (l, r) in actual_deps:
+            self.linker.dependency(l, r)
+        self.linker.add_node('X')
+        self.linker.add_node('Z')
+
+        results = [
+            mock.MagicMock(unique_id=n, execution_time=t)
+            for n, t in [('A', 2.0), ('B', 2.0), ('C', 2.0), ('X', 5.0), ('Z', 0.5)]
+        ]
+        previous_state = mock.MagicMock(
+            results=mock.MagicMock(results=results)
+        )
+
+        with mock.patch('dbt.flags.CRITICAL_PATH', True):
+            queue = self._get_graph_queue(
+                _mock_manifest('ABCXZ'), previous_state=previous_state
+            )
+        order = [queue.get(block=False).unique_id for _ in range(3)]
+        self.assertEqual(order, ['A', 'X', 'Z'])
+
+    def test_linker_critical_path_without_state(self):
+        # with no previous results, the longest chain goes first
+        actual_deps = [('B', 'A'), ('C', 'B'), ('Y', 'X')]
+
+        for (l, r) in actual_deps:
+            self.linker.dependency(l, r)
+
+        with mock.patch('dbt.flags.CRITICAL_PATH', True):
+            queue = self._get_graph_queue(_mock_manifest('ABCXY'))
+        order = [queue.get(block=False).unique_id for _ in range(2)]
+        self.assertEqual(order, ['A', 'X'])
+
     def test__find_cycles__cycles(self):
         actual_deps = [('A', 'B'), ('B', 'C'), ('C', 'A')]
 
@@ -179,4 +246,13 @@ class LinkerTest(unittest.TestCase):
         for (l, r) in actual_deps:
             self.linker.dependency(l, r)
 
-        self.assertIsNone(self.linker.find_cycles())
\ No newline at end of file
+        self.assertIsNone(self.linker.find_cycles())
+
+
+class CompactLinkerTest(LinkerTest):
+    def _get_graph_queue(self, manifest, include=None, exclude=None,
+                         previous_state=None):
+        graph = CompactGraph.from_networkx(self.linker.graph)
+        selector = NodeSelector(graph, manifest, previous_state)
+        spec = parse_difference(include, exclude)
+        return selector.get_graph_queue(spec)
@@ -1,10 +1,13 @@
+import json
 import os
+import tempfile
 import unittest
 from unittest import mock
 
 import copy
 from collections import namedtuple
 from itertools import product
+from pathlib import Path
 from datetime import datetime
 
 import pytest
@@ -13,7 +16,9 @@ import dbt.flags
 import dbt.version
 from dbt import tracking
 from dbt.contracts.files import FileHash
-from dbt.contracts.graph.manifest import Manifest, ManifestMetadata
+from dbt.contracts.graph.manifest import (
+    LazyNodeDicts, Manifest, ManifestMetadata, ParsingInfo
+)
 from dbt.contracts.graph.parsed import (
     ParsedModelNode,
     DependsOn,
@@ -30,6 +35,14 @@ from dbt.contracts.graph.unparsed import (
 )
 
 from dbt.contracts.graph.compiled import CompiledModelNode
+from dbt.contracts.graph.manifest import WritableManifest
+from dbt.contracts.results import (
+    RunResultsArtifact, RunResultOutput, RunStatus, TimingInfo
+)
+from dbt.contracts.graph.digest import StateDigest
+from dbt.contracts.state import PreviousState, STATE_DIGEST_FILE_NAME
+from dbt.clients.jinja import get_rendered
+from dbt.exceptions import RuntimeException
 from dbt.node_types import NodeType
 import freezegun
 
@@ -368,6 +381,57 @@ class ManifestTest(unittest.TestCase):
         for node in flat_nodes.values():
             self.assertEqual(frozenset(node), REQUIRED_PARSED_NODE_KEYS)
 
+    def test__build_flat_graph_lazily(self):
+        nodes = copy.copy(self.nested_nodes)
+        manifest = Manifest(nodes=nodes, sources=copy.copy(self.sources), macros={}, docs={},
+                            disabled={}, files={}, exposures=copy.copy(self.exposures), selectors={})
+        with mock.patch.object(ParsedModelNode, 'to_dict', autospec=True,
+                               side_effect=ParsedModelNode.to_dict) as to_dict:
+            manifest.build_flat_graph()
+            flat_nodes = manifest.flat_graph['nodes']
+            self.assertEqual(to_dict.call_count, 0)
+            self.assertIn('model.root.dep', flat_nodes)
+            self.assertNotIn('model.root.missing', flat_nodes)
+            self.assertEqual(len(flat_nodes), len(nodes))
+            self.assertEqual(to_dict.call_count, 0)
+            # built on first access, then reused
+            node = flat_nodes['model.root.dep']
+            self.assertEqual(node['unique_id'], 'model.root.dep')
+            self.assertIs(flat_nodes['model.root.dep'], node)
+            self.assertEqual(to_dict.call_count, 1)
+
+        # nodes replaced in the manifest later don't change the graph
+        manifest.nodes['model.root.dep'] = manifest.nodes['model.root.nested']
+        self.assertEqual(flat_nodes['model.root.dep']['unique_id'], 'model.root.dep')
+        with self.assertRaises(KeyError):
+            flat_nodes['model.root.missing']
+        with self.assertRaises(TypeError):
+            flat_nodes['model.root.dep'] = {}
+
+        rendered = get_rendered(
+            '{{ graph.nodes.values() | map(attribute="name") | sort | join(",") }}',
+            {'graph': manifest.flat_graph},
+        )
+        self.assertEqual(rendered, ','.join(sorted(n.name for n in self.nested_nodes.values())))
+
+        copied = copy.deepcopy(manifest)
+        self.assertEqual(
+            dict(copied.flat_graph['nodes']), dict(manifest.flat_graph['nodes'])
+        )
+
+    def test__lazy_node_dicts_equality(self):
+        node = self.nested_nodes['model.root.dep']
+        other = self.nested_nodes['model.root.nested']
+        self.assertNotEqual(
+            LazyNodeDicts({'model.root.dep': node}),
+            LazyNodeDicts({'model.root.nested': other}),
+        )
+        self.assertEqual(
+            LazyNodeDicts({'model.root.dep': node}),
+            LazyNodeDicts({'model.root.dep': node}),
+        )
+        self.assertEqual(ParsingInfo(), ParsingInfo())
+
     @mock.patch.object(tracking, 'active_user')
     def test_metadata(self, mock_user):
         mock_user.id = 'cfc9500f-dc7f-4c83-9ea7-2c581c1b38cf'
@@ -482,6 +546,152 @@ class ManifestTest(unittest.TestCase):
         resource_fqns = manifest.get_resource_fqns()
         self.assertEqual(resource_fqns, expect)
 
+    def test_write_artifacts(self):
+        nodes = copy.copy(self.nested_nodes)
+        disabled_node = copy.deepcopy(nodes['model.root.sibling'])
+        disabled_node.config.enabled = False
+        manifest = Manifest(nodes=nodes, sources=self.sources, macros={}, docs={},
+                            disabled={disabled_node.unique_id: [disabled_node]},
+                            files={}, exposures=self.exposures, selectors={})
+        writable = manifest.writable_manifest()
+        expected = writable.to_dict(omit_none=False)
+        results = RunResultsArtifact.from_execution_results(
+            results=[],
+            elapsed_time=1.5,
+            generated_at=datetime.utcnow(),
+            args={'which': 'run'},
+        )
+        results.results = [
+            RunResultOutput(
+                unique_id=unique_id,
+                status=RunStatus.Success,
+                timing=[TimingInfo(name='execute')],
+                thread_id='Thread-1',
+                execution_time=0.5,
+                adapter_response={},
+                message=None,
+                failures=None,
+            )
+            for unique_id in nodes
+        ]
+        expected_results = results.to_dict(omit_none=False)
+
+        compressions = ['none', 'gzip']
+        try:
+            import zstandard  # noqa
+            compressions.append('zstd')
+        except ImportError:
+            pass
+
+        for compression in compressions:
+            with tempfile.TemporaryDirectory() as state_dir:
+                manifest_path = os.path.join(state_dir, 'manifest.json')
+                results_path = os.path.join(state_dir, 'run_results.json')
+                with mock.patch.object(dbt.flags, 'ARTIFACT_COMPRESSION', compression):
+                    # a stale copy with another compression is removed
+                    with open(manifest_path + '.zst', 'w') as fp:
+                        fp.write('stale')
+                    writable.write(manifest_path)
+                    results.write(results_path)
+
+                suffix = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}[compression]
+                self.assertEqual(
+                    sorted(os.listdir(state_dir)),
+                    ['manifest.json' + suffix, 'run_results.json' + suffix]
+                )
+                if compression == 'none':
+                    # the same output as dumping the whole dictionary
+                    with open(manifest_path) as fp:
+                        self.assertEqual(
+                            fp.read(),
+                            json.dumps(expected, cls=dbt.utils.JSONEncoder)
+                        )
+
+                read = WritableManifest.read(manifest_path)
+                self.assertEqual(read.to_dict(omit_none=False), expected)
+                state = PreviousState(Path(state_dir))
+                self.assertEqual(state.manifest.to_dict(omit_none=False), expected)
+                self.assertEqual(state.results.to_dict(omit_none=False), expected_results)
+
+    def test_state_digest(self):
+        manifest = Manifest(nodes=copy.copy(self.nested_nodes), sources=self.sources,
+                            macros={}, docs={}, disabled={}, files={},
+                            exposures=self.exposures, selectors={})
+        digest = StateDigest.from_manifest(manifest)
+        self.assertEqual(
+            set(digest.nodes),
+            set(manifest.nodes) | set(manifest.sources) | set(manifest.exposures)
+        )
+        with tempfile.TemporaryDirectory() as state_dir:
+            manifest_path = os.path.join(state_dir, 'manifest.json')
+            digest_path = os.path.join(state_dir, STATE_DIGEST_FILE_NAME)
+            manifest.write(manifest_path)
+            digest.write(digest_path)
+
+            state = PreviousState(Path(state_dir))
+            self.assertTrue(state.has_manifest)
+            self.assertEqual(
+                state.digest.to_dict(omit_none=False), digest.to_dict(omit_none=False)
+            )
+            # the manifest is only read when it's used
+            self.assertIsNone(state._manifest)
+            self.assertEqual(set(state.manifest.nodes), set(manifest.nodes))
+
+            # a digest from another version of dbt is ignored
+            with mock.patch('dbt.contracts.state.dbt_version', '0.0.1'):
+                self.assertIsNone(PreviousState(Path(state_dir)).digest)
+
+            # so is one written with another manifest, whatever the mtimes
+            mtime = os.path.getmtime(digest_path)
+            other = copy.deepcopy(manifest)
+            other.metadata.invocation_id = 'fedcba98-7654-3210-fedc-ba9876543210'
+            other.write(manifest_path)
+            os.utime(manifest_path, (mtime - 10, mtime - 10))
+            state = PreviousState(Path(state_dir))
+            self.assertIsNone(state.digest)
+            self.assertTrue(state.has_manifest)
+
+            # and one next to a compressed manifest is checked the same way
+            os.remove(manifest_path)
+            with mock.patch.object(dbt.flags, 'ARTIFACT_COMPRESSION', 'gzip'):
+                manifest.write(manifest_path)
+            self.assertIsNotNone(PreviousState(Path(state_dir)).digest)
+            with mock.patch.object(dbt.flags, 'ARTIFACT_COMPRESSION', 'gzip'):
+                other.write(manifest_path)
+            self.assertIsNone(PreviousState(Path(state_dir)).digest)
+
+    def test_state_digest_large_manifest(self):
+        nodes = copy.deepcopy(self.nested_nodes)
+        # the metadata is found however big the rest of the manifest is
+        nodes['model.root.events'].raw_sql = 'select 1\n' + '-- padding\n' * 20000
+        manifest = Manifest(nodes=nodes, sources=self.sources,
+                            macros={}, docs={}, disabled={}, files={},
+                            exposures=self.exposures, selectors={})
+        with tempfile.TemporaryDirectory() as state_dir:
+            manifest_path = os.path.join(state_dir, 'manifest.json')
+            digest_path = os.path.join(state_dir, STATE_DIGEST_FILE_NAME)
+            StateDigest.from_manifest(manifest).write(digest_path)
+            for compression in ('none', 'gzip'):
+                with mock.patch.object(dbt.flags, 'ARTIFACT_COMPRESSION', compression):
+                    manifest.write(manifest_path)
+                if compression == 'none':
+                    self.assertGreater(os.path.getsize(manifest_path), 200000)
+
+                with mock.patch.object(WritableManifest, 'read') as read:
+                    state = PreviousState(Path(state_dir))
+                    self.assertIsNotNone(state.digest)
+                    read.assert_not_called()
+
+    def test_state_results_read_lazily(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            results_path = os.path.join(state_dir, 'run_results.json')
+            with open(results_path, 'w') as fp:
+                fp.write('not json')
+            # only --critical-path reads the run results
+            state = PreviousState(Path(state_dir))
+            with self.assertRaises(RuntimeException):
+                state.results
+
 
 class MixedManifestTest(unittest.TestCase):
     def setUp(self):
@@ -886,6 +1096,26 @@ def test_find_macro_by_name(macros, expectations):
             assert result.package_name == expected
 
 
+def test_find_macro_by_name_after_add_and_remove():
+    manifest = make_manifest(macros=[MockMacro('dep')])
+    source_file = mock.MagicMock(macros=[])
+    # build the index before changing the macros
+    assert manifest.find_macro_by_name('my_macro', 'root', None).package_name == 'dep'
+
+    manifest.add_macro(source_file, MockMacro('root'))
+    manifest.add_macro(source_file, MockMacro('root', name='other_macro'))
+    assert manifest.find_macro_by_name('my_macro', 'root', None).package_name == 'root'
+    assert manifest.find_macro_by_name('other_macro', 'root', None).package_name == 'root'
+
+    removed = manifest.remove_macro('macro.root.my_macro')
+    assert removed.unique_id == 'macro.root.my_macro'
+    assert 'macro.root.my_macro' not in manifest.macros
+    assert manifest.find_macro_by_name('my_macro', 'root', None).package_name == 'dep'
+    manifest.remove_macro('macro.root.other_macro')
+    assert manifest.find_macro_by_name('other_macro', 'root', None) is None
+    assert 'other_macro' not in manifest.macros_by_name
+
+
 # these don't use a search package, so we don't need to do as much
 generate_name_parameter_sets = [
     # empty
@@ -16,6 +16,7 @@ from dbt.parser import (
 from dbt.parser.schemas import (
     TestablePatchParser, SourceParser, AnalysisPatchParser, MacroPatchParser
 )
+from dbt.parser.parallel import ParallelParser, _parse_file
 from dbt.parser.search import FileBlock
 from dbt.parser.generic_test_builders import YamlBlock
 from dbt.parser.sources import SourcePatcher
@@ -33,6 +34,7 @@ from dbt.contracts.graph.parsed import (
 )
 from dbt.contracts.graph.unparsed import Docs
 import itertools
+from copy import deepcopy
 from .utils import config_from_parts_or_dicts, normalize, generate_name_macros, MockNode, MockSource, MockDocumentation
 
 
@@ -520,6 +522,43 @@ class ModelParserTest(BaseParserTest):
         with self.assertRaises(CompilationException):
             self.parser.parse_file(block)
 
+    def test_parallel_parse_merge(self):
+        blocks = [
+            self.file_block_for('select 1 as id', 'model_1.sql'),
+            self.file_block_for('{{ config(enabled=false) }}select 2 as id', 'model_2.sql'),
+        ]
+        # parse copies of the files against a separate manifest, like a
+        # worker process would
+        worker_manifest = Manifest(macros=dict(self.manifest.macros))
+        worker_parser = ModelParser(
+            project=self.snowplow_project_config,
+            manifest=worker_manifest,
+            root_project=self.root_project_config,
+        )
+        results = [
+            _parse_file(worker_parser, worker_manifest, deepcopy(block.file))
+            for block in blocks
+        ]
+        self.assertEqual([len(r.nodes) for r in results], [1, 1])
+        self.assertEqual([r.nodes[0][0] for r in results], [True, False])
+
+        parallel_parser = ParallelParser(
+            self.root_project_config, self.all_projects, self.manifest,
+            max_workers=1,
+        )
+        try:
+            for block, result in zip(blocks, results):
+                self.manifest.files[block.file.file_id] = block.file
+                parallel_parser._merge(result)
+        finally:
+            parallel_parser.shutdown()
+
+        self.assert_has_manifest_lengths(self.manifest, nodes=1, disabled=1)
+        self.assertIn('model.snowplow.model_1', self.manifest.nodes)
+        self.assertIn('model.snowplow.model_2', self.manifest.disabled)
+        self.assertEqual(blocks[0].file.nodes, ['model.snowplow.model_1'])
+        self.assertEqual(blocks[1].file.nodes, ['model.snowplow.model_2'])
+
 
 class StaticModelParserTest(BaseParserTest):
     def setUp(self):
@@ -1,6 +1,10 @@
 import agate
 import decimal
+import os
+import pytz
+import tempfile
 import unittest
+from datetime import datetime
 from unittest import mock
 
 import dbt.flags as flags
@@ -80,6 +84,66 @@ class TestPostgresAdapter(unittest.TestCase):
         self.assertNotEqual(connection.handle, None)
         psycopg2.connect.assert_called_once()
 
+    @mock.patch('dbt.adapters.postgres.connections.psycopg2')
+    def test_release_closes_connection(self, psycopg2):
+        connection = self.adapter.acquire_connection('first')
+        connection.handle
+        self.adapter.release_connection()
+        self.assertEqual(connection.state, 'closed')
+        psycopg2.connect.return_value.close.assert_called_once()
+
+        connection = self.adapter.acquire_connection('second')
+        connection.handle
+        self.assertEqual(psycopg2.connect.call_count, 2)
+
+    @mock.patch('dbt.adapters.postgres.connections.psycopg2')
+    def test_reuse_connections(self, psycopg2):
+        self.config.credentials = self.config.credentials.replace(reuse_connections=True)
+        handle = psycopg2.connect.return_value
+        handle.closed = 0
+
+        connection = self.adapter.acquire_connection('first')
+        connection.handle
+        self.adapter.release_connection()
+        self.assertEqual(connection.state, 'closed')
+        handle.close.assert_not_called()
+
+        connection = self.adapter.acquire_connection('second')
+        self.assertIs(connection.handle, handle)
+        self.assertEqual(connection.state, 'open')
+        psycopg2.connect.assert_called_once()
+        # the pooled handle was rolled back and probed before reuse
+        handle.rollback.assert_called()
+        handle.cursor.return_value.execute.assert_called_with('select 1')
+        self.assertEqual(self.adapter.connections.pool_hits, 1)
+        self.assertEqual(self.adapter.connections.pool_misses, 1)
+
+        self.adapter.release_connection()
+        # the pool isn't keyed by anything that contains the password
+        password = self.config.credentials.password
+        self.assertTrue(self.adapter.connections.connection_pool)
+        for key in self.adapter.connections.connection_pool:
+            self.assertNotIn(password, key)
+        self.adapter.cleanup_connections()
+        handle.close.assert_called_once()
+
+    @mock.patch('dbt.adapters.postgres.connections.psycopg2')
+    def test_reuse_connections_discards_dead_handles(self, psycopg2):
+        self.config.credentials = self.config.credentials.replace(reuse_connections=True)
+        dead_handle = mock.MagicMock(closed=0)
+        new_handle = mock.MagicMock(closed=0)
+        psycopg2.connect.side_effect = [dead_handle, new_handle]
+
+        connection = self.adapter.acquire_connection('first')
+        connection.handle
+        self.adapter.release_connection()
+        dead_handle.closed = 1
+
+        connection = self.adapter.acquire_connection('second')
+        self.assertIs(connection.handle, new_handle)
+        self.assertEqual(psycopg2.connect.call_count, 2)
+        self.assertEqual(self.adapter.connections.pool_hits, 0)
+
     def test_cancel_open_connections_empty(self):
         self.assertEqual(len(list(self.adapter.cancel_open_connections())), 0)
 
@@ -460,6 +524,51 @@ class TestConnectingPostgresAdapter(unittest.TestCase):
             mock.call('/* dbt */\nalter table "postgres"."test_schema".table_a rename to table_b', None)
         ])
 
+    def test_calculate_freshness_batch(self):
+        relations = [
+            self.adapter.Relation.create(
+                database='postgres',
+                schema='test_schema',
+                identifier=identifier,
+                type='table',
+                quote_policy=self.adapter.config.quoting,
+            )
+            for identifier in ('table_a', 'table_b')
+        ]
+        self.cursor.description = [
+            ('max_loaded_at_0',), ('max_loaded_at_1',), ('snapshotted_at',)
+        ]
+        self.cursor.fetchall.return_value = [
+            (datetime(2021, 10, 1, 11), None, datetime(2021, 10, 1, 12)),
+        ]
+        freshnesses = self.adapter.calculate_freshness_batch([
+            (relations[0], 'loaded_at', None),
+            (relations[1], 'updated_at', "kind = 'b'"),
+        ])
+
+        sql = self.mock_execute.call_args[0][0]
+        self.assertEqual(
+            ' '.join(sql.split()),
+            '/* dbt */ select '
+            '( select max(loaded_at) from "postgres"."test_schema".table_a ) as max_loaded_at_0, '
+            '( select max(updated_at) from "postgres"."test_schema".table_b '
+            "where kind = 'b' ) as max_loaded_at_1, "
+            'now() as snapshotted_at'
+        )
+        snapshotted_at = datetime(2021, 10, 1, 12, tzinfo=pytz.UTC)
+        self.assertEqual(freshnesses, [
+            {
+                'max_loaded_at': datetime(2021, 10, 1, 11, tzinfo=pytz.UTC),
+                'snapshotted_at': snapshotted_at,
+                'age': 3600,
+            },
+            {
+                'max_loaded_at': datetime(1, 1, 1, tzinfo=pytz.UTC),
+                'snapshotted_at': snapshotted_at,
+                'age': (snapshotted_at - datetime(1, 1, 1, tzinfo=pytz.UTC)).total_seconds(),
+            },
+        ])
+
     def test_debug_connection_ok(self):
         DebugTask.validate_connection(self.target_dict)
         self.mock_execute.assert_has_calls([
@@ -505,6 +614,275 @@ class TestConnectingPostgresAdapter(unittest.TestCase):
         self.adapter.verify_database('postgres')
 
 
+class TestPostgresRelationsCacheTTL(unittest.TestCase):
+    def setUp(self):
+        project_cfg = {
+            'name': 'X',
+            'version': '0.1',
+            'profile': 'test',
+            'project-root': '/tmp/dbt/does-not-exist',
+            'config-version': 2,
+        }
+        profile_cfg = {
+            'outputs': {
+                'test': {
+                    'type': 'postgres',
+                    'dbname': 'postgres',
+                    'user': 'root',
+                    'host': 'thishostshouldnotexist',
+                    'pass': 'password',
+                    'port': 5432,
+                    'schema': 'public',
+                }
+            },
+            'target': 'test'
+        }
+        self.config = config_from_parts_or_dicts(project_cfg, profile_cfg)
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.config.target_path = self.tempdir.name
+        flags.RELATIONS_CACHE_TTL = 3600
+
+        self.schemas = {
+            schema: PostgresAdapter.Relation.create(database='postgres', schema=schema)
+            for schema in ('model_a', 'model_b')
+        }
+        # the relations in the database
+        self.database = {
+            'model_a': ['table_a', 'view_a'],
+            'model_b': ['table_b'],
+        }
+        self.now = 1000
+
+    def tearDown(self):
+        flags.RELATIONS_CACHE_TTL = 0
+        self.tempdir.cleanup()
+
+    def _list_relations(self, schema_relation):
+        return [
+            PostgresAdapter.Relation.create(
+                database='postgres', schema=schema_relation.schema,
+                identifier=identifier, type='table',
+            )
+            for identifier in self.database[schema_relation.schema]
+        ]
+
+    def invocation(self, required_schemas=None):
+        """Populate the relations cache of a new adapter, like a new dbt
+        invocation would. Return the adapter and the schemas it listed.
+        """
+        adapter = PostgresAdapter(self.config)
+        patches = [
+            mock.patch.object(
+                adapter, '_get_cache_schemas', return_value=set(self.schemas.values())
+            ),
+            mock.patch.object(adapter, '_link_cached_database_relations'),
+            mock.patch('dbt.adapters.cache.time.time', return_value=self.now),
+            mock.patch('dbt.adapters.base.impl.time.time', return_value=self.now),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        with mock.patch.object(
+            adapter, 'list_relations_without_caching', side_effect=self._list_relations
+        ) as list_relations:
+            adapter.set_relations_cache(
+                mock.MagicMock(), required_schemas=required_schemas
+            )
+        listed = sorted(call[0][0].schema for call in list_relations.call_args_list)
+        return adapter, listed
+
+    def cached(self, adapter, schema):
+        return sorted(r.identifier for r in adapter.cache.get_relations('postgres', schema))
+
+    def test_disabled(self):
+        flags.RELATIONS_CACHE_TTL = 0
+        adapter, listed = self.invocation([self.schemas['model_a']])
+        self.assertEqual(listed, ['model_a', 'model_b'])
+        adapter.persist_relations_cache([])
+        self.assertEqual(os.listdir(self.tempdir.name), [])
+
+    def test_saved_relations(self):
+        adapter, listed = self.invocation()
+        self.assertEqual(listed, ['model_a', 'model_b'])
+        adapter.cache_dropped(adapter.Relation.create(
+            database='postgres', schema='model_a', identifier='view_a'
+        ))
+        adapter.cache_added(adapter.Relation.create(
+            database='postgres', schema='model_a', identifier='view_c', type='view'
+        ))
+        adapter.persist_relations_cache([])
+        self.database['model_a'] = ['table_a', 'view_c']
+
+        self.now += 60
+        adapter, listed = self.invocation([self.schemas['model_a']])
+        self.assertEqual(listed, [])
+        self.assertEqual(self.cached(adapter, 'model_a'), ['table_a', 'view_c'])
+        self.assertEqual(self.cached(adapter, 'model_b'), ['table_b'])
+        relation = adapter.cache.get_relations('postgres', 'model_a')[1]
+        self.assertEqual(relation.type, 'view')
+        self.assertEqual(relation.quote_policy, adapter.Relation.get_default_quote_policy())
+        adapter._link_cached_database_relations.assert_called_once_with(
+            {'model_a', 'model_b'}, frozenset()
+        )
+        adapter.persist_relations_cache([])
+
+        # saving again keeps the time each schema was listed
+        self.now += 3550
+        adapter, listed = self.invocation([self.schemas['model_a']])
+        self.assertEqual(listed, ['model_a'])
+        # model_b expired and isn't required, so it's listed when needed
+        self.assertNotIn(('postgres', 'model_b'), adapter.cache)
+        adapter._link_cached_database_relations.assert_called_once_with(
+            {'model_a'}, frozenset({'model_b'})
+        )
+
+    def test_invalidated(self):
+        adapter, _ = self.invocation()
+        adapter.persist_relations_cache([self.schemas['model_b']])
+        adapter, listed = self.invocation()
+        self.assertEqual(listed, ['model_b'])
+
+        # a schema that changed but wasn't cached is removed
+        adapter.persist_relations_cache([])
+        adapter, _ = self.invocation([])
+        adapter.cache.drop_schema('postgres', 'model_a')
+        adapter.persist_relations_cache([])
+        adapter, listed = self.invocation()
+        self.assertEqual(listed, ['model_a'])
+
+    def test_unfinished(self):
+        adapter, _ = self.invocation()
+        adapter.persist_relations_cache([])
+        adapter, listed = self.invocation()
+        self.assertEqual(listed, [])
+        adapter.persist_relations_cache(None)
+        adapter, listed = self.invocation()
+        self.assertEqual(listed, ['model_a', 'model_b'])
+
+    def test_other_target(self):
+        adapter, _ = self.invocation()
+        adapter.persist_relations_cache([])
+        self.config.credentials.schema = 'other'
+        adapter, listed = self.invocation()
+        self.assertEqual(listed, ['model_a', 'model_b'])
+
+    @mock.patch.object(PostgresAdapter, 'execute_macro')
+    def test_link_uncached_schemas(self, mock_execute):
+        adapter = PostgresAdapter(self.config)
+        adapter.cache.add(adapter.Relation.create(
+            database='postgres', schema='model_a', identifier='table_a', type='table'
+        ))
+        mock_execute.return_value = [
+            ('model_a', 'view_a', 'model_a', 'table_a'),
+            ('model_b', 'view_b', 'model_a', 'table_a'),
+        ]
+        adapter._link_cached_database_relations({'model_a'}, frozenset({'model_b'}))
+        self.assertEqual(
+            adapter.cache.dump_graph(),
+            {'postgres.model_a.table_a': ['postgres.model_a.view_a'],
+             'postgres.model_a.view_a': []},
+        )
+        self.assertNotIn(('postgres', 'model_b'), adapter.cache)
+
+
+class TestPostgresColumnsCache(unittest.TestCase):
+    def setUp(self):
+        project_cfg = {
+            'name': 'X',
+            'version': '0.1',
+            'profile': 'test',
+            'project-root': '/tmp/dbt/does-not-exist',
+            'config-version': 2,
+        }
+        profile_cfg = {
+            'outputs': {
+                'test': {
+                    'type': 'postgres',
+                    'dbname': 'postgres',
+                    'user': 'root',
+                    'host': 'thishostshouldnotexist',
+                    'pass': 'password',
+                    'port': 5432,
+                    'schema': 'public',
+                }
+            },
+            'target': 'test'
+        }
+        self.adapter = PostgresAdapter(config_from_parts_or_dicts(project_cfg, profile_cfg))
+        self.relations = {}
+        for identifier in ('table_a', 'table_b', 'table_c'):
+            self.relations[identifier] = self.adapter.Relation.create(
+                database='postgres', schema='analytics', identifier=identifier, type='table'
+            )
+            self.adapter.cache.add(self.relations[identifier])
+        self.adapter.cache.add_schema('postgres', 'analytics')
+        self.schema_table = agate.Table(
+            [(identifier, 'id', 'integer', None, 32, 0) for identifier in self.relations],
+            column_names=[
+                'table_name', 'column_name', 'data_type', 'character_maximum_length',
+                'numeric_precision', 'numeric_scale',
+            ],
+        )
+        patcher = mock.patch.object(self.adapter, 'execute_macro', side_effect=self._execute_macro)
+        self.execute_macro = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _execute_macro(self, macro_name, kwargs):
+        if macro_name == 'get_columns_in_schema':
+            return self.schema_table
+        return [self.adapter.Column('id', 'integer', None, 32, 0)]
+
+    def get_columns(self, identifier):
+        self.execute_macro.reset_mock()
+        columns = self.adapter.get_columns_in_relation(self.relations[identifier])
+        self.assertEqual([(c.name, c.dtype) for c in columns], [('id', 'integer')])
+        return [call[0][0] for call in self.execute_macro.call_args_list]
+
+    def test_cached(self):
+        self.assertEqual(self.get_columns('table_a'), ['get_columns_in_relation'])
+        self.assertEqual(self.get_columns('table_a'), [])
+        # the second miss in the schema lists the columns of all its relations
+        self.assertEqual(self.get_columns('table_b'), ['get_columns_in_schema'])
+        self.assertEqual(self.get_columns('table_c'), [])
+
+        self.adapter.cache_columns_altered(self.relations['table_c'])
+        self.assertEqual(self.get_columns('table_c'), ['get_columns_in_relation'])
+        self.adapter.cache_renamed(self.relations['table_a'], self.relations['table_a'].incorporate(
+            path={'identifier': 'table_d'}
+        ))
+        self.assertEqual(self.get_columns('table_b'), [])
+        # the schema is only listed once
+        self.assertEqual(self.get_columns('table_a'), ['get_columns_in_relation'])
+        self.assertEqual(self.get_columns('table_a'), ['get_columns_in_relation'])
+
+    def test_not_cached(self):
+        self.adapter.cache_dropped(self.relations['table_b'])
+        self.adapter.cache_columns_altered(self.relations['table_a'])
+        self.assertEqual(self.get_columns('table_b'), ['get_columns_in_relation'])
+        # table_b isn't cached and table_a changed during the run, so only the
+        # columns of table_c are kept from the schema
+        self.assertEqual(
+            self.get_columns('table_b'), ['get_columns_in_schema', 'get_columns_in_relation']
+        )
+        self.assertEqual(self.get_columns('table_c'), [])
+        self.assertEqual(self.get_columns('table_a'), ['get_columns_in_relation'])
+        self.assertEqual(self.get_columns('table_a'), [])
+
+    def test_schema_columns_not_implemented(self):
+        self.schema_table = None
+        self.assertEqual(self.get_columns('table_a'), ['get_columns_in_relation'])
+        self.assertEqual(
+            self.get_columns('table_c'), ['get_columns_in_schema', 'get_columns_in_relation']
+        )
+        self.assertEqual(self.get_columns('table_c'), [])
+
+    def test_big_schema(self):
+        with mock.patch('dbt.adapters.base.impl.COLUMNS_CACHE_MAX_SCHEMA_RELATIONS', 2):
+            self.assertEqual(self.get_columns('table_a'), ['get_columns_in_relation'])
+            self.assertEqual(self.get_columns('table_b'), ['get_columns_in_relation'])
+            self.assertEqual(self.get_columns('table_b'), [])
+
+
 class TestPostgresFilterCatalog(unittest.TestCase):
     def test__catalog_filter_table(self):
         manifest = mock.MagicMock()
@@ -0,0 +1,124 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from dbt import flags
+from dbt.contracts.files import BaseSourceFile
+from dbt.parser import read_files as read_files_module
+from dbt.parser.read_files import read_files
+
+
+class ReadFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.project_root = self.tempdir.name
+        for directory in ('models', 'macros', 'seeds', 'docs'):
+            os.mkdir(os.path.join(self.project_root, directory))
+        for i in range(50):
+            self._write(f'models/model_{i}.sql', f'select {i} as id')
+        self._write('models/schema.yml', 'version: 2\nmodels:\n  - name: model_1\n')
+        self._write('models/empty.yml', '# nothing here\n')
+        self._write('macros/macro.sql', '{% macro m() %}1{% endmacro %}')
+        self._write('seeds/seed.csv', 'a,b\n1,2\n')
+        self._write('docs/docs.md', '{% docs d %}doc{% enddocs %}')
+
+        self.project = mock.MagicMock(
+            project_name='root',
+            project_root=self.project_root,
+            macro_paths=['macros'],
+            model_paths=['models'],
+            snapshot_paths=[],
+            analysis_paths=[],
+            test_paths=[],
+            seed_paths=['seeds'],
+            docs_paths=['docs'],
+            all_source_paths=['models'],
+        )
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def _write(self, path, contents):
+        with open(os.path.join(self.project_root, path), 'w') as fp:
+            fp.write(contents)
+
+    def _read_files(self, executor=None, saved_files=None):
+        files, parser_files = {}, {}
+        read_files(self.project, files, parser_files, saved_files or {}, executor)
+        return files, parser_files['root']
+
+    def _round_trip(self, files):
+        # like saving to and loading from partial_parse.msgpack
+        return {
+            file_id: BaseSourceFile._deserialize(source_file._serialize())
+            for file_id, source_file in files.items()
+        }
+
+    def test_read_files_with_executor(self):
+        files, parser_files = self._read_files()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            threaded_files, threaded_parser_files = self._read_files(executor)
+
+        self.assertEqual(list(threaded_files), list(files))
+        self.assertEqual(threaded_parser_files, parser_files)
+        for file_id, source_file in files.items():
+            threaded_file = threaded_files[file_id]
+            self.assertEqual(threaded_file.checksum, source_file.checksum)
+            self.assertEqual(threaded_file.contents, source_file.contents)
+            self.assertEqual(threaded_file.parse_file_type, source_file.parse_file_type)
+
+        self.assertEqual(len(parser_files['ModelParser']), 50)
+        # schema files without any yaml are skipped
+        self.assertEqual(parser_files['SchemaParser'], ['root://models/schema.yml'])
+        self.assertEqual(
+            files['root://models/schema.yml'].dfy,
+            {'version': 2, 'models': [{'name': 'model_1'}]}
+        )
+
+    def test_unchanged_files_are_not_read(self):
+        files, parser_files = self._read_files()
+        saved_files = self._round_trip(files)
+        # schema files don't keep their contents, other files do
+        self.assertIsNone(saved_files['root://models/schema.yml'].contents)
+        self.assertEqual(saved_files['root://models/model_1.sql'].contents, 'select 1 as id')
+
+        self._write('models/model_2.sql', 'select 2 as changed_id')
+        load_file_contents = read_files_module.load_file_contents
+        with mock.patch.object(read_files_module, 'load_file_contents') as patched:
+            patched.side_effect = load_file_contents
+            new_files, new_parser_files = self._read_files(saved_files=saved_files)
+
+        # only the changed file was read again, and the schema file without
+        # any yaml, which isn't kept
+        self.assertEqual(
+            sorted(call[0][0] for call in patched.call_args_list),
+            [os.path.join(self.project_root, 'models', name)
+             for name in ('empty.yml', 'model_2.sql')]
+        )
+        self.assertEqual(new_parser_files, parser_files)
+        for file_id, source_file in files.items():
+            new_file = new_files[file_id]
+            if file_id == 'root://models/model_2.sql':
+                self.assertNotEqual(new_file.checksum, source_file.checksum)
+                self.assertEqual(new_file.contents, 'select 2 as changed_id')
+            else:
+                self.assertEqual(new_file.checksum, source_file.checksum)
+        self.assertEqual(
+            new_files['root://models/schema.yml'].dfy,
+            files['root://models/schema.yml'].dfy,
+        )
+
+    def test_paranoid_hashing(self):
+        files, _ = self._read_files()
+        saved_files = self._round_trip(files)
+        load_file_contents = read_files_module.load_file_contents
+        with mock.patch.object(flags, 'PARANOID_HASHING', True), \
+                mock.patch.object(read_files_module, 'load_file_contents') as patched:
+            patched.side_effect = load_file_contents
+            new_files, _ = self._read_files(saved_files=saved_files)
+        # every file is read, including the schema file without any yaml
+        self.assertEqual(patched.call_count, len(files) + 1)
+        for file_id, source_file in files.items():
+            self.assertEqual(new_files[file_id].checksum, source_file.checksum)
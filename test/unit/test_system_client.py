@@ -48,6 +48,22 @@ class SystemClient(unittest.TestCase):
         self.assertTrue(written)
         self.assertEqual(self.get_profile_text(), 'NEW_TEXT')
 
+    def test__write_compressed_failure_keeps_file(self):
+        self.set_up_profile()
+
+        def chunks():
+            yield 'NEW_'
+            raise ValueError('interrupted')
+
+        with self.assertRaises(ValueError):
+            dbt.clients.system.write_compressed(self.profiles_path, chunks())
+        self.assertEqual(self.get_profile_text(), 'ORIGINAL_TEXT')
+        self.assertEqual(os.listdir(self.tmp_dir), ['profiles.yml'])
+
+        written = dbt.clients.system.write_compressed(self.profiles_path, ['NEW_', 'TEXT'])
+        self.assertEqual(written, self.profiles_path)
+        self.assertEqual(self.get_profile_text(), 'NEW_TEXT')
+
 
 class TestRunCmd(unittest.TestCase):
     """Test `run_cmd`.
@@ -155,6 +171,8 @@ class TestFindMatching(unittest.TestCase):
                 'absolute_path': named_file.name,
                 'relative_path': os.path.basename(named_file.name),
                 'modification_time': out[0]['modification_time'],
+                'file_size': 0,
+                'inode': os.stat(named_file.name).st_ino,
             }]
             self.assertEqual(out, expected_output)
 
@@ -170,6 +188,8 @@ class TestFindMatching(unittest.TestCase):
                 'absolute_path': named_file.name,
                 'relative_path': os.path.basename(named_file.name),
                 'modification_time': out[0]['modification_time'],
+                'file_size': 0,
+                'inode': os.stat(named_file.name).st_ino,
             }]
             self.assertEqual(out, expected_output)
 
@@ -0,0 +1,164 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytz
+
+import dbt.exceptions
+from dbt.contracts.graph.unparsed import FreshnessThreshold, Time, TimePeriod
+from dbt.contracts.results import FreshnessStatus
+from dbt.task.freshness import (
+    FreshnessBatchRunner, FreshnessRunner, FreshnessTask
+)
+
+
+def make_source(name):
+    node = mock.MagicMock()
+    node.name = name
+    node.unique_id = f'source.root.raw.{name}'
+    node.is_ephemeral_model = False
+    node.loaded_at_field = 'loaded_at'
+    node.freshness = FreshnessThreshold(
+        warn_after=Time(count=1, period=TimePeriod.hour),
+        error_after=Time(count=2, period=TimePeriod.hour),
+        filter=f'{name}_id > 1',
+    )
+    return node
+
+
+def make_freshness(hours):
+    snapshotted_at = datetime(2021, 10, 1, 12, tzinfo=pytz.UTC)
+    return {
+        'max_loaded_at': snapshotted_at - timedelta(hours=hours),
+        'snapshotted_at': snapshotted_at,
+        'age': hours * 3600,
+    }
+
+
+class FreshnessBatchRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self.adapter = mock.MagicMock()
+        self.adapter.Relation.create_from_source.side_effect = lambda node: node.name
+        self.nodes = [make_source('a'), make_source('b'), make_source('c')]
+        self.runners = []
+        for idx, node in enumerate(self.nodes):
+            runner = FreshnessRunner(None, self.adapter, node, idx + 1, len(self.nodes))
+            runner.compile = mock.MagicMock(return_value=node)
+            self.runners.append(runner)
+
+    def test_batch(self):
+        self.adapter.calculate_freshness_batch.return_value = [
+            make_freshness(0), make_freshness(1.5), make_freshness(3),
+        ]
+        results, rerun = FreshnessBatchRunner(self.adapter, self.runners).run(manifest=None)
+
+        self.assertEqual(rerun, [])
+        self.adapter.calculate_freshness_batch.assert_called_once_with(
+            [
+                ('a', 'loaded_at', 'a_id > 1'),
+                ('b', 'loaded_at', 'b_id > 1'),
+                ('c', 'loaded_at', 'c_id > 1'),
+            ],
+            manifest=None,
+        )
+        self.adapter.calculate_freshness.assert_not_called()
+        self.assertEqual([r.node for r in results], self.nodes)
+        self.assertEqual(
+            [r.status for r in results],
+            [FreshnessStatus.Pass, FreshnessStatus.Warn, FreshnessStatus.Error],
+        )
+        self.assertEqual([r.age for r in results], [0, 5400, 10800])
+        self.adapter.release_connection.assert_called_once_with()
+
+    def test_fallback(self):
+        self.adapter.calculate_freshness_batch.side_effect = dbt.exceptions.DatabaseException(
+            'relation "b" does not exist'
+        )
+
+        def calculate_freshness(relation, loaded_at_field, filter, manifest):
+            if relation == 'b':
+                raise dbt.exceptions.DatabaseException('relation "b" does not exist')
+            return make_freshness(0)
+        self.adapter.calculate_freshness.side_effect = calculate_freshness
+
+        results, rerun = FreshnessBatchRunner(self.adapter, self.runners).run(manifest=None)
+        self.assertEqual(results, [])
+        self.assertEqual(rerun, self.runners)
+        self.adapter.calculate_freshness.assert_not_called()
+
+        with mock.patch('dbt.task.freshness.print_start_line') as print_start:
+            results = [runner.run_with_hooks(None) for runner in rerun]
+        # the start lines were printed when the batch started
+        print_start.assert_not_called()
+        self.assertEqual(self.adapter.calculate_freshness.call_count, 3)
+        self.assertEqual(
+            [r.status for r in results],
+            [FreshnessStatus.Pass, FreshnessStatus.RuntimeErr, FreshnessStatus.Pass],
+        )
+        self.assertIn('relation "b" does not exist', results[1].message)
+
+
+class FreshnessTaskBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.adapter = mock.MagicMock()
+        self.adapter.Relation.create_from_source.side_effect = lambda node: node.name
+        self.config = mock.MagicMock()
+        self.config.args.single_threaded = True
+        with mock.patch('dbt.task.base.register_adapter'):
+            self.task = FreshnessTask(mock.MagicMock(), self.config)
+
+    def make_batch(self, count):
+        nodes = [make_source(f'source_{idx}') for idx in range(count)]
+        runners = []
+        for idx, node in enumerate(nodes):
+            runner = FreshnessRunner(self.config, self.adapter, node, idx + 1, count)
+            runner.compile = mock.MagicMock(return_value=node)
+            runners.append(runner)
+        return FreshnessBatchRunner(self.adapter, runners)
+
+    def submit(self, batch):
+        results = []
+        self.task.submit_batch(None, batch, results.append)
+        return results
+
+    def test_batch(self):
+        for count in (1, 2, 3):
+            batch = self.make_batch(count)
+            self.adapter.calculate_freshness_batch.return_value = [
+                make_freshness(0) for _ in range(count)
+            ]
+            results = self.submit(batch)
+            self.assertEqual(
+                [r.node for r in results], [r.node for r in batch.runners]
+            )
+            self.assertTrue(
+                all(r.status == FreshnessStatus.Pass for r in results)
+            )
+        self.adapter.calculate_freshness.assert_not_called()
+
+    def test_fallback(self):
+        batch = self.make_batch(3)
+        self.adapter.calculate_freshness_batch.side_effect = dbt.exceptions.DatabaseException(
+            'relation "source_1" does not exist'
+        )
+
+        def calculate_freshness(relation, loaded_at_field, filter, manifest):
+            if relation == 'source_1':
+                raise dbt.exceptions.DatabaseException(
+                    'relation "source_1" does not exist'
+                )
+            return make_freshness(0)
+        self.adapter.calculate_freshness.side_effect = calculate_freshness
+
+        with mock.patch('dbt.task.freshness.print_start_line') as print_start:
+            results = self.submit(batch)
+        # each source printed its start line once, before the batch query
+        self.assertEqual(print_start.call_count, 3)
+        self.assertEqual(self.adapter.calculate_freshness.call_count, 3)
+        self.assertEqual(
+            [r.node for r in results], [r.node for r in batch.runners]
+        )
+        self.assertEqual(
+            [r.status for r in results],
+            [FreshnessStatus.Pass, FreshnessStatus.RuntimeErr, FreshnessStatus.Pass],
+        )
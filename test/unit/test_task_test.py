@@ -0,0 +1,317 @@
+import os
+import unittest
+from unittest import mock
+
+import agate
+
+import dbt.exceptions
+import dbt.flags
+from dbt.clients.jinja import get_template
+from dbt.utils import get_dbt_macro_name
+from dbt.include.global_project import PACKAGE_PATH
+from dbt.contracts.results import TestStatus, RunStatus
+from dbt.task.test import TestBatchRunner, TestRunner
+
+
+def make_test_node(name, severity='ERROR'):
+    node = mock.MagicMock()
+    node.name = name
+    node.unique_id = f'test.root.{name}'
+    node.is_ephemeral_model = False
+    node.compiled_sql = f'select * from {name}'
+    node.config.severity = severity
+    node.config.fail_calc = 'count(*)'
+    node.config.warn_if = '!= 0'
+    node.config.error_if = '!= 0'
+    node.config.limit = None
+    return node
+
+
+class TestBatchRunnerTest(unittest.TestCase):
+    def setUp(self):
+        dbt.flags.WARN_ERROR = False
+        self.adapter = mock.MagicMock()
+        self.adapter.execute_macro.return_value = 'select batch'
+        self.nodes = [
+            make_test_node('passes'),
+            make_test_node('fails'),
+            make_test_node('warns', severity='WARN'),
+        ]
+        self.runners = []
+        for idx, node in enumerate(self.nodes):
+            runner = TestRunner(None, self.adapter, node, idx + 1, len(self.nodes))
+            runner.compile = mock.MagicMock(return_value=node)
+            self.runners.append(runner)
+
+    def _table(self, rows):
+        number, boolean = agate.Number(), agate.Boolean()
+        return agate.Table(
+            rows,
+            column_names=['batch_index', 'failures', 'should_warn', 'should_error'],
+            column_types=[number, number, boolean, boolean],
+        )
+
+    def test_batch(self):
+        # rows don't have to come back in order
+        table = self._table([
+            [2, 3, True, True],
+            [0, 0, False, False],
+            [1, 5, True, True],
+        ])
+        self.adapter.execute.return_value = (None, table)
+        batch = TestBatchRunner(self.adapter, self.runners)
+        results, rerun = batch.run(manifest=mock.MagicMock())
+        self.assertEqual(rerun, [])
+
+        self.adapter.execute.assert_called_once_with('select batch', auto_begin=True, fetch=True)
+        macro_name = self.adapter.execute_macro.call_args[0][0]
+        self.assertEqual(macro_name, 'get_test_batch_sql')
+        tests = self.adapter.execute_macro.call_args[1]['kwargs']['tests']
+        self.assertEqual(
+            [t['main_sql'] for t in tests],
+            ['select * from passes', 'select * from fails', 'select * from warns'],
+        )
+        self.assertEqual([r.node for r in results], self.nodes)
+        self.assertEqual(
+            [r.status for r in results],
+            [TestStatus.Pass, TestStatus.Fail, TestStatus.Warn],
+        )
+        self.assertEqual([r.failures for r in results], [0, 5, 3])
+        self.assertEqual(
+            [[t.name for t in r.timing] for r in results],
+            [['compile', 'execute']] * 3,
+        )
+        self.adapter.release_connection.assert_called_once_with()
+
+    def test_fused(self):
+        for node, (name, kwargs) in zip(self.nodes, [
+            ('not_null', {'column_name': 'id'}),
+            ('unique', {'column_name': 'id'}),
+            ('accepted_values', {'column_name': 'color', 'values': ['1', 'red'], 'quote': True}),
+        ]):
+            node.test_metadata.name = name
+            node.test_metadata.namespace = None
+            node.test_metadata.kwargs = dict(
+                kwargs, model="{{ get_where_subquery(ref('model_a')) }}"
+            )
+            node.config.where = None
+            node.depends_on.nodes = ['model.root.model_a']
+        # a test on another model isn't fused
+        self.nodes[0].depends_on.nodes = ['model.root.model_b']
+        manifest = mock.MagicMock()
+        manifest.expect.return_value.is_ephemeral_model = False
+
+        self.adapter.execute.return_value = (None, self._table([
+            [0, 0, False, False],
+            [1, 0, False, False],
+            [2, 2, True, True],
+        ]))
+        batch = TestBatchRunner(
+            self.adapter, self.runners, frozenset(('not_null', 'unique', 'accepted_values'))
+        )
+        results, _ = batch.run(manifest=manifest)
+
+        kwargs = self.adapter.execute_macro.call_args[1]['kwargs']
+        self.assertEqual([t['batch_index'] for t in kwargs['tests']], [0])
+        self.assertEqual(len(kwargs['fused_tests']), 1)
+        manifest.expect.assert_called_with('model.root.model_a')
+        self.assertEqual(
+            kwargs['fused_tests'][0]['relation'],
+            self.adapter.Relation.create_from.return_value,
+        )
+        self.assertEqual(kwargs['fused_tests'][0]['tests'], [
+            {'batch_index': 1, 'test_name': 'unique', 'column_name': 'id',
+             'warn_if': '!= 0', 'error_if': '!= 0'},
+            {'batch_index': 2, 'test_name': 'accepted_values', 'column_name': 'color',
+             'values': ['1', 'red'], 'quote': True, 'warn_if': '!= 0', 'error_if': '!= 0'},
+        ])
+        self.assertEqual(
+            [r.status for r in results],
+            [TestStatus.Pass, TestStatus.Pass, TestStatus.Warn],
+        )
+
+    def test_not_fused(self):
+        node = self.nodes[0]
+        node.test_metadata.name = 'accepted_values'
+        node.test_metadata.namespace = None
+        node.test_metadata.kwargs = {'column_name': 'color', 'values': ['red']}
+        node.config.where = None
+        node.depends_on.nodes = ['model.root.model_a']
+        manifest = mock.MagicMock()
+        manifest.expect.return_value.is_ephemeral_model = False
+        batch = TestBatchRunner(self.adapter, self.runners, frozenset(('accepted_values',)))
+        self.assertIsNotNone(batch.fused_test_kwargs(node, manifest))
+
+        for attr, value in [
+            ('where', 'id > 1'), ('limit', 10), ('fail_calc', 'sum(n_records)')
+        ]:
+            with mock.patch.object(node, 'config') as config:
+                config.where = None
+                config.limit = None
+                config.fail_calc = 'count(*)'
+                setattr(config, attr, value)
+                self.assertIsNone(batch.fused_test_kwargs(node, manifest))
+
+        for kwargs in [
+            {'column_name': 'color', 'values': ["{{ var('colors') }}"]},
+            {'column_name': 'color', 'values': []},
+            {'column_name': 'color', 'values': ['red'], 'extra': 1},
+            {'values': ['red']},
+        ]:
+            node.test_metadata.kwargs = kwargs
+            self.assertIsNone(batch.fused_test_kwargs(node, manifest))
+        node.test_metadata.kwargs = {'column_name': 'color', 'values': ['red']}
+
+        node.test_metadata.namespace = 'dbt_utils'
+        self.assertIsNone(batch.fused_test_kwargs(node, manifest))
+        node.test_metadata.namespace = None
+
+        manifest.expect.return_value.is_ephemeral_model = True
+        self.assertIsNone(batch.fused_test_kwargs(node, manifest))
+
+    def test_compile_error(self):
+        self.runners[1].compile.side_effect = dbt.exceptions.CompilationException('bad test')
+        self.adapter.execute.return_value = (None, self._table([
+            [0, 0, False, False],
+            [1, 0, False, False],
+        ]))
+        results, _ = TestBatchRunner(self.adapter, self.runners).run(manifest=mock.MagicMock())
+        tests = self.adapter.execute_macro.call_args[1]['kwargs']['tests']
+        self.assertEqual(len(tests), 2)
+        self.assertEqual(
+            [r.status for r in results],
+            [TestStatus.Pass, RunStatus.Error, TestStatus.Pass],
+        )
+
+    def test_fallback(self):
+        for bad_result in (
+            dbt.exceptions.DatabaseException('syntax error'),
+            # a row is missing
+            (None, self._table([[0, 0, False, False], [1, 0, False, False]])),
+        ):
+            if isinstance(bad_result, Exception):
+                self.adapter.execute.side_effect = bad_result
+            else:
+                self.adapter.execute.side_effect = None
+                self.adapter.execute.return_value = bad_result
+            # the tests are handed back to run on their own
+            results, rerun = TestBatchRunner(self.adapter, self.runners).run(
+                manifest=mock.MagicMock()
+            )
+            self.assertEqual(results, [])
+            self.assertEqual(rerun, self.runners)
+
+        # and they don't print their start lines again
+        with mock.patch.object(TestRunner, 'print_start_line') as print_start_line:
+            self.runners[0].before_execute()
+        print_start_line.assert_not_called()
+
+    def test_runner_error(self):
+        self.adapter.execute.return_value = (None, self._table([
+            [0, 0, False, False],
+            [1, 0, False, False],
+            [2, 0, False, False],
+        ]))
+        self.runners[0].from_run_result = mock.MagicMock(side_effect=RuntimeError('boom'))
+        results, rerun = TestBatchRunner(self.adapter, self.runners).run(
+            manifest=mock.MagicMock()
+        )
+        self.assertEqual(rerun, [])
+        self.assertEqual([r.node for r in results], self.nodes)
+        self.assertEqual(
+            [r.status for r in results],
+            [RunStatus.Error, TestStatus.Pass, TestStatus.Pass],
+        )
+
+    def test_connection_error(self):
+        self.adapter.connection_named.side_effect = dbt.exceptions.FailedToConnectException(
+            'no connection'
+        )
+        results, rerun = TestBatchRunner(self.adapter, self.runners).run(
+            manifest=mock.MagicMock()
+        )
+        self.assertEqual(rerun, [])
+        self.assertEqual([r.node for r in results], self.nodes)
+        self.assertEqual([r.status for r in results], [RunStatus.Error] * 3)
+
+
+class TestBatchSqlTest(unittest.TestCase):
+    def _module(self, context=None):
+        path = os.path.join(
+            PACKAGE_PATH, 'macros', 'materializations', 'test.sql'
+        )
+        with open(path) as fp:
+            source = fp.read()
+        return get_template(source, {}).make_module(context or {})
+
+    def test_get_test_batch_sql(self):
+        def get_test_sql(main_sql, fail_calc, warn_if, error_if, limit):
+            return f'<{main_sql}|{fail_calc}|{warn_if}|{error_if}|{limit}>'
+
+        def get_fused_test_sql(relation, tests):
+            return f'<{relation}|{[t["batch_index"] for t in tests]}>'
+
+        module = self._module({
+            'get_test_sql': get_test_sql, 'get_fused_test_sql': get_fused_test_sql,
+        })
+        get_test_batch_sql = getattr(
+            module, get_dbt_macro_name('default__get_test_batch_sql')
+        )
+        sql = get_test_batch_sql(
+            [
+                {'batch_index': 0, 'main_sql': 'a', 'fail_calc': 'count(*)',
+                 'warn_if': '!= 0', 'error_if': '> 10', 'limit': None},
+                {'batch_index': 3, 'main_sql': 'b', 'fail_calc': 'sum(x)',
+                 'warn_if': '!= 0', 'error_if': '!= 0', 'limit': 5},
+            ],
+            [{'relation': 'db.schema.c', 'tests': [{'batch_index': 1}, {'batch_index': 2}]}],
+        )
+        self.assertEqual(
+            ' '.join(sql.split()),
+            'select 0 as batch_index, failures, should_warn, should_error '
+            'from ( <a|count(*)|!= 0|> 10|None> ) dbt_internal_test_batch_0 '
+            'union all '
+            'select 3 as batch_index, failures, should_warn, should_error '
+            'from ( <b|sum(x)|!= 0|!= 0|5> ) dbt_internal_test_batch_3 '
+            'union all '
+            'select batch_index, failures, should_warn, should_error '
+            'from ( <db.schema.c|[1, 2]> ) dbt_internal_fused_batch_0'
+        )
+
+    def test_get_fused_test_sql(self):
+        get_fused_test_sql = getattr(
+            self._module(), get_dbt_macro_name('default__get_fused_test_sql')
+        )
+        sql = get_fused_test_sql('db.schema.c', [
+            {'batch_index': 1, 'test_name': 'not_null', 'column_name': 'id',
+             'warn_if': '!= 0', 'error_if': '!= 0'},
+            {'batch_index': 4, 'test_name': 'unique', 'column_name': 'id',
+             'warn_if': '!= 0', 'error_if': '> 2'},
+            {'batch_index': 2, 'test_name': 'accepted_values', 'column_name': 'color',
+             'values': ['red', 'blue'], 'quote': True, 'warn_if': '!= 0', 'error_if': '!= 0'},
+        ])
+        self.assertEqual(
+            ' '.join(sql.split()),
+            'with dbt_internal_fused_source as ( select '
+            'id as column_0, '
+            'id as column_1, count(*) over (partition by id) as n_records_1, '
+            'color as column_2 '
+            'from db.schema.c ), '
+            'dbt_internal_fused_counts as ( select '
+            'count(case when column_0 is null then 1 end) as failures_0, '
+            'count(distinct case when n_records_1 > 1 then column_1 end) as failures_1, '
+            "count(distinct case when column_2 not in ('red','blue') then column_2 end) "
+            'as failures_2 '
+            'from dbt_internal_fused_source ) '
+            'select 1 as batch_index, failures_0 as failures, '
+            'failures_0 != 0 as should_warn, failures_0 != 0 as should_error '
+            'from dbt_internal_fused_counts '
+            'union all '
+            'select 4 as batch_index, failures_1 as failures, '
+            'failures_1 != 0 as should_warn, failures_1 > 2 as should_error '
+            'from dbt_internal_fused_counts '
+            'union all '
+            'select 2 as batch_index, failures_2 as failures, '
+            'failures_2 != 0 as should_warn, failures_2 != 0 as should_error '
+            'from dbt_internal_fused_counts'
+        )